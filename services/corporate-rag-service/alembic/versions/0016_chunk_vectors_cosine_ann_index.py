@@ -0,0 +1,76 @@
+"""add cosine ann index and per-tenant partial ann indexes for chunk_vectors
+
+Revision ID: 0016_chunk_vectors_cosine_ann_index
+Revises: 0015_chunk_vectors_upsert_schema_alignment
+Create Date: 2026-02-13 09:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "0016_chunk_vectors_cosine_ann_index"
+down_revision = "0015_chunk_vectors_upsert_schema_alignment"
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = "ix_chunk_vectors_embedding_cosine_ann"
+TENANT_INDEX_PREFIX = "ix_chunk_vectors_cos_"
+
+
+def upgrade() -> None:
+    # Embeddings are L2-normalized and ranking reasons in cosine, so order by <=> over a
+    # vector_cosine_ops index. Per-tenant partial indexes keep the tenant filter inside the
+    # ANN scan instead of post-filtering a global top-k. New tenants get theirs from
+    # `python -m app.cli.vector_index --tenant <uuid>`.
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            t uuid;
+            method text;
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') THEN
+                RETURN;
+            END IF;
+            IF EXISTS (SELECT 1 FROM pg_am WHERE amname = 'hnsw') THEN
+                method := 'hnsw';
+                EXECUTE 'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON chunk_vectors USING hnsw (embedding vector_cosine_ops)';
+            ELSIF EXISTS (SELECT 1 FROM pg_am WHERE amname = 'ivfflat') THEN
+                method := 'ivfflat';
+                EXECUTE 'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON chunk_vectors USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)';
+            ELSE
+                RETURN;
+            END IF;
+            FOR t IN SELECT tenant_id FROM tenants LOOP
+                EXECUTE format(
+                    'CREATE INDEX IF NOT EXISTS %I ON chunk_vectors USING %s (embedding vector_cosine_ops) WHERE tenant_id = %L',
+                    '{TENANT_INDEX_PREFIX}' || replace(t::text, '-', ''),
+                    method,
+                    t
+                );
+            END LOOP;
+        END
+        $$;
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            idx text;
+        BEGIN
+            FOR idx IN
+                SELECT indexname FROM pg_indexes
+                WHERE tablename = 'chunk_vectors' AND indexname LIKE '{TENANT_INDEX_PREFIX}%'
+            LOOP
+                EXECUTE format('DROP INDEX IF EXISTS %I', idx);
+            END LOOP;
+        END
+        $$;
+        """
+    )
+    op.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
@@ -0,0 +1,27 @@
+"""add tokenizer-versioned llm token count to chunks
+
+Revision ID: 0017_add_chunk_llm_token_count
+Revises: 0016_chunk_vectors_cosine_ann_index
+Create Date: 2026-02-13 12:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0017_add_chunk_llm_token_count"
+down_revision = "0016_chunk_vectors_cosine_ann_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled at ingestion; rows left NULL (or with another tokenizer) are estimated at query time.
+    op.add_column("chunks", sa.Column("llm_token_count", sa.Integer(), nullable=True))
+    op.add_column("chunks", sa.Column("llm_tokenizer", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("chunks", "llm_tokenizer")
+    op.drop_column("chunks", "llm_token_count")
@@ -0,0 +1,31 @@
+"""create tenant_corpus_generations table
+
+Revision ID: 0018_create_tenant_corpus_generations
+Revises: 0017_add_chunk_llm_token_count
+Create Date: 2026-02-13 15:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0018_create_tenant_corpus_generations"
+down_revision = "0017_add_chunk_llm_token_count"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bumped by every ingestion run; part of the /v1/query response cache key.
+    op.create_table(
+        "tenant_corpus_generations",
+        sa.Column("tenant_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("generation", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("tenant_id", name="pk_tenant_corpus_generations"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("tenant_corpus_generations")
@@ -1,20 +1,29 @@
+import contextvars
 import json
+import queue
 import re
+import threading
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import lru_cache
+from typing import Any, Callable
 
 
 from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from app.clients.embedding_cache import CachedEmbeddingsClient
 from app.clients.embeddings_client import EmbeddingsClient
+from app.clients.http_pool import sample_http_pool_utilization
 from app.clients.ollama_client import OllamaClient
+from app.clients.reranker_client import RerankerClient
 from app.core.config import settings
 from app.db.repositories import ConversationRepository, TenantRepository
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
 from app.models.models import IngestJobs
 from app.schemas.api import (
     ErrorEnvelope,
@@ -31,6 +40,7 @@ from app.schemas.api import (
     QueryResponse,
     SourceSyncRequest,
 )
+from app.services.answer_stream import AnswerFieldExtractor, format_sse
 from app.services.anti_hallucination import build_structured_refusal, verify_answer
 from app.services.agent_pipeline import (
     AgentPipeline,
@@ -48,12 +58,13 @@ from app.services.performance import build_stage_budgets, exceeded_budgets
 from app.services.context_expansion import ContextExpansionEngine
 from app.services.connectors.base import ConnectorFetchResult, SourceDescriptor, SyncContext
 from app.services.connectors.registry import ConnectorRegistry
-from app.services.query_pipeline import apply_context_budget, estimate_tokens, expand_neighbors
+from app.services.query_pipeline import apply_context_budget, chunk_tokens, estimate_tokens, expand_neighbors
 from app.services.reranker import RerankerService
-from app.services.retrieval import hybrid_rank
+from app.services.response_cache import QueryResponseCache, SemanticQueryCache, settings_fingerprint
+from app.services.retrieval import VectorScoringEngine, hybrid_rank
 from app.services.scoring_trace import build_scoring_trace
 from app.services.security import InMemoryRateLimiter, sanitize_user_query
-from app.services.telemetry import emit_metric, log_stage_latency, metric_samples
+from app.services.telemetry import REGISTRY as METRICS_REGISTRY, emit_metric, log_stage_latency
 from app.runners.conversation_summarizer import ConversationSummarizer
 from app.runners.query_rewriter import QueryRewriteError, QueryRewriter
 
@@ -69,12 +80,82 @@ rate_limiter = InMemoryRateLimiter(
 
 @lru_cache
 def get_reranker() -> RerankerService:
-    return RerankerService(settings.RERANKER_MODEL)
+    client = RerankerClient(settings.RERANKER_SERVICE_URL, settings.RERANKER_TIMEOUT_SECONDS) if settings.RERANKER_SERVICE_URL else None
+    return RerankerService(
+        settings.RERANKER_MODEL,
+        max_length=settings.RERANKER_MAX_LENGTH,
+        batch_size=settings.RERANKER_BATCH_SIZE,
+        cache_max_entries=settings.RERANKER_SCORE_CACHE_MAX_ENTRIES,
+        client=client,
+        remote_fallback=settings.RERANKER_REMOTE_FALLBACK,
+        remote_cooldown_seconds=settings.RERANKER_REMOTE_COOLDOWN_SECONDS,
+    )
+
+
+@lru_cache
+def get_uncached_embeddings_client() -> EmbeddingsClient:
+    """Client for bulk, non-query texts (answer sentences) that must not churn the query cache."""
+    return EmbeddingsClient(
+        settings.EMBEDDINGS_SERVICE_URL,
+        settings.EMBEDDINGS_TIMEOUT_SECONDS,
+        encoding_format=settings.EMBEDDINGS_ENCODING_FORMAT,
+    )
+
+
+@lru_cache
+def get_embeddings_client() -> EmbeddingsClient | CachedEmbeddingsClient:
+    client = get_uncached_embeddings_client()
+    if not settings.QUERY_EMBEDDING_CACHE_ENABLED:
+        return client
+    return CachedEmbeddingsClient(
+        client,
+        max_entries=settings.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        tenant_isolation=settings.QUERY_EMBEDDING_CACHE_TENANT_ISOLATION,
+    )
+
+
+@lru_cache
+def get_query_response_cache() -> QueryResponseCache:
+    return QueryResponseCache(
+        max_entries=settings.QUERY_RESPONSE_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.QUERY_RESPONSE_CACHE_TTL_SECONDS,
+    )
+
+
+@lru_cache
+def get_semantic_query_cache() -> SemanticQueryCache:
+    return SemanticQueryCache(
+        similarity_threshold=settings.QUERY_SEMANTIC_CACHE_SIMILARITY_THRESHOLD,
+        max_entries=settings.QUERY_SEMANTIC_CACHE_MAX_ENTRIES,
+        ttl_seconds=settings.QUERY_SEMANTIC_CACHE_TTL_SECONDS,
+        max_tenants=settings.QUERY_SEMANTIC_CACHE_MAX_TENANTS,
+    )
+
+
+def _response_cache_key(db: Session, payload: QueryRequest, resolved_query_text: str) -> tuple[str, int, str, str, str]:
+    generation = TenantRepository(db, str(payload.tenant_id)).get_corpus_generation()
+    return QueryResponseCache.key(
+        str(payload.tenant_id),
+        generation,
+        resolved_query_text,
+        payload.model_dump(mode="json", exclude={"tenant_id", "query"}),
+        settings_fingerprint(settings.model_dump()),
+    )
+
+
+def _reissue_cached_response(cached: QueryResponse, corr: uuid.UUID) -> QueryResponse:
+    return cached.model_copy(
+        update={
+            "correlation_id": corr,
+            "trace": cached.trace.model_copy(update={"trace_id": corr}) if cached.trace is not None else None,
+        }
+    )
 
 
 @lru_cache
-def get_embeddings_client() -> EmbeddingsClient:
-    return EmbeddingsClient(settings.EMBEDDINGS_SERVICE_URL, settings.EMBEDDINGS_TIMEOUT_SECONDS)
+def get_query_stage_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=settings.QUERY_STAGE_EXECUTOR_WORKERS, thread_name_prefix="query-stage")
 
 
 @lru_cache
@@ -218,20 +299,72 @@ def _is_debug_allowed(debug_requested: bool, user_role: str | None) -> bool:
     return (user_role or "").strip().lower() == settings.DEBUG_ADMIN_ROLE.strip().lower()
 
 
-def _fetch_candidates(db: Session, tenant_id: str, query: str, query_embedding: list[float], top_n: int) -> tuple[list[dict], int, int, int]:
+def _verification_encoder_kwargs(db: Session, tenant_id: str, correlation_id: str, chosen: list[dict]) -> dict[str, Any]:
+    if settings.ANTI_HALLUCINATION_ENCODER != "chunk_vectors" or not chosen:
+        return {}
+    missing = [str(c["chunk_id"]) for c in chosen if c.get("embedding") is None]
+    stored = TenantRepository(db, tenant_id).fetch_embeddings(missing) if missing else {}
+    chunk_embeddings = [c.get("embedding") if c.get("embedding") is not None else stored.get(str(c["chunk_id"])) for c in chosen]
+    client = get_uncached_embeddings_client()
+    return {
+        "chunk_embeddings": chunk_embeddings,
+        "embed_texts": lambda sentences: client.embed_matrix(sentences, tenant_id=tenant_id, correlation_id=correlation_id),
+    }
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[Any, int]:
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, int((time.perf_counter() - t0) * 1000)
+
+
+def _vector_search_params(tenant_id: str) -> dict[str, object]:
+    ef_search = settings.VECTOR_HNSW_EF_SEARCH
+    probes = settings.VECTOR_IVFFLAT_PROBES
+    override = settings.vector_search_tenant_overrides.get(str(tenant_id))
+    if override:
+        ef_search = override.get("ef_search", ef_search)
+        probes = override.get("probes", probes)
+    params: dict[str, object] = {}
+    if ef_search > 0:
+        params["hnsw.ef_search"] = ef_search
+    if probes > 0:
+        params["ivfflat.probes"] = probes
+    if settings.VECTOR_HNSW_ITERATIVE_SCAN != "off":
+        params["hnsw.iterative_scan"] = settings.VECTOR_HNSW_ITERATIVE_SCAN
+    return params
+
+
+def _lexical_top_n(top_n: int) -> int:
+    return max(top_n, settings.DEFAULT_TOP_K, settings.HYBRID_MAX_FTS)
+
+
+def _fetch_candidates(
+    db: Session,
+    tenant_id: str,
+    query: str,
+    query_embedding: list[float],
+    top_n: int,
+    lexical_hits: list[tuple[str, float]] | None = None,
+) -> tuple[list[dict], int, int, int]:
     repo = TenantRepository(db, tenant_id)
-    k_lex = max(top_n, settings.DEFAULT_TOP_K, settings.HYBRID_MAX_FTS)
+    k_lex = _lexical_top_n(top_n)
     k_vec = max(top_n, settings.RERANKER_TOP_K, settings.HYBRID_MAX_VECTOR)
 
     t0 = time.perf_counter()
-    lexical_scores = repo.fetch_lexical_candidate_scores(query, k_lex)
+    candidates, lexical_count, vector_count = repo.fetch_hybrid_candidates(
+        query,
+        query_embedding,
+        k_lex,
+        k_vec,
+        use_similarity=settings.USE_VECTOR_RETRIEVAL,
+        include_embeddings=settings.RETRIEVAL_HYDRATE_EMBEDDINGS,
+        distance_metric=settings.VECTOR_DISTANCE_METRIC,
+        search_params=_vector_search_params(tenant_id),
+        lexical_hits=lexical_hits,
+    )
     lexical_ms = int((time.perf_counter() - t0) * 1000)
-    vector_candidates = repo.fetch_vector_candidates(query_embedding, k_vec, use_similarity=settings.USE_VECTOR_RETRIEVAL)
-    vector_score_map = {c["chunk_id"]: c["vec_score"] for c in vector_candidates}
-
-    chunk_ids = set(lexical_scores.keys()) | set(vector_score_map.keys())
-    candidates = repo.hydrate_candidates(chunk_ids, lexical_scores, vector_score_map)
-    return candidates, lexical_ms, len(lexical_scores), len(vector_candidates)
+    return candidates, lexical_ms, lexical_count, vector_count
 
 def _safe_uuid(value: object) -> uuid.UUID | None:
     try:
@@ -276,11 +409,22 @@ def _apply_memory_boosting(
 
 
 def _summarize_metric(name: str) -> MetricSummary:
-    samples = metric_samples(name)
-    if not samples:
+    summary = METRICS_REGISTRY.summary(name)
+    if not summary["count"]:
         return MetricSummary(count=0, sum=0.0, avg=0.0, latest=None)
-    total = float(sum(samples))
-    return MetricSummary(count=len(samples), sum=total, avg=total / len(samples), latest=float(samples[-1]))
+    total = float(summary["sum"])
+    return MetricSummary(count=summary["count"], sum=total, avg=total / summary["count"], latest=summary["latest"])
+
+
+def _summarize_hit_counters(prefix: str) -> MetricSummary:
+    hits = METRICS_REGISTRY.counter(f"{prefix}_hits")
+    lookups = hits + METRICS_REGISTRY.counter(f"{prefix}_misses")
+    return MetricSummary(count=int(lookups), sum=hits, avg=hits / lookups if lookups else 0.0, latest=None)
+
+
+def _wants_prometheus(accept: str | None) -> bool:
+    accept = (accept or "").lower()
+    return "openmetrics" in accept or ("text/plain" in accept and "application/json" not in accept)
 
 
 def _readiness_db_check(db: Session) -> ReadinessCheck:
@@ -359,15 +503,20 @@ def ready(db: Session = Depends(get_db)) -> ReadinessResponse:
 
 @router.get("/v1/metrics", response_model=MetricsResponse)
 @router.get("/metrics", response_model=MetricsResponse)
-def metrics() -> MetricsResponse:
+def metrics(accept: str | None = Header(default=None)) -> MetricsResponse | Response:
     request_id = str(uuid.uuid4())
     log_event("metrics_snapshot", payload={}, request_id=request_id, plane="control")
+    sample_http_pool_utilization()
+    if _wants_prometheus(accept):
+        return Response(content=METRICS_REGISTRY.render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
     return MetricsResponse(
         metrics={
             "token_usage": _summarize_metric("token_usage"),
             "coverage_ratio": _summarize_metric("coverage_ratio"),
             "clarification_rate": _summarize_metric("clarification_rate"),
             "fallback_rate": _summarize_metric("fallback_rate"),
+            "http_pool_utilization": _summarize_metric("http_pool_utilization"),
+            "query_embedding_cache_hit": _summarize_hit_counters("query_embedding_cache"),
         }
     )
 
@@ -484,6 +633,94 @@ def post_query(
     x_user_id: str | None = Header(default=None, alias="X-User-Id"),
     x_user_role: str | None = Header(default=None, alias="X-User-Role"),
     x_debug_mode: str | None = Header(default=None, alias="X-Debug-Mode"),
+    x_cache_bypass: str | None = Header(default=None, alias="X-Cache-Bypass"),
+) -> QueryResponse:
+    return _run_query(payload, db, x_conversation_id, x_client_turn_id, x_user_id, x_user_role, x_debug_mode, x_cache_bypass)
+
+
+class _StreamCancelled(Exception):
+    """Raised from the token callback to stop a stream whose client disconnected."""
+
+
+@router.post("/v1/query/stream")
+def post_query_stream(
+    payload: QueryRequest,
+    x_conversation_id: str | None = Header(default=None, alias="X-Conversation-Id"),
+    x_client_turn_id: str | None = Header(default=None, alias="X-Client-Turn-Id"),
+    x_user_id: str | None = Header(default=None, alias="X-User-Id"),
+    x_user_role: str | None = Header(default=None, alias="X-User-Role"),
+    x_debug_mode: str | None = Header(default=None, alias="X-Debug-Mode"),
+    x_cache_bypass: str | None = Header(default=None, alias="X-Cache-Bypass"),
+) -> StreamingResponse:
+    """Same pipeline as ``/v1/query`` but streams answer tokens as Server-Sent Events.
+
+    ``token`` events carry answer text as the LLM generates it; a single ``final`` event
+    carries the grounded ``QueryResponse`` (answer, citations, only-sources verdict), which
+    supersedes the streamed text when grounding refuses. Errors raised before the first
+    event keep their HTTP status; later ones are sent as an ``error`` event.
+
+    The pipeline runs on a worker thread with its own session: dependency teardown closes a
+    ``get_db`` session before the body streams. When the client goes away the worker is
+    stopped at its next generated token.
+    """
+    events: queue.Queue[tuple[str, object] | None] = queue.Queue()
+    extractor = AnswerFieldExtractor()
+    cancelled = threading.Event()
+
+    def _on_token(delta: str) -> None:
+        if cancelled.is_set():
+            raise _StreamCancelled()
+        answer_delta = extractor.feed(delta)
+        if answer_delta:
+            events.put(("token", {"delta": answer_delta}))
+
+    def _worker() -> None:
+        db = SessionLocal()
+        try:
+            result = _run_query(payload, db, x_conversation_id, x_client_turn_id, x_user_id, x_user_role, x_debug_mode, x_cache_bypass, on_token=_on_token)
+            events.put(("final", result.model_dump(mode="json")))
+        except _StreamCancelled:
+            log_event("query.stream.cancelled", payload={"tenant_id": str(payload.tenant_id)}, plane="data")
+        except HTTPException as exc:
+            events.put(("error", exc))
+        except Exception as exc:  # noqa: BLE001
+            log_event("query.stream.error", level=40, payload={"tenant_id": str(payload.tenant_id), "error": str(exc)}, plane="data")
+            events.put(("error", HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Query stream failed")))
+        finally:
+            db.close()
+            events.put(None)
+
+    threading.Thread(target=contextvars.copy_context().run, args=(_worker,), name="query-stream", daemon=True).start()
+    first = events.get()
+    if first is not None and isinstance(first[1], HTTPException):
+        raise first[1]
+
+    def _stream():
+        item = first
+        try:
+            while item is not None:
+                name, data = item
+                if isinstance(data, HTTPException):
+                    data = {"status_code": data.status_code, "detail": data.detail}
+                yield format_sse(name, data)
+                item = events.get()
+        finally:
+            # Closed early (client disconnect) or drained: either way the worker may stop.
+            cancelled.set()
+
+    return StreamingResponse(_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _run_query(
+    payload: QueryRequest,
+    db: Session,
+    x_conversation_id: str | None = None,
+    x_client_turn_id: str | None = None,
+    x_user_id: str | None = None,
+    x_user_role: str | None = None,
+    x_debug_mode: str | None = None,
+    x_cache_bypass: str | None = None,
+    on_token: Callable[[str], None] | None = None,
 ) -> QueryResponse:
     corr = uuid.uuid4()
     t_start = time.perf_counter()
@@ -634,7 +871,7 @@ def post_query(
             )
             if settings.ENABLE_PER_STAGE_LATENCY_METRICS:
                 rewrite_ms = int((time.perf_counter() - t_start) * 1000)
-                log_stage_latency(stage="rewrite_agent", latency_ms=rewrite_ms, model_id=settings.REWRITE_MODEL_ID, request_id=str(corr))
+                log_stage_latency(stage="rewrite_agent", latency_ms=rewrite_ms, model_id=settings.REWRITE_MODEL_ID, request_id=str(corr), tenant_id=str(payload.tenant_id))
                 emit_metric("rag_rewrite_latency", rewrite_ms)
         except (QueryRewriteError, ValueError, KeyError, json.JSONDecodeError) as exc:
             audit_log_event(db, str(payload.tenant_id), str(corr), "ERROR", {"code": "B-REWRITE-FAILED", "message": str(exc)})
@@ -744,26 +981,70 @@ def post_query(
                     trace={"trace_id": corr, "scoring_trace": []},
                 )
 
+    # Only stateless, non-debug requests are cacheable: conversation turns and debug traces are per request.
+    response_cache_key = None
+    cache_bypassed = (x_cache_bypass or "").strip().lower() in {"1", "true", "yes", "on"}
+    if (settings.QUERY_RESPONSE_CACHE_ENABLED or settings.QUERY_SEMANTIC_CACHE_ENABLED) and conversation_repo is None and not debug_enabled:
+        response_cache_key = _response_cache_key(db, payload, resolved_query_text)
+    if response_cache_key is not None and settings.QUERY_RESPONSE_CACHE_ENABLED and not cache_bypassed:
+        cached_response = get_query_response_cache().get(response_cache_key)
+        if cached_response is not None:
+            t_total_ms = int((time.perf_counter() - t_start) * 1000)
+            audit_log_event(db, str(payload.tenant_id), str(corr), "API_RESPONSE", {"trace_id": str(corr), "response_cache": "hit", "corpus_generation": response_cache_key[1]}, duration_ms=t_total_ms)
+            return _reissue_cached_response(cached_response, corr)
+
+    retrieval_top_n = max(payload.top_k, settings.RERANKER_TOP_K)
+    audit_log_event(db, str(payload.tenant_id), str(corr), "EMBEDDINGS_REQUEST", {"query": resolved_query_text, "model": settings.EMBEDDINGS_DEFAULT_MODEL_ID})
+    embedding_future = get_query_stage_executor().submit(
+        contextvars.copy_context().run,
+        _timed_call,
+        get_embeddings_client().embed_text,
+        resolved_query_text,
+        tenant_id=str(payload.tenant_id),
+        correlation_id=str(corr),
+    )
+    lexical_hits: list[tuple[str, float]] | None = None
+    lexical_prefetch_ms = 0
+    if settings.QUERY_PARALLEL_LEXICAL_PREFETCH:
+        # The FTS leg only needs the query text, so it runs on this session while the
+        # embedding request is in flight.
+        t_lex0 = time.perf_counter()
+        lexical_hits = TenantRepository(db, str(payload.tenant_id)).fetch_lexical_hits(resolved_query_text, _lexical_top_n(retrieval_top_n))
+        lexical_prefetch_ms = int((time.perf_counter() - t_lex0) * 1000)
     try:
-        audit_log_event(db, str(payload.tenant_id), str(corr), "EMBEDDINGS_REQUEST", {"query": resolved_query_text, "model": settings.EMBEDDINGS_DEFAULT_MODEL_ID})
-        query_embedding = get_embeddings_client().embed_text(resolved_query_text, tenant_id=str(payload.tenant_id), correlation_id=str(corr))
+        # Timed inside the worker, so the lexical prefetch overlap is not billed to embedding.
+        query_embedding, t_embed_ms = embedding_future.result()
         audit_log_event(db, str(payload.tenant_id), str(corr), "EMBEDDINGS_RESPONSE", {"dimensions": len(query_embedding)})
     except Exception as exc:  # noqa: BLE001
         audit_log_event(db, str(payload.tenant_id), str(corr), "ERROR", {"code": "EMBEDDINGS_HTTP_ERROR", "message": str(exc)})
         raise _error("EMBEDDINGS_HTTP_ERROR", "Embeddings service call failed", corr, True, status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    # Paraphrase reuse: same tenant, corpus generation, options and settings, near-identical query vector.
+    semantic_scope = None
+    if response_cache_key is not None and settings.QUERY_SEMANTIC_CACHE_ENABLED:
+        semantic_scope = (response_cache_key[1], response_cache_key[3], response_cache_key[4])
+        semantic_hit = None if cache_bypassed else get_semantic_query_cache().get(str(payload.tenant_id), semantic_scope, query_embedding)
+        if semantic_hit is not None:
+            cached_response, similarity = semantic_hit
+            t_total_ms = int((time.perf_counter() - t_start) * 1000)
+            audit_log_event(db, str(payload.tenant_id), str(corr), "API_RESPONSE", {"trace_id": str(corr), "response_cache": "semantic_hit", "similarity": round(similarity, 4), "corpus_generation": response_cache_key[1]}, duration_ms=t_total_ms)
+            return _reissue_cached_response(cached_response, corr)
+
     t_parse0 = time.perf_counter()
-    candidates, lexical_ms, lexical_count, vector_count = _fetch_candidates(db, str(payload.tenant_id), resolved_query_text, query_embedding, max(payload.top_k, settings.RERANKER_TOP_K))
+    candidates, lexical_ms, lexical_count, vector_count = _fetch_candidates(db, str(payload.tenant_id), resolved_query_text, query_embedding, retrieval_top_n, lexical_hits=lexical_hits)
+    lexical_ms += lexical_prefetch_ms
     t_parse_ms = int((time.perf_counter() - t_parse0) * 1000)
     if settings.ENABLE_PER_STAGE_LATENCY_METRICS:
-        log_stage_latency(stage="retrieval_agent", latency_ms=t_parse_ms, model_id=settings.EMBEDDINGS_DEFAULT_MODEL_ID, request_id=str(corr))
+        log_stage_latency(stage="retrieval_agent", latency_ms=t_parse_ms, model_id=settings.EMBEDDINGS_DEFAULT_MODEL_ID, request_id=str(corr), tenant_id=str(payload.tenant_id))
         emit_metric("rag_retrieval_latency", t_parse_ms)
 
+    scoring_engine = VectorScoringEngine(query_embedding)
     ranked, timers = hybrid_rank(
         resolved_query_text,
         candidates,
         query_embedding,
         normalize_scores=settings.HYBRID_SCORE_NORMALIZATION,
+        scoring_engine=scoring_engine,
     )
     reranked, t_rerank = get_reranker().rerank(resolved_query_text, ranked)
     ranked_final, _ = hybrid_rank(
@@ -771,6 +1052,7 @@ def post_query(
         reranked,
         query_embedding,
         normalize_scores=settings.HYBRID_SCORE_NORMALIZATION,
+        scoring_engine=scoring_engine,
     )
 
     boosted_chunks_count = 0
@@ -794,7 +1076,7 @@ def post_query(
         "expanded_from_neighbors_count": sum(1 for c in chosen if c.get("added_by_neighbor")),
         "expanded_from_links_count": 0,
         "redundancy_filtered_count": 0,
-        "final_context_token_estimate": sum(_estimate_token_count(str(c.get("chunk_text", ""))) for c in chosen),
+        "final_context_token_estimate": sum(chunk_tokens(c) for c in chosen),
         "context_selection_steps": ["legacy_expand_neighbors"],
     }
     expansion_timing_ms = {"selection_ms": 0, "budget_ms": 0}
@@ -909,7 +1191,8 @@ def post_query(
             if _is_plain_log_mode():
                 request_log_payload["prompt"] = prompt
             audit_log_event(db, str(payload.tenant_id), str(corr), "LLM_REQUEST", request_log_payload)
-            llm_payload = get_ollama_client().generate(prompt, keep_alive=settings.OLLAMA_KEEP_ALIVE_SECONDS)
+            generate_kwargs = {"on_token": on_token} if on_token is not None else {}
+            llm_payload = get_ollama_client().generate(prompt, keep_alive=settings.OLLAMA_KEEP_ALIVE_SECONDS, **generate_kwargs)
             if isinstance(llm_payload, dict):
                 llm_raw = str(llm_payload.get("response", ""))
             else:
@@ -925,6 +1208,8 @@ def post_query(
                 response_log_payload["raw"] = llm_payload
             audit_log_event(db, str(payload.tenant_id), str(corr), "LLM_RESPONSE", response_log_payload)
             log_event("llm.call.completed", payload={"tenant_id": str(payload.tenant_id), "model": settings.LLM_MODEL, "provider": settings.LLM_PROVIDER, "num_ctx": settings.LLM_NUM_CTX, "prompt_tokens": llm_tokens_est, "completion_tokens": llm_completion_tokens_est, "total_tokens": llm_tokens_est + llm_completion_tokens_est, "latency_ms": int((time.perf_counter() - llm_start) * 1000), "keep_alive_seconds": settings.OLLAMA_KEEP_ALIVE_SECONDS, "retry_count": 0}, plane="data")
+        except _StreamCancelled:
+            raise
         except Exception as exc:  # noqa: BLE001
             llm_raw = ""
             audit_log_event(db, str(payload.tenant_id), str(corr), "ERROR", {"code": "LLM_PROVIDER_ERROR", "message": str(exc)})
@@ -949,6 +1234,7 @@ def post_query(
                 [c["chunk_text"] for c in chosen],
                 settings.MIN_SENTENCE_SIMILARITY,
                 settings.MIN_LEXICAL_OVERLAP,
+                **_verification_encoder_kwargs(db, str(payload.tenant_id), str(corr), chosen),
             )
             if not valid or not answer:
                 answer = build_structured_refusal(str(corr), anti_payload)
@@ -977,13 +1263,14 @@ def post_query(
 
     if settings.ENABLE_PER_STAGE_LATENCY_METRICS:
         analysis_ms = int(timers.get("t_vector_ms", 0) + t_rerank)
-        log_stage_latency(stage="analysis_agent", latency_ms=analysis_ms, model_id=settings.RERANKER_MODEL, request_id=str(corr))
+        log_stage_latency(stage="analysis_agent", latency_ms=analysis_ms, model_id=settings.RERANKER_MODEL, request_id=str(corr), tenant_id=str(payload.tenant_id))
         emit_metric("rag_analysis_latency", analysis_ms)
-        log_stage_latency(stage="answer_agent", latency_ms=t_llm_ms if t_llm_ms > 0 else t_citations_ms, model_id=settings.LLM_MODEL, request_id=str(corr))
+        log_stage_latency(stage="answer_agent", latency_ms=t_llm_ms if t_llm_ms > 0 else t_citations_ms, model_id=settings.LLM_MODEL, request_id=str(corr), tenant_id=str(payload.tenant_id))
         emit_metric("rag_answer_latency", t_llm_ms if t_llm_ms > 0 else t_citations_ms)
     t_total_ms = int((time.perf_counter() - t_start) * 1000)
     perf = {
         "t_parse_ms": t_parse_ms,
+        "t_embed_ms": t_embed_ms,
         **timers,
         "t_lexical_ms": lexical_ms,
         "t_rerank_ms": t_rerank,
@@ -1063,6 +1350,7 @@ def post_query(
     trace["anti_hallucination"] = anti_payload
     trace["timing"] = perf
     trace["confidence"] = response_confidence
+    trace["vector_search"] = {"distance_metric": settings.VECTOR_DISTANCE_METRIC, **_vector_search_params(str(payload.tenant_id))}
 
     if conversation_repo is not None and conversation_id is not None and user_turn is not None:
         trace_rows = _build_retrieval_trace_rows(conversation_id, user_turn.turn_id, tenant_safe_ranked, chosen)
@@ -1075,10 +1363,16 @@ def post_query(
 
     log_event("answer.audit", payload={"tenant_id": str(payload.tenant_id), "retrieved_chunk_ids": sorted([str(c.get("chunk_id")) for c in chosen]), "document_ids": sorted({str(c.get("document_id")) for c in chosen}), "source_version_ids": sorted({str(c.get("source_version_id")) for c in chosen if c.get("source_version_id")}), "model": settings.LLM_MODEL, "num_ctx": settings.LLM_NUM_CTX}, plane="data")
 
-    return QueryResponse(
+    response = QueryResponse(
         answer=answer,
         only_sources_verdict=only_sources,
         citations=citations if payload.citations else [],
         correlation_id=corr,
-        trace={"trace_id": corr, "scoring_trace": trace["scoring_trace"]},
+        trace={"trace_id": corr, "scoring_trace": trace["scoring_trace"], "vector_search": trace["vector_search"]},
     )
+    if response_cache_key is not None and only_sources == "PASS":
+        if settings.QUERY_RESPONSE_CACHE_ENABLED:
+            get_query_response_cache().put(response_cache_key, response)
+        if semantic_scope is not None:
+            get_semantic_query_cache().put(str(payload.tenant_id), semantic_scope, query_embedding, response)
+    return response
@@ -0,0 +1,65 @@
+import argparse
+import uuid
+from collections.abc import Sequence
+
+OPCLASSES = {"cosine": "vector_cosine_ops", "inner_product": "vector_ip_ops", "l2": "vector_l2_ops"}
+INDEX_PREFIXES = {"cosine": "ix_chunk_vectors_cos_", "inner_product": "ix_chunk_vectors_ip_", "l2": "ix_chunk_vectors_l2_"}
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Create per-tenant partial ANN indexes on chunk_vectors")
+    parser.add_argument("--tenant", type=str, help="Tenant UUID")
+    parser.add_argument("--all", action="store_true", dest="all_tenants", help="Create for all tenants")
+    parser.add_argument("--metric", choices=sorted(OPCLASSES), default=None, help="Distance metric (default: VECTOR_DISTANCE_METRIC)")
+    args = parser.parse_args(argv)
+    if not args.all_tenants and not args.tenant:
+        parser.error("either --tenant or --all must be provided")
+    return args
+
+
+def tenant_index_name(tenant_id: str, metric: str) -> str:
+    return INDEX_PREFIXES[metric] + str(tenant_id).replace("-", "").lower()
+
+
+def tenant_index_ddl(tenant_id: str, metric: str, method: str = "hnsw") -> str:
+    tenant = str(uuid.UUID(str(tenant_id)))
+    with_clause = " WITH (lists = 100)" if method == "ivfflat" else ""
+    return (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {tenant_index_name(tenant, metric)} "
+        f"ON chunk_vectors USING {method} (embedding {OPCLASSES[metric]}){with_clause} "
+        f"WHERE tenant_id = '{tenant}'::uuid"
+    )
+
+
+def build_tenant_indexes(tenant_id: str | None = None, all_tenants: bool = False, metric: str = "cosine") -> int:
+    from sqlalchemy import text
+
+    from app.db.session import engine
+
+    # CONCURRENTLY cannot run inside a transaction block, and a plain build would hold a SHARE
+    # lock on chunk_vectors (blocking ingestion for every tenant) until it finishes.
+    with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as conn:
+        method = "hnsw" if conn.execute(text("SELECT EXISTS (SELECT 1 FROM pg_am WHERE amname = 'hnsw')")).scalar() else "ivfflat"
+        if all_tenants:
+            tenants = [str(row[0]) for row in conn.execute(text("SELECT tenant_id FROM tenants")).all()]
+        else:
+            tenants = [tenant_id or ""]
+        for tenant in tenants:
+            conn.execute(text(tenant_index_ddl(tenant, metric, method)))
+        return len(tenants)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    metric = args.metric
+    if metric is None:
+        from app.core.config import settings
+
+        metric = settings.VECTOR_DISTANCE_METRIC
+    count = build_tenant_indexes(tenant_id=args.tenant, all_tenants=args.all_tenants, metric=metric)
+    print(f"chunk_vectors tenant ANN indexes ensured; metric={metric} tenants={count}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
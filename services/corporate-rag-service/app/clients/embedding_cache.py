@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+from app.services.telemetry import increment_counter
+
+
+def normalize_query_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+class CachedEmbeddingsClient:
+    """LRU/TTL cache of query embeddings in front of an ``EmbeddingsClient``.
+
+    Entries are keyed by ``(tenant_id, model_id, whitespace-normalized text)``; the tenant
+    component is dropped when ``tenant_isolation`` is disabled so identical queries share
+    one vector across tenants.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_entries: int = 2048,
+        ttl_seconds: float = 3600.0,
+        tenant_isolation: bool = True,
+        now_fn: Callable[[], float] | None = None,
+    ):
+        self.client = client
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.tenant_isolation = tenant_isolation
+        self._entries: OrderedDict[tuple[str | None, str, str], tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._now_fn = now_fn or time.monotonic
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str, model_id: str, tenant_id: str | None) -> tuple[str | None, str, str]:
+        return (tenant_id if self.tenant_isolation else None, model_id, normalize_query_text(text))
+
+    def _get(self, key: tuple[str | None, str, str]) -> list[float] | None:
+        now = self._now_fn()
+        vector: list[float] | None = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_seconds <= 0 or now - entry[0] < self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                vector = list(entry[1])
+            else:
+                if entry is not None:
+                    self._entries.pop(key, None)
+                self.misses += 1
+        increment_counter("query_embedding_cache_hits" if vector is not None else "query_embedding_cache_misses")
+        return vector
+
+    def _put(self, key: tuple[str | None, str, str], vector: list[float]) -> None:
+        with self._lock:
+            self._entries[key] = (self._now_fn(), list(vector))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def embed_text(
+        self,
+        text: str,
+        tenant_id: str | None = None,
+        correlation_id: str | None = None,
+        model_id: str = "bge-m3",
+    ) -> list[float]:
+        key = self._key(text, model_id, tenant_id)
+        cached = self._get(key)
+        if cached is not None:
+            return cached
+        vector = self.client.embed_text(text, tenant_id=tenant_id, correlation_id=correlation_id, model_id=model_id)
+        self._put(key, vector)
+        return list(vector)
+
+    def embed_texts(
+        self,
+        texts: list[str],
+        model_id: str = "bge-m3",
+        tenant_id: str | None = None,
+        correlation_id: str | None = None,
+    ) -> list[list[float]]:
+        keys = [self._key(text, model_id, tenant_id) for text in texts]
+        vectors: list[list[float] | None] = [self._get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            fetched = self.client.embed_texts([texts[i] for i in missing], model_id=model_id, tenant_id=tenant_id, correlation_id=correlation_id)
+            if len(fetched) != len(missing):
+                raise RuntimeError("Embeddings service returned mismatched row count")
+            for i, vector in zip(missing, fetched):
+                self._put(keys[i], vector)
+                vectors[i] = list(vector)
+        return vectors
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
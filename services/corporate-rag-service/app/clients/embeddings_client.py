@@ -1,37 +1,95 @@
+import base64
+
+import numpy as np
+
+from app.clients.http_pool import get_http_client
+
+ENCODING_FORMATS = ("float", "base64", "binary")
+_FLOAT32_LE = np.dtype("<f4")
+
+
 class EmbeddingsClient:
-    def __init__(self, base_url: str | None = None, timeout_seconds: int | None = None):
+    def __init__(self, base_url: str | None = None, timeout_seconds: int | None = None, encoding_format: str = "float"):
         if base_url is None or timeout_seconds is None:
             from app.core.config import settings
 
             base_url = base_url or settings.EMBEDDINGS_SERVICE_URL
             timeout_seconds = timeout_seconds or settings.EMBEDDINGS_TIMEOUT_SECONDS
+        if encoding_format not in ENCODING_FORMATS:
+            raise ValueError(f"encoding_format must be one of {list(ENCODING_FORMATS)}")
         self.base_url = str(base_url).rstrip("/")
         self.timeout_seconds = float(timeout_seconds)
+        self.encoding_format = encoding_format
 
-    def embed_texts(
-        self,
-        texts: list[str],
-        model_id: str = "bge-m3",
-        tenant_id: str | None = None,
-        correlation_id: str | None = None,
-    ) -> list[list[float]]:
-        if not texts:
-            return []
+    def _build_payload(self, texts: list[str], model_id: str, tenant_id: str | None, correlation_id: str | None, encoding_format: str) -> dict:
         payload = {
             "model": model_id,
             "input": texts,
-            "encoding_format": "float",
+            "encoding_format": encoding_format,
         }
         if tenant_id is not None:
             payload["tenant_id"] = tenant_id
         if correlation_id is not None:
             payload["correlation_id"] = correlation_id
-        import httpx
+        return payload
 
-        with httpx.Client(timeout=self.timeout_seconds) as client:
-            response = client.post(f"{self.base_url}/v1/embeddings", json=payload)
+    @staticmethod
+    def _decode_binary_frame(content: bytes, headers, expected_rows: int) -> np.ndarray:
+        count = int(headers.get("x-embedding-count", expected_rows))
+        if count != expected_rows:
+            raise RuntimeError("Embeddings service returned mismatched row count")
+        flat = np.frombuffer(content, dtype=_FLOAT32_LE)
+        if count == 0 or flat.size == 0:
+            raise RuntimeError("Embeddings service returned empty data")
+        dim = int(headers.get("x-embedding-dim", flat.size // count))
+        if dim * count != flat.size:
+            raise RuntimeError("Embeddings service returned malformed binary frame")
+        return flat.reshape(count, dim)
+
+    def embed_matrix(
+        self,
+        texts: list[str],
+        model_id: str = "bge-m3",
+        tenant_id: str | None = None,
+        correlation_id: str | None = None,
+    ) -> np.ndarray:
+        """Return embeddings as one contiguous ``(len(texts), dim)`` float32 array."""
+        if not texts:
+            return np.empty((0, 0), dtype=_FLOAT32_LE)
+        payload = self._build_payload(texts, model_id, tenant_id, correlation_id, self.encoding_format)
+        client = get_http_client(self.base_url, timeout=self.timeout_seconds)
+        if self.encoding_format == "binary":
+            response = client.post(f"{self.base_url}/v1/embeddings", json=payload, headers={"Accept": "application/octet-stream"})
             response.raise_for_status()
-            body = response.json()
+            return self._decode_binary_frame(response.content, response.headers, len(texts))
+        response = client.post(f"{self.base_url}/v1/embeddings", json=payload)
+        response.raise_for_status()
+        body = response.json()
+        data = body["data"]
+        if not data:
+            raise RuntimeError("Embeddings service returned empty data")
+        if self.encoding_format == "base64":
+            raw = b"".join(base64.b64decode(item["embedding"]) for item in data)
+            return np.frombuffer(raw, dtype=_FLOAT32_LE).reshape(len(data), -1)
+        return np.ascontiguousarray([item["embedding"] for item in data], dtype=_FLOAT32_LE)
+
+    def embed_texts(
+        self,
+        texts: list[str],
+        model_id: str = "bge-m3",
+        tenant_id: str | None = None,
+        correlation_id: str | None = None,
+    ) -> list[list[float]]:
+        """List-of-floats API; bulk callers (ingestion, verification) use ``embed_matrix``."""
+        if not texts:
+            return []
+        if self.encoding_format != "float":
+            return self.embed_matrix(texts, model_id=model_id, tenant_id=tenant_id, correlation_id=correlation_id).tolist()
+        payload = self._build_payload(texts, model_id, tenant_id, correlation_id, "float")
+        client = get_http_client(self.base_url, timeout=self.timeout_seconds)
+        response = client.post(f"{self.base_url}/v1/embeddings", json=payload)
+        response.raise_for_status()
+        body = response.json()
         data = body["data"]
         if not data:
             raise RuntimeError("Embeddings service returned empty data")
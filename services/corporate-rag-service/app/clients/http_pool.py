@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import importlib.util
+import threading
+from types import SimpleNamespace
+from typing import Any
+from urllib.parse import urlsplit
+
+from app.core.logging import log_event
+from app.services.telemetry import emit_metric
+
+
+def _load_settings() -> Any:
+    try:
+        from app.core.config import settings
+
+        return settings
+    except Exception:  # noqa: BLE001
+        return SimpleNamespace(
+            HTTP_POOL_MAX_CONNECTIONS=20,
+            HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS=10,
+            HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS=30.0,
+            HTTP_POOL_HTTP2_ENABLED=True,
+        )
+
+
+def _origin(url: str) -> str:
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url.rstrip("/")
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientPool:
+    """Process-wide registry of keep-alive ``httpx.Client`` instances.
+
+    One client (and therefore one connection pool) is kept per origin, timeout and
+    static header set, so repeated calls to the embeddings service, Ollama or
+    Confluence reuse TCP/TLS connections instead of reconnecting per request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: dict[tuple, Any] = {}
+        self._requests: dict[tuple, int] = {}
+
+    def _limits_kwargs(self) -> dict[str, Any]:
+        import httpx
+
+        cfg = _load_settings()
+        max_connections = int(getattr(cfg, "HTTP_POOL_MAX_CONNECTIONS", 20))
+        return {
+            "limits": httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=int(getattr(cfg, "HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS", 10)),
+                keepalive_expiry=float(getattr(cfg, "HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS", 30.0)),
+            ),
+            "http2": bool(getattr(cfg, "HTTP_POOL_HTTP2_ENABLED", True)) and _http2_available(),
+        }
+
+    def get(self, url: str, *, timeout: float, headers: dict[str, str] | None = None) -> Any:
+        key = (_origin(url), float(timeout), tuple(sorted((headers or {}).items())))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                import httpx
+
+                self._requests[key] = 0
+
+                def _count_response(_response: Any, _key: tuple = key) -> None:
+                    # Runs on every response from any thread: just count, pool internals are
+                    # read at scrape time (sample_utilization).
+                    with self._lock:
+                        if _key in self._requests:
+                            self._requests[_key] += 1
+
+                client = httpx.Client(
+                    timeout=float(timeout),
+                    headers=headers or None,
+                    event_hooks={"response": [_count_response]},
+                    **self._limits_kwargs(),
+                )
+                self._clients[key] = client
+            return client
+
+    def _client_stats(self, key: tuple, client: Any) -> dict[str, Any]:
+        # Callers hold self._lock.
+        transport = getattr(client, "_transport", None)
+        pool = getattr(transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for conn in connections if getattr(conn, "is_idle", lambda: False)())
+        return {
+            "origin": key[0],
+            "requests": self._requests.get(key, 0),
+            "max_connections": int(getattr(pool, "_max_connections", 0) or 0),
+            "open_connections": len(connections),
+            "active_connections": len(connections) - idle,
+            "idle_connections": idle,
+            "http2": bool(getattr(pool, "_http2", False)),
+        }
+
+    def stats(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [self._client_stats(key, client) for key, client in self._clients.items()]
+
+    def sample_utilization(self) -> None:
+        """Emit ``http_pool_utilization`` (active / max connections) once per pool."""
+        for stats in self.stats():
+            if stats["max_connections"]:
+                emit_metric("http_pool_utilization", stats["active_connections"] / stats["max_connections"])
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.items())
+            snapshot = [self._client_stats(key, client) for key, client in clients]
+            self._clients.clear()
+            self._requests.clear()
+        for _key, client in clients:
+            close = getattr(client, "close", None)
+            if callable(close):
+                close()
+        if snapshot:
+            log_event("http_pool.closed", payload={"pools": snapshot}, plane="control")
+
+
+_POOL = HttpClientPool()
+
+
+def get_http_client(url: str, *, timeout: float, headers: dict[str, str] | None = None) -> Any:
+    return _POOL.get(url, timeout=timeout, headers=headers)
+
+
+def http_pool_stats() -> list[dict[str, Any]]:
+    return _POOL.stats()
+
+
+def sample_http_pool_utilization() -> None:
+    _POOL.sample_utilization()
+
+
+def close_http_clients() -> None:
+    _POOL.close()
@@ -1,3 +1,9 @@
+import json
+from typing import Callable
+
+from app.clients.http_pool import get_http_client
+
+
 class OllamaClient:
     def __init__(self, endpoint: str | None = None, model: str | None = None, timeout_seconds: int | None = None, num_ctx: int | None = None):
         if endpoint is None or model is None or timeout_seconds is None:
@@ -12,30 +18,49 @@ class OllamaClient:
         self.timeout_seconds = float(timeout_seconds)
         self.num_ctx = int(num_ctx or 65536)
 
-    def generate(self, prompt: str, *, keep_alive: int = 0) -> dict:
+    def generate(self, prompt: str, *, keep_alive: int = 0, on_token: Callable[[str], None] | None = None) -> dict:
+        """Run a completion; with ``on_token`` the response is streamed and each delta is passed to it.
+
+        The return value has the same shape in both modes: the final Ollama payload with the
+        full ``response`` text.
+        """
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False,
+            "stream": on_token is not None,
             "keep_alive": keep_alive,
             "options": {"temperature": 0, "top_p": 1, "num_ctx": self.num_ctx},
         }
-        import httpx
-
-        with httpx.Client(timeout=self.timeout_seconds) as client:
+        client = get_http_client(self.endpoint, timeout=self.timeout_seconds)
+        if on_token is None:
             response = client.post(self.endpoint, json=payload)
             response.raise_for_status()
             return response.json()
 
-    def show_model(self, model_id: str | None = None) -> dict:
-        import httpx
+        parts: list[str] = []
+        final: dict = {}
+        with client.stream("POST", self.endpoint, json=payload) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                delta = str(chunk.get("response", ""))
+                if delta:
+                    parts.append(delta)
+                    on_token(delta)
+                if chunk.get("done"):
+                    final = chunk
+                    break
+        return {**final, "response": "".join(parts)}
 
+    def show_model(self, model_id: str | None = None) -> dict:
         target_model = model_id or self.model
         base_url = self.endpoint.rsplit("/api/generate", 1)[0]
-        with httpx.Client(timeout=self.timeout_seconds) as client:
-            response = client.post(f"{base_url}/api/show", json={"model": target_model})
-            response.raise_for_status()
-            return response.json()
+        client = get_http_client(base_url, timeout=self.timeout_seconds)
+        response = client.post(f"{base_url}/api/show", json={"model": target_model})
+        response.raise_for_status()
+        return response.json()
 
     def fetch_model_num_ctx(self, model_id: str | None = None) -> int | None:
         payload = self.show_model(model_id=model_id)
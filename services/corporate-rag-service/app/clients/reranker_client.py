@@ -0,0 +1,23 @@
+from app.clients.http_pool import get_http_client
+
+
+class RerankerClient:
+    """HTTP client for the reranker-service ``/v1/rerank`` endpoint."""
+
+    def __init__(self, base_url: str, timeout_seconds: float = 10.0):
+        self.base_url = str(base_url).rstrip("/")
+        self.timeout_seconds = float(timeout_seconds)
+
+    def score(self, query: str, documents: list[str], model_id: str) -> list[float]:
+        if not documents:
+            return []
+        client = get_http_client(self.base_url, timeout=self.timeout_seconds)
+        response = client.post(f"{self.base_url}/v1/rerank", json={"model": model_id, "query": query, "documents": documents})
+        response.raise_for_status()
+        results = response.json()["results"]
+        if len(results) != len(documents):
+            raise RuntimeError("Reranker service returned mismatched result count")
+        scores = [0.0] * len(documents)
+        for item in results:
+            scores[int(item["index"])] = float(item["score"])
+        return scores
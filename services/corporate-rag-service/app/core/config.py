@@ -1,9 +1,51 @@
+import json
 import logging
 import os
 
-from pydantic import AliasChoices, Field, computed_field, field_validator, model_validator
+from pydantic import AliasChoices, Field, PrivateAttr, computed_field, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+MAX_HNSW_EF_SEARCH = 1000
+CONNECTOR_SOURCE_TYPES = ("CONFLUENCE_PAGE", "CONFLUENCE_ATTACHMENT", "FILE_CATALOG_OBJECT", "S3_CATALOG_OBJECT")
+
+
+def parse_connector_fetch_concurrency_overrides(value: str) -> dict[str, int]:
+    """``"CONFLUENCE_PAGE=8,S3_CATALOG_OBJECT=2"`` -> ``{"CONFLUENCE_PAGE": 8, "S3_CATALOG_OBJECT": 2}``."""
+    out: dict[str, int] = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        name, sep, raw = (piece.strip() for piece in part.partition("="))
+        if not sep or name not in CONNECTOR_SOURCE_TYPES:
+            raise ValueError(f"CONNECTOR_FETCH_CONCURRENCY_OVERRIDES entries must be SOURCE_TYPE=N with SOURCE_TYPE in {list(CONNECTOR_SOURCE_TYPES)}")
+        try:
+            concurrency = int(raw)
+        except ValueError as exc:
+            raise ValueError(f"CONNECTOR_FETCH_CONCURRENCY_OVERRIDES[{name}] must be an integer") from exc
+        if concurrency < 1:
+            raise ValueError(f"CONNECTOR_FETCH_CONCURRENCY_OVERRIDES[{name}] must be >= 1")
+        out[name] = concurrency
+    return out
+
+
+def parse_vector_search_tenant_overrides(value: str) -> dict[str, dict[str, int]]:
+    if not value.strip():
+        return {}
+    try:
+        parsed = json.loads(value)
+    except json.JSONDecodeError as exc:
+        raise ValueError("VECTOR_SEARCH_TENANT_OVERRIDES must be a JSON object") from exc
+    if not isinstance(parsed, dict):
+        raise ValueError("VECTOR_SEARCH_TENANT_OVERRIDES must be a JSON object")
+    for tenant_id, override in parsed.items():
+        if not isinstance(override, dict) or not set(override) <= {"ef_search", "probes"}:
+            raise ValueError(f"VECTOR_SEARCH_TENANT_OVERRIDES[{tenant_id}] may only set ef_search and probes")
+        if any(isinstance(v, bool) or not isinstance(v, int) or v < 0 for v in override.values()):
+            raise ValueError(f"VECTOR_SEARCH_TENANT_OVERRIDES[{tenant_id}] values must be non-negative integers")
+        if override.get("ef_search", 0) > MAX_HNSW_EF_SEARCH:
+            raise ValueError(f"VECTOR_SEARCH_TENANT_OVERRIDES[{tenant_id}].ef_search must be <= {MAX_HNSW_EF_SEARCH}")
+    return {str(tenant_id): dict(override) for tenant_id, override in parsed.items()}
+
 
 class Settings(BaseSettings):
     APP_NAME: str = "corporate-rag-service"
@@ -32,6 +74,20 @@ class Settings(BaseSettings):
     EMBEDDINGS_DEFAULT_MODEL_ID: str = "bge-m3"
     EMBEDDINGS_BATCH_SIZE: int = 64
     EMBEDDINGS_RETRY_ATTEMPTS: int = 3
+    EMBEDDINGS_INDEX_CONCURRENCY: int = 2
+    EMBEDDINGS_ENCODING_FORMAT: str = "float"
+    QUERY_EMBEDDING_CACHE_ENABLED: bool = True
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES: int = 2048
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS: int = 3600
+    QUERY_EMBEDDING_CACHE_TENANT_ISOLATION: bool = True
+    QUERY_RESPONSE_CACHE_ENABLED: bool = False
+    QUERY_RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    QUERY_RESPONSE_CACHE_TTL_SECONDS: int = 600
+    QUERY_SEMANTIC_CACHE_ENABLED: bool = False
+    QUERY_SEMANTIC_CACHE_SIMILARITY_THRESHOLD: float = 0.95
+    QUERY_SEMANTIC_CACHE_MAX_ENTRIES: int = 512
+    QUERY_SEMANTIC_CACHE_TTL_SECONDS: int = 600
+    QUERY_SEMANTIC_CACHE_MAX_TENANTS: int = 64
     USE_VECTOR_RETRIEVAL: bool = True
     HYBRID_SCORE_NORMALIZATION: bool = True
     HYBRID_WEIGHT_VECTOR: float = 0.7
@@ -40,6 +96,14 @@ class Settings(BaseSettings):
     HYBRID_W_FTS: float = 0.3
     HYBRID_MAX_VECTOR: int = 20
     HYBRID_MAX_FTS: int = 20
+    RETRIEVAL_HYDRATE_EMBEDDINGS: bool = False
+    QUERY_PARALLEL_LEXICAL_PREFETCH: bool = True
+    QUERY_STAGE_EXECUTOR_WORKERS: int = 16
+    VECTOR_DISTANCE_METRIC: str = "cosine"
+    VECTOR_HNSW_EF_SEARCH: int = 0
+    VECTOR_IVFFLAT_PROBES: int = 0
+    VECTOR_HNSW_ITERATIVE_SCAN: str = "off"
+    VECTOR_SEARCH_TENANT_OVERRIDES: str = ""
     USE_CONTEXTUAL_EXPANSION: bool = False
     NEIGHBOR_WINDOW: int = 1
     CONTEXT_EXPANSION_ENABLED: bool = False
@@ -84,6 +148,12 @@ class Settings(BaseSettings):
     CONNECTOR_SYNC_MAX_ITEMS_PER_RUN: int = 5000
     CONNECTOR_SYNC_PAGE_SIZE: int = 100
     CONNECTOR_INCREMENTAL_ENABLED: bool = True
+    CONNECTOR_FETCH_CONCURRENCY: int = 4
+    CONNECTOR_FETCH_CONCURRENCY_OVERRIDES: str = ""
+    CONNECTOR_FETCH_THROTTLE_RETRIES: int = 3
+    CONNECTOR_CONVERSION_PROCESSES: int = 0
+    CONNECTOR_SYNC_BATCH_ITEMS: int = 50
+    CONNECTOR_SYNC_BATCH_MAX_BYTES: int = 64 * 1024 * 1024
 
     CONFLUENCE_BASE_URL: str = ""
     CONFLUENCE_AUTH_MODE: str = "pat"
@@ -119,8 +189,21 @@ class Settings(BaseSettings):
     EXPAND_MAX_EXTRA_PER_DOC: int = 6
 
     LOG_DATA_MODE: str = "PLAIN"
+    AUDIT_ASYNC_WRITER_ENABLED: bool = False
+    AUDIT_WRITER_MAX_BUFFER: int = 10000
+    AUDIT_WRITER_BATCH_SIZE: int = 200
+    AUDIT_WRITER_FLUSH_INTERVAL_MS: int = 200
+    AUDIT_WRITER_OVERFLOW_POLICY: str = "block"
+    AUDIT_WRITER_BLOCK_TIMEOUT_MS: int = 50
     RERANKER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
     RERANKER_TOP_K: int = 20
+    RERANKER_MAX_LENGTH: int = 512
+    RERANKER_BATCH_SIZE: int = 32
+    RERANKER_SCORE_CACHE_MAX_ENTRIES: int = 10000
+    RERANKER_SERVICE_URL: str = ""
+    RERANKER_TIMEOUT_SECONDS: float = 10.0
+    RERANKER_REMOTE_FALLBACK: bool = True
+    RERANKER_REMOTE_COOLDOWN_SECONDS: float = 30.0
 
     LLM_PROVIDER: str = "ollama"
     LLM_ENDPOINT: str = Field(default="http://localhost:11434/api/generate", validation_alias=AliasChoices("LLM_ENDPOINT", "OLLAMA_BASE_URL"))
@@ -131,6 +214,10 @@ class Settings(BaseSettings):
 
     REQUEST_TIMEOUT_SECONDS: int = 30
     EMBEDDINGS_TIMEOUT_SECONDS: int = 30
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_POOL_HTTP2_ENABLED: bool = True
     MAX_EMBED_BATCH_SIZE: int = 64
     DEFAULT_TOP_K: int = 5
 
@@ -143,9 +230,13 @@ class Settings(BaseSettings):
 
     MIN_SENTENCE_SIMILARITY: float = 0.65
     MIN_LEXICAL_OVERLAP: float = 0.25
+    ANTI_HALLUCINATION_ENCODER: str = "local"
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="forbid")
 
+    _vector_search_tenant_overrides: tuple[str, dict[str, dict[str, int]]] = PrivateAttr(default=("", {}))
+    _connector_fetch_concurrency_overrides: tuple[str, dict[str, int]] = PrivateAttr(default=("", {}))
+
 
     @field_validator("LLM_NUM_CTX")
     @classmethod
@@ -158,6 +249,63 @@ class Settings(BaseSettings):
 
 
 
+    @field_validator("EMBEDDINGS_ENCODING_FORMAT")
+    @classmethod
+    def validate_embeddings_encoding_format(cls, value: str) -> str:
+        allowed = {"float", "base64", "binary"}
+        normalized = value.lower().strip()
+        if normalized not in allowed:
+            raise ValueError(f"EMBEDDINGS_ENCODING_FORMAT must be one of {sorted(allowed)}")
+        return normalized
+
+    @field_validator("VECTOR_DISTANCE_METRIC")
+    @classmethod
+    def validate_vector_distance_metric(cls, value: str) -> str:
+        allowed = {"cosine", "inner_product", "l2"}
+        normalized = value.lower().strip()
+        if normalized not in allowed:
+            raise ValueError(f"VECTOR_DISTANCE_METRIC must be one of {sorted(allowed)}")
+        return normalized
+
+    @field_validator("VECTOR_HNSW_ITERATIVE_SCAN")
+    @classmethod
+    def validate_vector_hnsw_iterative_scan(cls, value: str) -> str:
+        allowed = {"off", "strict_order", "relaxed_order"}
+        normalized = value.lower().strip()
+        if normalized not in allowed:
+            raise ValueError(f"VECTOR_HNSW_ITERATIVE_SCAN must be one of {sorted(allowed)}")
+        return normalized
+
+    @field_validator("AUDIT_WRITER_OVERFLOW_POLICY")
+    @classmethod
+    def validate_audit_writer_overflow_policy(cls, value: str) -> str:
+        allowed = {"block", "drop"}
+        normalized = value.lower().strip()
+        if normalized not in allowed:
+            raise ValueError(f"AUDIT_WRITER_OVERFLOW_POLICY must be one of {sorted(allowed)}")
+        return normalized
+
+    @field_validator("ANTI_HALLUCINATION_ENCODER")
+    @classmethod
+    def validate_anti_hallucination_encoder(cls, value: str) -> str:
+        allowed = {"local", "chunk_vectors"}
+        normalized = value.lower().strip()
+        if normalized not in allowed:
+            raise ValueError(f"ANTI_HALLUCINATION_ENCODER must be one of {sorted(allowed)}")
+        return normalized
+
+    @field_validator("VECTOR_SEARCH_TENANT_OVERRIDES")
+    @classmethod
+    def validate_vector_search_tenant_overrides(cls, value: str) -> str:
+        parse_vector_search_tenant_overrides(value)
+        return value.strip()
+
+    @field_validator("CONNECTOR_FETCH_CONCURRENCY_OVERRIDES")
+    @classmethod
+    def validate_connector_fetch_concurrency_overrides(cls, value: str) -> str:
+        parse_connector_fetch_concurrency_overrides(value)
+        return value.strip()
+
     @field_validator("LLM_PROVIDER")
     @classmethod
     def validate_llm_provider(cls, value: str) -> str:
@@ -173,8 +321,54 @@ class Settings(BaseSettings):
             raise ValueError("DEFAULT_TOP_K must be >= 1")
         if self.RERANKER_TOP_K < 1:
             raise ValueError("RERANKER_TOP_K must be >= 1")
+        if self.RERANKER_MAX_LENGTH < 1:
+            raise ValueError("RERANKER_MAX_LENGTH must be >= 1")
+        if self.RERANKER_BATCH_SIZE < 1:
+            raise ValueError("RERANKER_BATCH_SIZE must be >= 1")
+        if self.RERANKER_SCORE_CACHE_MAX_ENTRIES < 0:
+            raise ValueError("RERANKER_SCORE_CACHE_MAX_ENTRIES must be >= 0")
+        if self.QUERY_RESPONSE_CACHE_MAX_ENTRIES < 1:
+            raise ValueError("QUERY_RESPONSE_CACHE_MAX_ENTRIES must be >= 1")
+        if self.QUERY_RESPONSE_CACHE_TTL_SECONDS < 0:
+            raise ValueError("QUERY_RESPONSE_CACHE_TTL_SECONDS must be >= 0")
+        if self.CONNECTOR_FETCH_CONCURRENCY < 1:
+            raise ValueError("CONNECTOR_FETCH_CONCURRENCY must be >= 1")
+        if self.CONNECTOR_FETCH_THROTTLE_RETRIES < 0 or self.CONNECTOR_CONVERSION_PROCESSES < 0:
+            raise ValueError("CONNECTOR_FETCH_THROTTLE_RETRIES and CONNECTOR_CONVERSION_PROCESSES must be >= 0")
+        if self.CONNECTOR_SYNC_BATCH_ITEMS < 1 or self.CONNECTOR_SYNC_BATCH_MAX_BYTES < 1:
+            raise ValueError("CONNECTOR_SYNC_BATCH_ITEMS and CONNECTOR_SYNC_BATCH_MAX_BYTES must be >= 1")
+        if self.EMBEDDINGS_INDEX_CONCURRENCY < 1:
+            raise ValueError("EMBEDDINGS_INDEX_CONCURRENCY must be >= 1")
+        if self.AUDIT_WRITER_MAX_BUFFER < 1:
+            raise ValueError("AUDIT_WRITER_MAX_BUFFER must be >= 1")
+        if self.AUDIT_WRITER_BATCH_SIZE < 1:
+            raise ValueError("AUDIT_WRITER_BATCH_SIZE must be >= 1")
+        if self.AUDIT_WRITER_FLUSH_INTERVAL_MS < 0 or self.AUDIT_WRITER_BLOCK_TIMEOUT_MS < 0:
+            raise ValueError("AUDIT_WRITER_FLUSH_INTERVAL_MS and AUDIT_WRITER_BLOCK_TIMEOUT_MS must be >= 0")
+        if not 0.0 < self.QUERY_SEMANTIC_CACHE_SIMILARITY_THRESHOLD <= 1.0:
+            raise ValueError("QUERY_SEMANTIC_CACHE_SIMILARITY_THRESHOLD must be in (0, 1]")
+        if self.QUERY_SEMANTIC_CACHE_MAX_ENTRIES < 1:
+            raise ValueError("QUERY_SEMANTIC_CACHE_MAX_ENTRIES must be >= 1")
+        if self.QUERY_SEMANTIC_CACHE_TTL_SECONDS < 0:
+            raise ValueError("QUERY_SEMANTIC_CACHE_TTL_SECONDS must be >= 0")
+        if self.QUERY_SEMANTIC_CACHE_MAX_TENANTS < 1:
+            raise ValueError("QUERY_SEMANTIC_CACHE_MAX_TENANTS must be >= 1")
+        if self.RERANKER_TIMEOUT_SECONDS <= 0:
+            raise ValueError("RERANKER_TIMEOUT_SECONDS must be > 0")
+        if self.RERANKER_REMOTE_COOLDOWN_SECONDS < 0:
+            raise ValueError("RERANKER_REMOTE_COOLDOWN_SECONDS must be >= 0")
         if self.REQUEST_TIMEOUT_SECONDS < 1:
             raise ValueError("REQUEST_TIMEOUT_SECONDS must be >= 1")
+        if self.HTTP_POOL_MAX_CONNECTIONS < 1:
+            raise ValueError("HTTP_POOL_MAX_CONNECTIONS must be >= 1")
+        if not 0 <= self.HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS <= self.HTTP_POOL_MAX_CONNECTIONS:
+            raise ValueError("HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS must be between 0 and HTTP_POOL_MAX_CONNECTIONS")
+        if self.QUERY_STAGE_EXECUTOR_WORKERS < 1:
+            raise ValueError("QUERY_STAGE_EXECUTOR_WORKERS must be >= 1")
+        if not 0 <= self.VECTOR_HNSW_EF_SEARCH <= MAX_HNSW_EF_SEARCH:
+            raise ValueError(f"VECTOR_HNSW_EF_SEARCH must be between 0 and {MAX_HNSW_EF_SEARCH}")
+        if self.VECTOR_IVFFLAT_PROBES < 0:
+            raise ValueError("VECTOR_IVFFLAT_PROBES must be >= 0")
         return self
 
     @model_validator(mode="after")
@@ -240,6 +434,23 @@ class Settings(BaseSettings):
             raise ValueError("TOPIC_RESET_SIMILARITY_THRESHOLD and TOPIC_RESET_SIM_THRESHOLD must match")
         return self
 
+    @property
+    def vector_search_tenant_overrides(self) -> dict[str, dict[str, int]]:
+        # Parsed once per raw value instead of on every query.
+        raw, parsed = self._vector_search_tenant_overrides
+        if raw != self.VECTOR_SEARCH_TENANT_OVERRIDES:
+            parsed = parse_vector_search_tenant_overrides(self.VECTOR_SEARCH_TENANT_OVERRIDES)
+            self._vector_search_tenant_overrides = (self.VECTOR_SEARCH_TENANT_OVERRIDES, parsed)
+        return parsed
+
+    @property
+    def connector_fetch_concurrency_overrides(self) -> dict[str, int]:
+        raw, parsed = self._connector_fetch_concurrency_overrides
+        if raw != self.CONNECTOR_FETCH_CONCURRENCY_OVERRIDES:
+            parsed = parse_connector_fetch_concurrency_overrides(self.CONNECTOR_FETCH_CONCURRENCY_OVERRIDES)
+            self._connector_fetch_concurrency_overrides = (self.CONNECTOR_FETCH_CONCURRENCY_OVERRIDES, parsed)
+        return parsed
+
     @computed_field
     @property
     def database_url(self) -> str:
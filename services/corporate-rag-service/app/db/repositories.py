@@ -4,6 +4,8 @@ import json
 import uuid
 from datetime import datetime, timezone
 
+import numpy as np
+from pgvector.sqlalchemy import Vector
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError, OperationalError
 from sqlalchemy.orm import Session
@@ -23,8 +25,16 @@ from app.models.models import (
     IngestJobs,
     QueryResolutions,
     RetrievalTraceItems,
+    TenantCorpusGenerations,
 )
 
+# Distance metric -> (pgvector ordering operator, similarity expression for vec_score).
+VECTOR_DISTANCE_OPERATORS: dict[str, tuple[str, str]] = {
+    "cosine": ("<=>", "(1.0 - (cv.embedding <=> CAST(:qvec AS vector)))"),
+    "inner_product": ("<#>", "(-1.0 * (cv.embedding <#> CAST(:qvec AS vector)))"),
+    "l2": ("<->", "(1.0 / (1.0 + (cv.embedding <-> CAST(:qvec AS vector))))"),
+}
+
 
 def _map_db_error(exc: Exception) -> tuple[str, str | None, bool]:
     sqlstate = getattr(getattr(exc, "orig", None), "sqlstate", None)
@@ -224,48 +234,222 @@ class TenantRepository:
             for chunk, document, vector in rows
         ]
 
-    def fetch_neighbors(self, base_chunks: list[dict], cap: int, window: int = 1) -> list[dict]:
+    def fetch_hybrid_candidates(
+        self,
+        query: str,
+        query_embedding: list[float],
+        lexical_top_n: int,
+        vector_top_n: int,
+        use_similarity: bool = False,
+        include_embeddings: bool = True,
+        distance_metric: str = "cosine",
+        search_params: dict[str, object] | None = None,
+        lexical_hits: list[tuple[str, float]] | None = None,
+    ) -> tuple[list[dict], int, int]:
+        """Run FTS and vector candidate selection plus hydration in a single statement.
+
+        Returns ``(candidates, lexical_count, vector_count)`` where the counts are the sizes
+        of the FTS and vector candidate sets before the union. Cosine similarity to the query
+        is computed in SQL (``vec_cosine``); raw embeddings are only projected when
+        ``include_embeddings`` is set. The vector CTE orders by the operator matching
+        ``distance_metric`` so the planner can use the ANN index built with that opclass;
+        ``search_params`` (pgvector GUCs) and ``plan_cache_mode = force_custom_plan`` are applied
+        transaction-locally beforehand.
+        ``lexical_hits`` from :meth:`fetch_lexical_hits` replace the FTS CTE when the lexical
+        leg was already run (e.g. concurrently with the query embedding request).
+        """
+        if use_similarity:
+            operator, score_sql = VECTOR_DISTANCE_OPERATORS[distance_metric]
+            # Tenant partial ANN indexes only match a literal tenant_id; once psycopg prepares
+            # this statement a generic plan would fall back to the global index.
+            self.apply_vector_search_params({**(search_params or {}), "plan_cache_mode": "force_custom_plan"})
+            vector_cte = f"""
+                vec AS (
+                    SELECT cv.chunk_id,
+                           {score_sql} AS vec_score
+                    FROM chunk_vectors cv
+                    JOIN chunks c ON c.chunk_id = cv.chunk_id
+                    JOIN documents d ON d.document_id = c.document_id
+                    WHERE cv.tenant_id = CAST(:tenant_id AS uuid)
+                      AND c.tenant_id = CAST(:tenant_id AS uuid)
+                      AND d.tenant_id = CAST(:tenant_id AS uuid)
+                    ORDER BY cv.embedding {operator} CAST(:qvec AS vector)
+                    LIMIT :vector_limit
+                )"""
+        else:
+            vector_cte = """
+                vec AS (
+                    SELECT cv.chunk_id,
+                           0.0 AS vec_score
+                    FROM chunk_vectors cv
+                    JOIN chunks c ON c.chunk_id = cv.chunk_id
+                    JOIN documents d ON d.document_id = c.document_id
+                    WHERE cv.tenant_id = CAST(:tenant_id AS uuid)
+                      AND c.tenant_id = CAST(:tenant_id AS uuid)
+                      AND d.tenant_id = CAST(:tenant_id AS uuid)
+                    ORDER BY c.ordinal ASC
+                    LIMIT :vector_limit
+                )"""
+        has_query_vector = len(query_embedding) > 0
+        cosine_column = "(1.0 - (cv.embedding <=> CAST(:qvec AS vector)))" if has_query_vector else "NULL"
+        embedding_column = "cv.embedding" if include_embeddings else "NULL"
+        if lexical_hits is None:
+            lexical_cte = f"""
+                lex AS ({self._LEXICAL_HITS_SQL}
+                )"""
+        else:
+            lexical_cte = """
+                lex AS (
+                    SELECT hits.chunk_id, hits.lex_score
+                    FROM unnest(CAST(:lex_ids AS uuid[]), CAST(:lex_scores AS double precision[])) AS hits(chunk_id, lex_score)
+                )"""
+        statement = text(
+            f"""
+            WITH {lexical_cte},
+            {vector_cte},
+            candidate_ids AS (
+                SELECT chunk_id FROM lex
+                UNION
+                SELECT chunk_id FROM vec
+            )
+            SELECT c.chunk_id::text AS chunk_id,
+                   c.document_id AS document_id,
+                   c.tenant_id::text AS tenant_id,
+                   c.chunk_text AS chunk_text,
+                   c.chunk_path AS chunk_path,
+                   c.ordinal AS ordinal,
+                   c.llm_token_count AS llm_token_count,
+                   c.llm_tokenizer AS llm_tokenizer,
+                   d.title AS title,
+                   d.url AS url,
+                   d.labels AS labels,
+                   d.author AS author,
+                   d.updated_date AS updated_date,
+                   {embedding_column} AS embedding,
+                   {cosine_column} AS vec_cosine,
+                   COALESCE(lex.lex_score, 0.0) AS lex_score,
+                   COALESCE(vec.vec_score, 0.0) AS vec_score,
+                   (SELECT count(*) FROM lex) AS lexical_count,
+                   (SELECT count(*) FROM vec) AS vector_count
+            FROM candidate_ids ids
+            JOIN chunks c ON c.chunk_id = ids.chunk_id
+            JOIN documents d ON d.document_id = c.document_id
+            JOIN chunk_vectors cv ON cv.chunk_id = c.chunk_id
+            LEFT JOIN lex ON lex.chunk_id = c.chunk_id
+            LEFT JOIN vec ON vec.chunk_id = c.chunk_id
+            WHERE c.tenant_id = CAST(:tenant_id AS uuid)
+              AND d.tenant_id = CAST(:tenant_id AS uuid)
+              AND cv.tenant_id = CAST(:tenant_id AS uuid)
+            """
+        ).columns(embedding=Vector())
+        params = {
+            "tenant_id": self.tenant_id,
+            "query_text": query,
+            "lexical_limit": lexical_top_n,
+            "vector_limit": vector_top_n,
+        }
+        if has_query_vector:
+            params["qvec"] = self._to_vector_literal(query_embedding)
+        if lexical_hits is not None:
+            params["lex_ids"] = [chunk_id for chunk_id, _score in lexical_hits]
+            params["lex_scores"] = [float(score) for _chunk_id, score in lexical_hits]
+        rows = self.db.execute(statement, params).mappings().all()
+        if not rows:
+            return [], len(lexical_hits or []), 0
+        candidates = [self._mapping_to_candidate(row) for row in rows]
+        return candidates, int(rows[0]["lexical_count"] or 0), int(rows[0]["vector_count"] or 0)
+
+    _LEXICAL_HITS_SQL = """
+                    SELECT cf.chunk_id,
+                           ts_rank_cd(cf.fts_doc, plainto_tsquery('simple', :query_text)) AS lex_score
+                    FROM chunk_fts cf
+                    WHERE cf.tenant_id = CAST(:tenant_id AS uuid)
+                      AND cf.fts_doc @@ plainto_tsquery('simple', :query_text)
+                    ORDER BY lex_score DESC
+                    LIMIT :lexical_limit"""
+
+    def fetch_lexical_hits(self, query: str, lexical_top_n: int) -> list[tuple[str, float]]:
+        """Run only the FTS leg of hybrid retrieval; feed the result to ``fetch_hybrid_candidates``."""
+        rows = self.db.execute(
+            text(self._LEXICAL_HITS_SQL),
+            {"tenant_id": self.tenant_id, "query_text": query, "lexical_limit": lexical_top_n},
+        ).mappings().all()
+        return [(str(row["chunk_id"]), float(row["lex_score"] or 0.0)) for row in rows]
+
+    def apply_vector_search_params(self, params: dict[str, object]) -> None:
+        """Set pgvector search GUCs (``hnsw.ef_search``, ``ivfflat.probes``, ...) for the current transaction."""
+        if not params:
+            return
+        names = sorted(params)
+        assignments = ", ".join(f"set_config(:name_{i}, :value_{i}, true)" for i in range(len(names)))
+        bind: dict[str, str] = {}
+        for i, name in enumerate(names):
+            bind[f"name_{i}"] = name
+            bind[f"value_{i}"] = str(params[name])
+        self.db.execute(text(f"SELECT {assignments}"), bind)
+
+    def get_corpus_generation(self) -> int:
+        """Ingestion counter for the tenant; 0 until the first ingestion run."""
+        generation = (
+            self.db.query(TenantCorpusGenerations.generation)
+            .filter(TenantCorpusGenerations.tenant_id == self.tenant_id)
+            .scalar()
+        )
+        return int(generation or 0)
+
+    def fetch_embeddings(self, chunk_ids: list[str]) -> dict[str, np.ndarray]:
+        """Load embeddings for ``chunk_ids`` in one query as compact float32 arrays."""
+        if not chunk_ids:
+            return {}
+        rows = (
+            self.db.query(ChunkVectors.chunk_id, ChunkVectors.embedding)
+            .filter(ChunkVectors.tenant_id == self.tenant_id)
+            .filter(ChunkVectors.chunk_id.in_(chunk_ids))
+            .all()
+        )
+        return {str(chunk_id): self._embedding_array(embedding) for chunk_id, embedding in rows}
+
+    def attach_embeddings(self, candidates: list[dict]) -> int:
+        """Fill in ``embedding`` for candidates hydrated without it; returns rows loaded."""
+        missing = sorted({str(c["chunk_id"]) for c in candidates if c.get("embedding") is None})
+        if not missing:
+            return 0
+        embeddings = self.fetch_embeddings(missing)
+        for c in candidates:
+            if c.get("embedding") is None and str(c["chunk_id"]) in embeddings:
+                c["embedding"] = embeddings[str(c["chunk_id"])]
+        return len(embeddings)
+
+    def fetch_neighbors(self, base_chunks: list[dict], cap: int, window: int = 1, include_embeddings: bool = True) -> list[dict]:
         if not base_chunks or cap <= 0 or window < 1:
             return []
-        by_doc: dict[str, set[int]] = {}
         base_chunks_by_doc: dict[str, list[dict]] = {}
         for c in base_chunks:
-            doc_id = str(c["document_id"])
-            ordinal = int(c.get("ordinal", 0))
-            window_ordinals = range(ordinal - window, ordinal + window + 1)
-            by_doc.setdefault(doc_id, set()).update(window_ordinals)
-            base_chunks_by_doc.setdefault(doc_id, []).append(c)
+            base_chunks_by_doc.setdefault(str(c["document_id"]), []).append(c)
+
+        grouped = self.fetch_neighbor_windows(
+            [(str(c["document_id"]), int(c.get("ordinal", 0)), window) for c in base_chunks],
+            include_embeddings=include_embeddings,
+        )
+        rows_by_doc: dict[str, dict[str, dict]] = {doc_id: {} for doc_id in base_chunks_by_doc}
+        for rows in grouped:
+            for row in rows:
+                rows_by_doc[str(row["document_id"])].setdefault(row["chunk_id"], row)
 
         neighbors: list[dict] = []
         seen = {str(c["chunk_id"]) for c in base_chunks}
-        for doc_id, ordinals in by_doc.items():
+        for doc_id, doc_rows in rows_by_doc.items():
             if len(neighbors) >= cap:
                 break
-            rows = (
-                self.db.query(Chunks, Documents, ChunkVectors)
-                .join(Documents, Documents.document_id == Chunks.document_id)
-                .join(ChunkVectors, ChunkVectors.chunk_id == Chunks.chunk_id)
-                .filter(Chunks.tenant_id == self.tenant_id)
-                .filter(Documents.tenant_id == self.tenant_id)
-                .filter(ChunkVectors.tenant_id == self.tenant_id)
-                .filter(Chunks.document_id == doc_id)
-                .filter(Chunks.ordinal.in_(ordinals))
-                .order_by(Chunks.ordinal.asc())
-                .all()
-            )
-            for row in rows:
-                chunk, document, vector = row
-                chunk_id = str(chunk.chunk_id)
+            for candidate in sorted(doc_rows.values(), key=lambda c: (int(c["ordinal"]), c["chunk_id"])):
+                chunk_id = candidate["chunk_id"]
                 if chunk_id in seen:
                     continue
                 seen.add(chunk_id)
 
-                base_matches = base_chunks_by_doc.get(doc_id, [])
-                if not base_matches:
-                    continue
-                base = min(base_matches, key=lambda b: abs(int(b.get("ordinal", 0)) - int(chunk.ordinal)))
+                base = min(base_chunks_by_doc[doc_id], key=lambda b: abs(int(b.get("ordinal", 0)) - int(candidate["ordinal"])))
                 base_score = float(base.get("final_score", 0.0))
-                candidate = self._row_to_candidate(chunk, document, vector, 0.0, max(0.0, float(base.get("vec_score", 0.0)) * 0.95))
+                candidate["vec_score"] = max(0.0, float(base.get("vec_score", 0.0)) * 0.95)
                 candidate["rerank_score"] = float(base.get("rerank_score", 0.0)) * 0.95
                 candidate["final_score"] = max(0.0, base_score * 0.92)
                 candidate["boosts_applied"] = [
@@ -279,6 +463,59 @@ class TenantRepository:
                     break
         return neighbors
 
+    def fetch_neighbor_windows(self, windows: list[tuple[str, int, int]], include_embeddings: bool = True) -> list[list[dict]]:
+        """Chunks within ``ordinal +/- window`` of each ``(document_id, ordinal, window)`` in one query.
+
+        Returns one list per input window, in input order, each sorted by ordinal. Windows never
+        cross document boundaries and all rows are tenant-scoped.
+        """
+        if not windows:
+            return []
+        embedding_column = "cv.embedding" if include_embeddings else "NULL"
+        rows = self.db.execute(
+            text(
+                f"""
+                SELECT w.idx AS window_idx,
+                       c.chunk_id::text AS chunk_id,
+                       c.document_id AS document_id,
+                       c.tenant_id::text AS tenant_id,
+                       c.chunk_text AS chunk_text,
+                       c.chunk_path AS chunk_path,
+                       c.ordinal AS ordinal,
+                       c.llm_token_count AS llm_token_count,
+                       c.llm_tokenizer AS llm_tokenizer,
+                       d.title AS title,
+                       d.url AS url,
+                       d.labels AS labels,
+                       d.author AS author,
+                       d.updated_date AS updated_date,
+                       {embedding_column} AS embedding,
+                       0.0 AS lex_score,
+                       0.0 AS vec_score
+                FROM unnest(CAST(:document_ids AS uuid[]), CAST(:ordinals AS integer[]), CAST(:windows AS integer[]))
+                     WITH ORDINALITY AS w(document_id, ordinal, win, idx)
+                JOIN chunks c ON c.document_id = w.document_id
+                             AND c.ordinal BETWEEN w.ordinal - w.win AND w.ordinal + w.win
+                JOIN documents d ON d.document_id = c.document_id
+                JOIN chunk_vectors cv ON cv.chunk_id = c.chunk_id
+                WHERE c.tenant_id = CAST(:tenant_id AS uuid)
+                  AND d.tenant_id = CAST(:tenant_id AS uuid)
+                  AND cv.tenant_id = CAST(:tenant_id AS uuid)
+                ORDER BY w.idx ASC, c.ordinal ASC, c.chunk_id ASC
+                """
+            ).columns(embedding=Vector()),
+            {
+                "tenant_id": self.tenant_id,
+                "document_ids": [str(document_id) for document_id, _, _ in windows],
+                "ordinals": [int(ordinal) for _, ordinal, _ in windows],
+                "windows": [max(0, int(window)) for _, _, window in windows],
+            },
+        ).mappings().all()
+        grouped: list[list[dict]] = [[] for _ in windows]
+        for row in rows:
+            grouped[int(row["window_idx"]) - 1].append(self._mapping_to_candidate(row))
+        return grouped
+
     def fetch_chunk_by_id(self, chunk_id: str) -> dict | None:
         row = (
             self.db.query(Chunks, Documents, ChunkVectors)
@@ -295,36 +532,6 @@ class TenantRepository:
         chunk, document, vector = row
         return self._row_to_candidate(chunk, document, vector, 0.0, 0.0)
 
-    def fetch_document_neighbors(self, document_id: str, anchor_chunk_id: str, window: int = 1) -> list[dict]:
-        if window < 0:
-            return []
-        anchor = (
-            self.db.query(Chunks)
-            .filter(Chunks.tenant_id == self.tenant_id)
-            .filter(Chunks.document_id == document_id)
-            .filter(Chunks.chunk_id == anchor_chunk_id)
-            .first()
-        )
-        if anchor is None:
-            return []
-
-        min_ord = int(anchor.ordinal) - int(window)
-        max_ord = int(anchor.ordinal) + int(window)
-        rows = (
-            self.db.query(Chunks, Documents, ChunkVectors)
-            .join(Documents, Documents.document_id == Chunks.document_id)
-            .join(ChunkVectors, ChunkVectors.chunk_id == Chunks.chunk_id)
-            .filter(Chunks.tenant_id == self.tenant_id)
-            .filter(Documents.tenant_id == self.tenant_id)
-            .filter(ChunkVectors.tenant_id == self.tenant_id)
-            .filter(Chunks.document_id == document_id)
-            .filter(Chunks.ordinal >= min_ord)
-            .filter(Chunks.ordinal <= max_ord)
-            .order_by(Chunks.ordinal.asc(), Chunks.chunk_id.asc())
-            .all()
-        )
-        return [self._row_to_candidate(chunk, document, vector, 0.0, 0.0) for chunk, document, vector in rows]
-
     def fetch_outgoing_linked_documents(self, document_ids: list[str], max_docs: int) -> list[str]:
         if not document_ids or max_docs <= 0:
             return []
@@ -340,25 +547,29 @@ class TenantRepository:
         )
         return [str(row[0]) for row in rows if row[0] is not None]
 
-    def fetch_top_chunks_for_document(self, document_id: str, query_embedding: list[float], limit_n: int = 2) -> list[dict]:
+    def fetch_top_chunks_for_document(self, document_id: str, query_embedding: list[float], limit_n: int = 2, include_embeddings: bool = True) -> list[dict]:
         if limit_n <= 0:
             return []
         vector_literal = self._to_vector_literal(query_embedding)
+        embedding_column = "cv.embedding" if include_embeddings else "NULL"
         rows = self.db.execute(
             text(
-                """
+                f"""
                 SELECT c.chunk_id,
                        c.document_id,
                        c.chunk_text,
                        c.chunk_path,
                        c.ordinal,
                        c.token_count,
+                       c.llm_token_count,
+                       c.llm_tokenizer,
                        d.title,
                        d.author,
                        d.url,
                        d.labels,
                        d.updated_date,
-                       cv.embedding,
+                       {embedding_column} AS embedding,
+                       (1.0 - (cv.embedding <=> CAST(:qvec AS vector))) AS vec_cosine,
                        (1.0 / (1.0 + (cv.embedding <-> CAST(:qvec AS vector)))) AS vec_score
                 FROM chunks c
                 JOIN documents d ON d.document_id = c.document_id
@@ -370,7 +581,7 @@ class TenantRepository:
                 ORDER BY cv.embedding <-> CAST(:qvec AS vector), c.ordinal ASC, c.chunk_id ASC
                 LIMIT :limit_n
                 """
-            ),
+            ).columns(embedding=Vector()),
             {
                 "tenant_id": self.tenant_id,
                 "document_id": document_id,
@@ -381,26 +592,29 @@ class TenantRepository:
         items: list[dict] = []
         for row in rows:
             labels = self._labels_to_list(row["labels"])
-            items.append(
-                {
-                    "chunk_id": str(row["chunk_id"]),
-                    "document_id": row["document_id"],
-                    "chunk_text": row["chunk_text"],
-                    "title": row["title"],
-                    "url": row["url"] or "",
-                    "heading_path": row["chunk_path"].split("/") if row["chunk_path"] else [],
-                    "labels": labels,
-                    "author": row["author"],
-                    "updated_at": row["updated_date"].isoformat() if row["updated_date"] else "",
-                    "tenant_id": self.tenant_id,
-                    "ordinal": int(row["ordinal"]),
-                    "token_count": int(row["token_count"] or 0),
-                    "embedding": list(row["embedding"]),
-                    "lex_score": 0.0,
-                    "vec_score": float(row["vec_score"] or 0.0),
-                    "final_score": float(row["vec_score"] or 0.0),
-                }
-            )
+            item = {
+                "chunk_id": str(row["chunk_id"]),
+                "document_id": row["document_id"],
+                "chunk_text": row["chunk_text"],
+                "title": row["title"],
+                "url": row["url"] or "",
+                "heading_path": row["chunk_path"].split("/") if row["chunk_path"] else [],
+                "labels": labels,
+                "author": row["author"],
+                "updated_at": row["updated_date"].isoformat() if row["updated_date"] else "",
+                "tenant_id": self.tenant_id,
+                "ordinal": int(row["ordinal"]),
+                "token_count": int(row["token_count"] or 0),
+                "llm_token_count": row.get("llm_token_count"),
+                "llm_tokenizer": row.get("llm_tokenizer"),
+                "lex_score": 0.0,
+                "vec_score": float(row["vec_score"] or 0.0),
+                "vec_cosine": float(row.get("vec_cosine") or 0.0),
+                "final_score": float(row["vec_score"] or 0.0),
+            }
+            if row.get("embedding") is not None:
+                item["embedding"] = self._embedding_array(row["embedding"])
+            items.append(item)
         return items
 
     @staticmethod
@@ -418,9 +632,13 @@ class TenantRepository:
                 return [labels]
         return [str(labels)]
 
+    @staticmethod
+    def _embedding_array(embedding: object) -> np.ndarray:
+        return np.asarray(embedding, dtype=np.float32)
+
     @classmethod
-    def _row_to_candidate(cls, chunk: Chunks, document: Documents, vector: ChunkVectors, lex_score: float, vec_score: float = 0.0) -> dict:
-        return {
+    def _row_to_candidate(cls, chunk: Chunks, document: Documents, vector: ChunkVectors | None, lex_score: float, vec_score: float = 0.0) -> dict:
+        candidate = {
             "chunk_id": str(chunk.chunk_id),
             "document_id": document.document_id,
             "chunk_text": chunk.chunk_text,
@@ -432,10 +650,40 @@ class TenantRepository:
             "updated_at": document.updated_date.isoformat() if document.updated_date else "",
             "tenant_id": str(chunk.tenant_id),
             "ordinal": int(chunk.ordinal),
-            "embedding": list(vector.embedding),
+            "llm_token_count": getattr(chunk, "llm_token_count", None),
+            "llm_tokenizer": getattr(chunk, "llm_tokenizer", None),
             "lex_score": float(lex_score),
             "vec_score": float(vec_score),
         }
+        if vector is not None and vector.embedding is not None:
+            candidate["embedding"] = cls._embedding_array(vector.embedding)
+        return candidate
+
+    @classmethod
+    def _mapping_to_candidate(cls, row) -> dict:
+        updated_date = row["updated_date"]
+        candidate = {
+            "chunk_id": str(row["chunk_id"]),
+            "document_id": row["document_id"],
+            "chunk_text": row["chunk_text"],
+            "title": row["title"],
+            "url": row["url"] or "",
+            "heading_path": row["chunk_path"].split("/") if row["chunk_path"] else [],
+            "labels": cls._labels_to_list(row["labels"]),
+            "author": row["author"],
+            "updated_at": updated_date.isoformat() if updated_date else "",
+            "tenant_id": str(row["tenant_id"]),
+            "ordinal": int(row["ordinal"]),
+            "llm_token_count": row.get("llm_token_count"),
+            "llm_tokenizer": row.get("llm_tokenizer"),
+            "lex_score": float(row["lex_score"] or 0.0),
+            "vec_score": float(row["vec_score"] or 0.0),
+        }
+        if row.get("vec_cosine") is not None:
+            candidate["vec_cosine"] = float(row["vec_cosine"])
+        if row.get("embedding") is not None:
+            candidate["embedding"] = cls._embedding_array(row["embedding"])
+        return candidate
 
 
 class ConversationRepository:
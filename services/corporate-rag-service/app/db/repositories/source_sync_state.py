@@ -18,11 +18,55 @@ class SourceSyncState:
     last_error_message: str | None
 
 
+_STATE_COLUMNS = (
+    "tenant_id",
+    "source_type",
+    "external_ref",
+    "last_seen_modified_at",
+    "last_seen_checksum",
+    "last_synced_at",
+    "last_status",
+    "last_error_code",
+    "last_error_message",
+)
+
+
 class SourceSyncStateRepository:
+    """Reads and writes ``source_sync_state`` rows for connector syncs.
+
+    ``load_states`` reads every row of a (tenant, source type) in one query; afterwards
+    ``get_state`` and ``list_external_refs`` for that pair are answered from memory. Writes
+    (``upsert_state`` and the ``mark_*`` helpers) are staged and sent by ``flush`` as one
+    multi-row upsert, so callers must ``flush`` before committing.
+    """
+
     def __init__(self, db: Any):
         self.db = db
+        self._loaded: dict[tuple[str, str], dict[str, SourceSyncState]] = {}
+        self._pending: dict[tuple[str, str, str], SourceSyncState] = {}
+
+    def load_states(self, tenant_id: str, source_type: str) -> dict[str, SourceSyncState]:
+        result = self.db.execute(
+            """
+            SELECT tenant_id, source_type, external_ref, last_seen_modified_at, last_seen_checksum,
+                   last_synced_at, last_status, last_error_code, last_error_message
+            FROM source_sync_state
+            WHERE tenant_id = :tenant_id AND source_type = :source_type
+            """,
+            {"tenant_id": tenant_id, "source_type": source_type},
+        )
+        rows = result.mappings().all() if hasattr(result, "mappings") else []
+        states = {str(row["external_ref"]): SourceSyncState(**{c: row.get(c) for c in _STATE_COLUMNS}) for row in rows}
+        for (tenant, stype, ref), state in self._pending.items():
+            if (tenant, stype) == (tenant_id, source_type):
+                states[ref] = state
+        self._loaded[(tenant_id, source_type)] = states
+        return states
 
     def get_state(self, tenant_id: str, source_type: str, external_ref: str) -> SourceSyncState | None:
+        loaded = self._loaded.get((tenant_id, source_type))
+        if loaded is not None:
+            return loaded.get(external_ref)
         result = self.db.execute(
             """
             SELECT tenant_id, source_type, external_ref, last_seen_modified_at, last_seen_checksum,
@@ -52,14 +96,39 @@ class SourceSyncStateRepository:
         last_error_code: str | None,
         last_error_message: str | None,
     ) -> None:
+        state = SourceSyncState(
+            tenant_id=tenant_id,
+            source_type=source_type,
+            external_ref=external_ref,
+            last_seen_modified_at=last_seen_modified_at,
+            last_seen_checksum=last_seen_checksum,
+            last_synced_at=last_synced_at,
+            last_status=last_status,
+            last_error_code=last_error_code,
+            last_error_message=(last_error_message or "")[:512] or None,
+        )
+        self._pending[(tenant_id, source_type, external_ref)] = state
+        loaded = self._loaded.get((tenant_id, source_type))
+        if loaded is not None:
+            loaded[external_ref] = state
+
+    def flush(self) -> int:
+        """Write all staged states with one ``INSERT ... SELECT FROM unnest(...)`` upsert."""
+        if not self._pending:
+            return 0
+        states = list(self._pending.values())
+        self._pending = {}
         self.db.execute(
             """
             INSERT INTO source_sync_state (
                 tenant_id, source_type, external_ref, last_seen_modified_at, last_seen_checksum,
                 last_synced_at, last_status, last_error_code, last_error_message
-            ) VALUES (
-                :tenant_id, :source_type, :external_ref, :last_seen_modified_at, :last_seen_checksum,
-                :last_synced_at, :last_status, :last_error_code, :last_error_message
+            )
+            SELECT * FROM unnest(
+                CAST(:tenant_id AS text[]), CAST(:source_type AS text[]), CAST(:external_ref AS text[]),
+                CAST(:last_seen_modified_at AS timestamptz[]), CAST(:last_seen_checksum AS text[]),
+                CAST(:last_synced_at AS timestamptz[]), CAST(:last_status AS text[]),
+                CAST(:last_error_code AS text[]), CAST(:last_error_message AS text[])
             )
             ON CONFLICT (tenant_id, source_type, external_ref)
             DO UPDATE SET
@@ -70,21 +139,14 @@ class SourceSyncStateRepository:
                 last_error_code = EXCLUDED.last_error_code,
                 last_error_message = EXCLUDED.last_error_message
             """,
-            {
-                "tenant_id": tenant_id,
-                "source_type": source_type,
-                "external_ref": external_ref,
-                "last_seen_modified_at": last_seen_modified_at,
-                "last_seen_checksum": last_seen_checksum,
-                "last_synced_at": last_synced_at,
-                "last_status": last_status,
-                "last_error_code": last_error_code,
-                "last_error_message": (last_error_message or "")[:512] or None,
-            },
+            {column: [getattr(state, column) for state in states] for column in _STATE_COLUMNS},
         )
-
+        return len(states)
 
     def list_external_refs(self, tenant_id: str, source_type: str) -> list[str]:
+        loaded = self._loaded.get((tenant_id, source_type))
+        if loaded is not None:
+            return list(loaded)
         result = self.db.execute(
             """
             SELECT external_ref
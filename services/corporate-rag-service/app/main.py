@@ -6,8 +6,10 @@ from fastapi.exception_handlers import http_exception_handler
 from fastapi.responses import JSONResponse
 
 from app.api.routes import router
+from app.clients.http_pool import close_http_clients
 from app.core.config import settings
 from app.core.logging import clear_request_context, configure_logging, log_event, set_request_context
+from app.services.audit import close_audit_writer
 from app.services.startup_guards import StartupValidationError, validate_model_context_windows
 
 configure_logging()
@@ -74,3 +76,13 @@ def _startup_validation() -> None:
     except StartupValidationError as exc:
         log_event("startup.failed", level=40, payload={"error_code": exc.error_code}, plane="control")
         raise RuntimeError(f"{exc.error_code}: {exc}") from exc
+
+
+@app.on_event("shutdown")
+def _shutdown_http_clients() -> None:
+    close_http_clients()
+
+
+@app.on_event("shutdown")
+def _flush_audit_writer() -> None:
+    close_audit_writer()
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 
 from pgvector.sqlalchemy import Vector
-from sqlalchemy import JSON, DateTime, Enum, Float, ForeignKey, Index, Integer, PrimaryKeyConstraint, String, Text, UniqueConstraint, func
+from sqlalchemy import JSON, BigInteger, DateTime, Enum, Float, ForeignKey, Index, Integer, PrimaryKeyConstraint, String, Text, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -51,6 +51,13 @@ class TenantSettings(Base):
     only_sources_mode: Mapped[str] = mapped_column(Enum(*ONLY_SOURCES_MODE, name="only_sources_mode"), default="STRICT")
 
 
+class TenantCorpusGenerations(Base):
+    __tablename__ = "tenant_corpus_generations"
+    tenant_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    generation: Mapped[int] = mapped_column(BigInteger, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
 class Documents(Base):
     __tablename__ = "documents"
     __table_args__ = (UniqueConstraint("tenant_id", "source_version_id", name="uq_documents_tenant_source_version"),)
@@ -79,6 +86,8 @@ class Chunks(Base):
     char_end: Mapped[int | None] = mapped_column(Integer, nullable=True)
     block_start_idx: Mapped[int | None] = mapped_column(Integer, nullable=True)
     block_end_idx: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    llm_token_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    llm_tokenizer: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
 
 class ChunkVectors(Base):
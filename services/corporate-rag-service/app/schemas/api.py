@@ -81,6 +81,7 @@ class TraceScoreEntry(BaseModel):
 class QueryTrace(BaseModel):
     trace_id: UUID
     scoring_trace: list[TraceScoreEntry]
+    vector_search: dict[str, Any] | None = None
 
 
 class QueryResponse(BaseModel):
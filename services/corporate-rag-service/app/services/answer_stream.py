@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+_ANSWER_KEY = '"answer"'
+
+
+class AnswerFieldExtractor:
+    """Incrementally extracts the ``answer`` string from streamed LLM JSON output.
+
+    The model is prompted to return ``{"status": ..., "answer": "...", "citations": [...]}``.
+    ``feed`` receives raw completion deltas and returns only the newly decoded characters of
+    the ``answer`` value, so clients see answer text as it is generated instead of JSON.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._state = "seek"
+        self._escape = ""
+        self._high_surrogate = ""
+
+    @property
+    def done(self) -> bool:
+        return self._state == "done"
+
+    def feed(self, delta: str) -> str:
+        if self._state == "done":
+            return ""
+        self._buffer += delta
+        if self._state == "seek":
+            idx = self._buffer.find(_ANSWER_KEY)
+            if idx < 0:
+                self._buffer = self._buffer[-len(_ANSWER_KEY) :]
+                return ""
+            self._buffer = self._buffer[idx + len(_ANSWER_KEY) :]
+            self._state = "colon"
+        if self._state == "colon":
+            stripped = self._buffer.lstrip(" \t\r\n:")
+            if not stripped:
+                return ""
+            if stripped[0] != '"':
+                self._state = "done"
+                return ""
+            self._buffer = stripped[1:]
+            self._state = "string"
+        return self._consume_string()
+
+    def _emit(self, out: list[str], text: str) -> None:
+        # Astral characters arrive as two \uXXXX escapes; pair them here, since a lone
+        # surrogate cannot be UTF-8 encoded by the streaming response.
+        if self._high_surrogate:
+            if len(text) == 1 and "\udc00" <= text <= "\udfff":
+                high = ord(self._high_surrogate)
+                text = chr(0x10000 + ((high - 0xD800) << 10) + (ord(text) - 0xDC00))
+            else:
+                out.append("\ufffd")
+            self._high_surrogate = ""
+        if len(text) == 1 and "\ud800" <= text <= "\udbff":
+            self._high_surrogate = text
+        elif len(text) == 1 and "\udc00" <= text <= "\udfff":
+            out.append("\ufffd")
+        else:
+            out.append(text)
+
+    def _consume_string(self) -> str:
+        out: list[str] = []
+        for ch in self._buffer:
+            if self._state == "done":
+                break
+            if self._escape:
+                self._escape += ch
+                if self._escape[1] == "u" and len(self._escape) < 6:
+                    continue
+                try:
+                    self._emit(out, json.loads(f'"{self._escape}"'))
+                except json.JSONDecodeError:
+                    self._emit(out, self._escape)
+                self._escape = ""
+            elif ch == "\\":
+                self._escape = ch
+            elif ch == '"':
+                if self._high_surrogate:
+                    self._emit(out, "")
+                self._state = "done"
+            else:
+                self._emit(out, ch)
+        self._buffer = ""
+        return "".join(out)
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
@@ -2,12 +2,16 @@ import json
 import logging
 import re
 from functools import lru_cache
-from typing import Any
+from typing import Any, Callable
 
-from app.services.retrieval import lexical_score, vector_score
+import numpy as np
+
+from app.services.retrieval import cosine_matrix, vector_score
 
 LOGGER = logging.getLogger(__name__)
 
+SENTENCE_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
 
 def split_sentences(text: str) -> list[str]:
     return [s.strip() for s in re.split(r"(?<=[.!?])\s+", text) if s.strip()]
@@ -20,32 +24,60 @@ def _load_sentence_transformer(model_name: str):
     return SentenceTransformer(model_name)
 
 
-def _semantic_similarity(sentence: str, chunk: str) -> float:
-    try:
-        model = _load_sentence_transformer("sentence-transformers/all-MiniLM-L6-v2")
-        from sentence_transformers import util
+def _lexical_similarity(sentence: str, chunk: str) -> float:
+    s_tokens = sentence.lower().split()
+    c_tokens = chunk.lower().split()
+    return vector_score([1.0 if t in c_tokens else 0.0 for t in s_tokens], [1.0 for _ in s_tokens])
 
-        emb_sentence = model.encode(sentence, convert_to_tensor=True)
-        emb_chunk = model.encode(chunk, convert_to_tensor=True)
-        return float(util.cos_sim(emb_sentence, emb_chunk).item())
+
+def _semantic_similarity_matrix(
+    sentences: list[str],
+    chunks: list[str],
+    chunk_embeddings: list[Any] | None = None,
+    embed_texts: Callable[[list[str]], np.ndarray | list[list[float]]] | None = None,
+) -> np.ndarray:
+    """Sentence x chunk similarity from one batched encode.
+
+    With ``chunk_embeddings`` (stored ``chunk_vectors`` rows, aligned with ``chunks``) and
+    ``embed_texts`` (the model that produced them) only the sentences are encoded. Otherwise
+    sentences and chunks are encoded together by the local MiniLM model, each text once.
+    """
+    try:
+        if embed_texts is not None and chunk_embeddings is not None and all(e is not None for e in chunk_embeddings):
+            return cosine_matrix(np.asarray(embed_texts(sentences)), np.asarray(chunk_embeddings))
+        model = _load_sentence_transformer(SENTENCE_MODEL_ID)
+        vectors = model.encode([*sentences, *chunks], convert_to_numpy=True)
+        return cosine_matrix(vectors[: len(sentences)], vectors[len(sentences) :])
     except Exception:  # noqa: BLE001
         # Fallback when model/runtime deps are unavailable.
-        s_tokens = sentence.lower().split()
-        c_tokens = chunk.lower().split()
-        return vector_score([1.0 if t in c_tokens else 0.0 for t in s_tokens], [1.0 for _ in s_tokens])
+        return np.asarray([[_lexical_similarity(s, c) for c in chunks] for s in sentences], dtype=np.float32)
 
 
-def verify_answer(answer: str, chunks: list[str], min_similarity: float, min_lexical_overlap: float) -> tuple[bool, dict[str, Any]]:
+def verify_answer(
+    answer: str,
+    chunks: list[str],
+    min_similarity: float,
+    min_lexical_overlap: float,
+    chunk_embeddings: list[Any] | None = None,
+    embed_texts: Callable[[list[str]], np.ndarray | list[list[float]]] | None = None,
+) -> tuple[bool, dict[str, Any]]:
     sentences = split_sentences(answer)
     unsupported_sentences: list[str] = []
     chunk_tokens = [set(chunk.lower().split()) for chunk in chunks]
 
+    pending: list[str] = []
     for sentence in sentences:
         s_tokens = set(sentence.lower().split())
-        lex_ok = any((len(s_tokens & c_tokens) / max(1, len(s_tokens))) >= min_lexical_overlap for c_tokens in chunk_tokens)
-        sem_ok = any(_semantic_similarity(sentence, chunk) >= min_similarity for chunk in chunks)
-        if not (lex_ok or sem_ok):
-            unsupported_sentences.append(sentence)
+        if not any((len(s_tokens & c_tokens) / max(1, len(s_tokens))) >= min_lexical_overlap for c_tokens in chunk_tokens):
+            pending.append(sentence)
+
+    # Only sentences without lexical support need the semantic check.
+    if pending and chunks:
+        similarity = _semantic_similarity_matrix(pending, chunks, chunk_embeddings, embed_texts)
+        supported = (similarity >= min_similarity).any(axis=1)
+        unsupported_sentences = [s for s, ok in zip(pending, supported) if not ok]
+    else:
+        unsupported_sentences = pending
 
     refusal = len(unsupported_sentences) > 0
     payload = {
@@ -1,8 +1,198 @@
-import uuid
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable
+
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.logging import log_event as log_structured_event
 from app.db.repositories import TenantRepository
+from app.models.models import EventLogs
+from app.services.telemetry import emit_metric, increment_counter
+
+
+class AuditEventWriter:
+    """Buffers ``event_logs`` rows in memory and writes them from one background thread.
+
+    Request threads only enqueue; the writer drains up to ``batch_size`` rows (or whatever
+    arrived within ``flush_interval_seconds``) and stores them with one multi-row INSERT and a
+    single commit on its own session; a failed batch is bisected so only the offending rows are
+    counted as ``failed``. The buffer holds at most ``max_buffer`` rows: with the
+    ``block`` overflow policy producers wait up to ``block_timeout_seconds`` for space before
+    the event is dropped, with ``drop`` a full buffer drops the event immediately. ``close``
+    flushes everything still buffered.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_buffer: int = 10000,
+        batch_size: int = 200,
+        flush_interval_seconds: float = 0.2,
+        overflow_policy: str = "block",
+        block_timeout_seconds: float = 0.05,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+        self.overflow_policy = overflow_policy
+        self.block_timeout_seconds = max(0.0, float(block_timeout_seconds))
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(maxsize=max(1, int(max_buffer)))
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, tenant_id: str, correlation_id: str, event_type: str, payload: dict, duration_ms: int | None = None) -> bool:
+        """Enqueue one event; returns ``False`` when it was dropped by the overflow policy."""
+        row = {
+            "tenant_id": tenant_id,
+            "correlation_id": correlation_id,
+            "event_type": event_type,
+            "payload_json": dict(payload),
+            "duration_ms": duration_ms,
+        }
+        if self._stop.is_set():
+            self._write([row])
+            return True
+        self._ensure_started()
+        try:
+            if self.overflow_policy == "block":
+                self._queue.put(row, timeout=self.block_timeout_seconds)
+            else:
+                self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            increment_counter("audit_events_dropped")
+            return False
+        with self._lock:
+            self.enqueued += 1
+        return True
+
+    def _drain(self, first: dict[str, Any]) -> list[dict[str, Any]]:
+        batch = [first]
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 and not self._stop.is_set() else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self._write(self._drain(first))
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        t0 = time.perf_counter()
+        error: Exception | None = None
+        db = self.session_factory()
+        try:
+            db.execute(insert(EventLogs), rows)
+            db.commit()
+        except Exception as exc:  # noqa: BLE001
+            db.rollback()
+            error = exc
+        finally:
+            db.close()
+        if error is not None:
+            if len(rows) > 1:
+                # One bad row fails the whole statement; bisect so only that row is lost.
+                mid = len(rows) // 2
+                self._write(rows[:mid])
+                self._write(rows[mid:])
+                return
+            with self._lock:
+                self.failed += 1
+            increment_counter("audit_events_failed")
+            log_structured_event("audit_writer.flush_failed", level=40, payload={"event_type": rows[0].get("event_type"), "error": str(error)}, plane="control")
+            return
+        with self._lock:
+            self.written += len(rows)
+            self.flushes += 1
+        emit_metric("audit_flush_batch_size", float(len(rows)))
+        emit_metric("audit_flush_latency_ms", (time.perf_counter() - t0) * 1000.0)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "buffered": self._queue.qsize(),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "flushes": self.flushes,
+            }
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        leftover: list[dict[str, Any]] = []
+        while True:
+            try:
+                leftover.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        for offset in range(0, len(leftover), self.batch_size):
+            self._write(leftover[offset : offset + self.batch_size])
+        log_structured_event("audit_writer.closed", payload=self.stats(), plane="control")
+
+
+_WRITER: AuditEventWriter | None = None
+_WRITER_LOCK = threading.Lock()
+
+
+def get_audit_writer() -> AuditEventWriter:
+    global _WRITER
+    with _WRITER_LOCK:
+        if _WRITER is None:
+            from app.db.session import SessionLocal
+
+            _WRITER = AuditEventWriter(
+                SessionLocal,
+                max_buffer=settings.AUDIT_WRITER_MAX_BUFFER,
+                batch_size=settings.AUDIT_WRITER_BATCH_SIZE,
+                flush_interval_seconds=settings.AUDIT_WRITER_FLUSH_INTERVAL_MS / 1000.0,
+                overflow_policy=settings.AUDIT_WRITER_OVERFLOW_POLICY,
+                block_timeout_seconds=settings.AUDIT_WRITER_BLOCK_TIMEOUT_MS / 1000.0,
+            )
+        return _WRITER
+
+
+def close_audit_writer() -> None:
+    global _WRITER
+    with _WRITER_LOCK:
+        writer, _WRITER = _WRITER, None
+    if writer is not None:
+        writer.close()
 
 
 def log_event(db: Session, tenant_id: str, correlation_id: str, event_type: str, payload: dict, duration_ms: int | None = None) -> None:
+    if settings.AUDIT_ASYNC_WRITER_ENABLED:
+        get_audit_writer().submit(tenant_id, correlation_id, event_type, payload, duration_ms)
+        return
     TenantRepository(db, tenant_id).log_event(correlation_id, event_type, payload, duration_ms)
@@ -39,6 +39,7 @@ class ConnectorError:
     error_code: str
     message: str
     retryable: bool = False
+    status_code: int | None = None
 
 
 @dataclass(frozen=True)
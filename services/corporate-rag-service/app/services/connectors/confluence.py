@@ -12,6 +12,7 @@ from xml.etree import ElementTree as ET
 
 import httpx
 
+from app.clients.http_pool import get_http_client
 from app.services.connectors.base import ConnectorError, ConnectorFetchResult, ConnectorListResult, SourceConnector, SourceDescriptor, SourceItem, SyncContext
 from app.services.file_ingestion import FileByteIngestor
 
@@ -341,6 +342,11 @@ def storage_html_to_markdown(storage_xhtml: str) -> str:
     return _render_blocks(root)
 
 
+def _http_status(exc: httpx.HTTPError) -> int | None:
+    response = getattr(exc, "response", None) if isinstance(exc, httpx.HTTPStatusError) else None
+    return response.status_code if response is not None else None
+
+
 @dataclass
 class ConfluenceClient:
     base_url: str
@@ -358,46 +364,49 @@ class ConfluenceClient:
             return {"Authorization": f"Basic {encoded}"}
         return {}
 
+    def _http_client(self, url: str) -> httpx.Client:
+        return get_http_client(url, timeout=self.timeout_seconds, headers=self._auth_headers())
+
     def list_pages(self, *, cql: str, start: int, limit: int) -> list[dict[str, Any]]:
         url = f"{self.base_url.rstrip('/')}/rest/api/content/search"
-        with httpx.Client(timeout=self.timeout_seconds, headers=self._auth_headers()) as client:
-            response = client.get(url, params={"cql": cql, "start": start, "limit": limit})
-            response.raise_for_status()
-            payload = response.json()
+        client = self._http_client(url)
+        response = client.get(url, params={"cql": cql, "start": start, "limit": limit})
+        response.raise_for_status()
+        payload = response.json()
         return payload.get("results", [])
 
     def fetch_page_body_by_id(self, page_id: str, *, representation: str) -> dict[str, Any]:
         url = f"{self.base_url.rstrip('/')}/rest/api/content/{page_id}"
         expand = f"body.{representation},version,history"
-        with httpx.Client(timeout=self.timeout_seconds, headers=self._auth_headers()) as client:
-            response = client.get(url, params={"expand": expand})
-            response.raise_for_status()
-            return response.json()
+        client = self._http_client(url)
+        response = client.get(url, params={"expand": expand})
+        response.raise_for_status()
+        return response.json()
 
     def list_attachments(self, *, cql: str, start: int, limit: int) -> list[dict[str, Any]]:
         url = f"{self.base_url.rstrip('/')}/rest/api/content/search"
-        with httpx.Client(timeout=self.timeout_seconds, headers=self._auth_headers()) as client:
-            response = client.get(url, params={"cql": cql, "start": start, "limit": limit})
-            response.raise_for_status()
-            payload = response.json()
+        client = self._http_client(url)
+        response = client.get(url, params={"cql": cql, "start": start, "limit": limit})
+        response.raise_for_status()
+        payload = response.json()
         return payload.get("results", [])
 
     def fetch_attachment_by_id(self, attachment_id: str) -> dict[str, Any]:
         url = f"{self.base_url.rstrip('/')}/rest/api/content/{attachment_id}"
-        with httpx.Client(timeout=self.timeout_seconds, headers=self._auth_headers()) as client:
-            response = client.get(url, params={"expand": "version,container,_links,metadata"})
-            response.raise_for_status()
-            return response.json()
+        client = self._http_client(url)
+        response = client.get(url, params={"expand": "version,container,_links,metadata"})
+        response.raise_for_status()
+        return response.json()
 
     def download_attachment(self, download_url: str) -> bytes:
         if download_url.startswith("http://") or download_url.startswith("https://"):
             url = download_url
         else:
             url = f"{self.base_url.rstrip('/')}/{download_url.lstrip('/')}"
-        with httpx.Client(timeout=self.timeout_seconds, headers=self._auth_headers()) as client:
-            response = client.get(url)
-            response.raise_for_status()
-            return response.content
+        client = self._http_client(url)
+        response = client.get(url)
+        response.raise_for_status()
+        return response.content
 
 
 class ConfluencePagesConnector(SourceConnector):
@@ -474,7 +483,7 @@ class ConfluencePagesConnector(SourceConnector):
         try:
             payload = self.client.fetch_page_body_by_id(page_id, representation=cfg.CONFLUENCE_FETCH_BODY_REPRESENTATION)
         except httpx.HTTPError as exc:
-            return ConnectorFetchResult(error=ConnectorError("C-FETCH-FAILED", str(exc), retryable=True))
+            return ConnectorFetchResult(error=ConnectorError("C-FETCH-FAILED", str(exc), retryable=True, status_code=_http_status(exc)))
 
         body = payload.get("body") or {}
         rep = body.get(cfg.CONFLUENCE_FETCH_BODY_REPRESENTATION) or {}
@@ -585,7 +594,7 @@ class ConfluenceAttachmentConnector(SourceConnector):
                 return ConnectorFetchResult(error=ConnectorError("C-ATTACHMENT-MISSING-DOWNLOAD", f"No download URL for attachment:{attachment_id}"))
             raw_bytes = self.client.download_attachment(download)
         except httpx.HTTPError as exc:
-            return ConnectorFetchResult(error=ConnectorError("C-ATTACHMENT-FETCH-FAILED", str(exc), retryable=True))
+            return ConnectorFetchResult(error=ConnectorError("C-ATTACHMENT-FETCH-FAILED", str(exc), retryable=True, status_code=_http_status(exc)))
 
         filename = str(payload.get("title") or descriptor.title or f"{attachment_id}.bin")
         suffix = Path(filename).suffix.lower()
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from app.services.connectors.base import ConnectorFetchResult, SourceConnector, SourceDescriptor, SourceItem
+
+LOGGER = logging.getLogger(__name__)
+
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+def _status_code(outcome: ConnectorFetchResult | BaseException) -> int | None:
+    if isinstance(outcome, ConnectorFetchResult):
+        return outcome.error.status_code if outcome.error is not None else None
+    response = getattr(outcome, "response", None)
+    if isinstance(response, dict):
+        return (response.get("ResponseMetadata") or {}).get("HTTPStatusCode")
+    return getattr(response, "status_code", None)
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves on throttling and grows back by one per ``recovery_successes``."""
+
+    def __init__(self, max_limit: int, recovery_successes: int = 20):
+        self.max_limit = max(1, int(max_limit))
+        self.limit = self.max_limit
+        self.recovery_successes = max(1, int(recovery_successes))
+        self._active = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+
+    def release(self, throttled: bool) -> None:
+        with self._cond:
+            self._active -= 1
+            if throttled:
+                self.limit = max(1, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self.limit < self.max_limit and self._successes >= self.recovery_successes:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+
+def _convert_bytes(filename: str, payload: bytes) -> SourceItem:
+    from app.services.file_ingestion import FileByteIngestor
+
+    return FileByteIngestor().ingest_bytes(filename=filename, payload=payload)
+
+
+class ProcessPoolFileIngestor:
+    """``FileByteIngestor`` stand-in that runs PDF/DOCX conversion in a process pool."""
+
+    def __init__(self, pool: ProcessPoolExecutor):
+        self.pool = pool
+
+    def ingest_bytes(self, *, filename: str, payload: bytes) -> SourceItem:
+        return self.pool.submit(_convert_bytes, filename, payload).result()
+
+
+class ConnectorFetchExecutor:
+    """Bounded-concurrency ``fetch_item`` calls for one connector, yielded in descriptor order.
+
+    At most ``2 * concurrency`` descriptors are submitted ahead of the consumer; an
+    ``AdaptiveLimiter`` caps how many fetches run at once and halves that cap whenever a fetch
+    is throttled (HTTP 429/503). Throttled fetches are retried up to ``throttle_retries`` times
+    with capped exponential backoff before the last result (or exception) is returned.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 4,
+        throttle_retries: int = 3,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+        sleep_fn: Callable[[float], None] = time.sleep,
+    ):
+        self.concurrency = max(1, int(concurrency))
+        self.throttle_retries = max(0, int(throttle_retries))
+        self.backoff_seconds = max(0.0, float(backoff_seconds))
+        self.max_backoff_seconds = max(0.0, float(max_backoff_seconds))
+        self.sleep_fn = sleep_fn
+        self.limiter = AdaptiveLimiter(self.concurrency)
+        self.throttled = 0
+
+    def _fetch(self, connector: SourceConnector, tenant_id: str, descriptor: SourceDescriptor) -> ConnectorFetchResult:
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            outcome: ConnectorFetchResult | BaseException
+            try:
+                outcome = connector.fetch_item(tenant_id, descriptor)
+            except Exception as exc:  # noqa: BLE001
+                outcome = exc
+            throttled = _status_code(outcome) in THROTTLE_STATUS_CODES
+            self.limiter.release(throttled)
+            if not throttled or attempt >= self.throttle_retries:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+                return outcome
+            self.throttled += 1
+            delay = min(self.backoff_seconds * (2**attempt), self.max_backoff_seconds)
+            LOGGER.warning(
+                "connector_fetch_throttled",
+                extra={
+                    "event": "connector_fetch_throttled",
+                    "source_type": descriptor.source_type,
+                    "external_ref": descriptor.external_ref,
+                    "status_code": _status_code(outcome),
+                    "concurrency_limit": self.limiter.limit,
+                    "retry_in_seconds": delay,
+                },
+            )
+            self.sleep_fn(delay)
+            attempt += 1
+
+    def fetch_all(
+        self,
+        connector: SourceConnector,
+        tenant_id: str,
+        descriptors: list[SourceDescriptor],
+    ) -> Iterator[tuple[SourceDescriptor, ConnectorFetchResult]]:
+        if self.concurrency == 1:
+            for descriptor in descriptors:
+                yield descriptor, self._fetch(connector, tenant_id, descriptor)
+            return
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix=f"fetch-{connector.source_type.lower()}") as executor:
+            in_flight: deque[tuple[SourceDescriptor, Future]] = deque()
+            pending = iter(descriptors)
+            try:
+                while True:
+                    while len(in_flight) < 2 * self.concurrency:
+                        descriptor = next(pending, None)
+                        if descriptor is None:
+                            break
+                        in_flight.append((descriptor, executor.submit(self._fetch, connector, tenant_id, descriptor)))
+                    if not in_flight:
+                        return
+                    descriptor, future = in_flight.popleft()
+                    yield descriptor, future.result()
+            finally:
+                for _descriptor, future in in_flight:
+                    future.cancel()
+
+
+@contextmanager
+def offloaded_conversion(connector: Any, pool: ProcessPoolExecutor | None) -> Iterator[None]:
+    """Temporarily route a connector's ``FileByteIngestor`` through ``pool`` (no-op without one)."""
+    attr = next((name for name in ("file_ingestor", "_ingestor") if hasattr(connector, name)), None)
+    if pool is None or attr is None:
+        yield
+        return
+    original = getattr(connector, attr)
+    setattr(connector, attr, ProcessPoolFileIngestor(pool))
+    try:
+        yield
+    finally:
+        setattr(connector, attr, original)
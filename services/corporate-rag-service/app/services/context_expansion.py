@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import hashlib
 from dataclasses import dataclass
-from typing import Any
+
+import numpy as np
 
 from app.core.config import settings
 from app.db.repositories import TenantRepository
-from app.services.query_pipeline import estimate_tokens
+from app.services.query_pipeline import chunk_tokens
+from app.services.retrieval import cosine_matrix
 
 
 @dataclass(frozen=True)
@@ -28,15 +29,14 @@ class ContextExpansionEngine:
         self.repo = repo
 
     @staticmethod
-    def _cosine(v1: list[float], v2: list[float]) -> float:
-        if not v1 or not v2:
-            return 0.0
-        dot = sum(a * b for a, b in zip(v1, v2))
-        n1 = sum(a * a for a in v1) ** 0.5
-        n2 = sum(b * b for b in v2) ** 0.5
-        if n1 == 0.0 or n2 == 0.0:
-            return 0.0
-        return dot / (n1 * n2)
+    def _similarity_matrix(candidates: list[dict]) -> np.ndarray:
+        """Pairwise cosine of candidate embeddings; missing embeddings score 0 against everything."""
+        vectors = [np.asarray(c.get("embedding") if c.get("embedding") is not None else [], dtype=np.float32).ravel() for c in candidates]
+        dim = max((v.size for v in vectors), default=0)
+        matrix = np.zeros((len(vectors), dim), dtype=np.float32)
+        for i, v in enumerate(vectors):
+            matrix[i, : v.size] = v
+        return cosine_matrix(matrix, matrix)
 
     def expand(
         self,
@@ -50,6 +50,7 @@ class ContextExpansionEngine:
         _ = final_query
         topk_base = min(settings.CONTEXT_EXPANSION_TOPK_HARD_CAP, max(1, settings.CONTEXT_EXPANSION_TOPK_BASE))
         base = list(base_candidates[:topk_base])
+        self._ensure_embeddings(base)
         doc_ids = {str(c.get("document_id")) for c in base if c.get("document_id") is not None}
         steps = [f"base:{len(base)}", f"doc_diversity:{len(doc_ids)}", f"mode:{mode}"]
 
@@ -61,12 +62,11 @@ class ContextExpansionEngine:
             expanded_neighbor = list(base)
             extra_added = 0
             expanded_per_doc: dict[str, int] = {}
-            for anchor in base:
-                neighbors = self.repo.fetch_document_neighbors(
-                    str(anchor.get("document_id")),
-                    str(anchor.get("chunk_id")),
-                    window=max(0, settings.EXPAND_NEIGHBORS_WINDOW),
-                )
+            neighbor_window = max(0, settings.EXPAND_NEIGHBORS_WINDOW)
+            windows = self.repo.fetch_neighbor_windows(
+                [(str(anchor.get("document_id")), int(anchor.get("ordinal", 0)), neighbor_window) for anchor in base]
+            )
+            for anchor, neighbors in zip(base, windows):
                 for n in neighbors:
                     if extra_added >= settings.EXPAND_MAX_EXTRA_TOTAL:
                         break
@@ -111,27 +111,27 @@ class ContextExpansionEngine:
         )
         chosen_docs = docs_ranked[: max(1, settings.CONTEXT_EXPANSION_MAX_DOCS)]
         chosen_doc_ids = [str(doc_id) for doc_id, _ in chosen_docs]
-        for doc_id, items in chosen_docs:
-            anchors = sorted(items, key=lambda c: (-float(c.get("final_score", 0.0)), int(c.get("ordinal", 0)), str(c.get("chunk_id"))))[:1]
-            for anchor in anchors:
-                neighbors = self.repo.fetch_document_neighbors(
-                    str(doc_id),
-                    str(anchor["chunk_id"]),
-                    window=max(0, settings.EXPAND_NEIGHBORS_WINDOW),
-                )
-                for n in neighbors:
-                    if extra_added >= settings.EXPAND_MAX_EXTRA_TOTAL:
-                        break
-                    if expanded_per_doc.get(str(doc_id), 0) >= settings.EXPAND_MAX_EXTRA_PER_DOC:
-                        continue
-                    if self._contains_chunk(expanded, str(n["chunk_id"])):
-                        continue
-                    n["final_score"] = float(anchor.get("final_score", 0.0)) * 0.92
-                    n["added_by_neighbor"] = True
-                    expanded.append(n)
-                    extra_added += 1
-                    neighbors_added += 1
-                    expanded_per_doc[str(doc_id)] = expanded_per_doc.get(str(doc_id), 0) + 1
+        neighbor_window = max(0, settings.EXPAND_NEIGHBORS_WINDOW)
+        doc_anchors = [
+            (doc_id, anchor)
+            for doc_id, items in chosen_docs
+            for anchor in sorted(items, key=lambda c: (-float(c.get("final_score", 0.0)), int(c.get("ordinal", 0)), str(c.get("chunk_id"))))[:1]
+        ]
+        windows = self.repo.fetch_neighbor_windows([(str(doc_id), int(anchor.get("ordinal", 0)), neighbor_window) for doc_id, anchor in doc_anchors])
+        for (doc_id, anchor), neighbors in zip(doc_anchors, windows):
+            for n in neighbors:
+                if extra_added >= settings.EXPAND_MAX_EXTRA_TOTAL:
+                    break
+                if expanded_per_doc.get(str(doc_id), 0) >= settings.EXPAND_MAX_EXTRA_PER_DOC:
+                    continue
+                if self._contains_chunk(expanded, str(n["chunk_id"])):
+                    continue
+                n["final_score"] = float(anchor.get("final_score", 0.0)) * 0.92
+                n["added_by_neighbor"] = True
+                expanded.append(n)
+                extra_added += 1
+                neighbors_added += 1
+                expanded_per_doc[str(doc_id)] = expanded_per_doc.get(str(doc_id), 0) + 1
 
         if mode == "doc_neighbor_plus_links" and extra_added < settings.EXPAND_MAX_EXTRA_TOTAL:
             should_expand_links = self._should_expand_links(base, chosen_docs)
@@ -172,6 +172,11 @@ class ContextExpansionEngine:
         )
         return selected, info
 
+    def _ensure_embeddings(self, candidates: list[dict]) -> None:
+        # Retrieval hydrates candidates without embeddings by default; redundancy checks need them.
+        if any(c.get("embedding") is None for c in candidates):
+            self.repo.attach_embeddings(candidates)
+
     @staticmethod
     def _group_docs(candidates: list[dict]) -> dict[str, list[dict]]:
         grouped: dict[str, list[dict]] = {}
@@ -196,34 +201,30 @@ class ContextExpansionEngine:
             out.append(c)
         return out
 
-    def _normalized_text_hash(self, text: str) -> str:
-        normalized = " ".join(str(text).split()).strip().lower()
-        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    @staticmethod
+    def _normalized_text(text: str) -> str:
+        return " ".join(str(text).split()).lower()
 
     def _redundancy_filter(self, candidates: list[dict]) -> tuple[list[dict], int]:
-        kept: list[dict] = []
-        filtered = 0
-        seen_hashes: set[str] = set()
+        if not candidates:
+            return [], 0
         threshold = float(settings.CONTEXT_EXPANSION_REDUNDANCY_SIM_THRESHOLD)
-        for c in candidates:
-            text_hash = self._normalized_text_hash(str(c.get("chunk_text", "")))
-            if text_hash in seen_hashes:
-                filtered += 1
-                continue
-            embedding = list(c.get("embedding", []))
-            path = "/".join(c.get("heading_path", []))
-            redundant = False
-            for k in kept:
-                k_emb = list(k.get("embedding", []))
-                if self._cosine(embedding, k_emb) >= threshold and "/".join(k.get("heading_path", [])) == path:
-                    redundant = True
-                    break
-            if redundant:
-                filtered += 1
+        similarity = self._similarity_matrix(candidates)
+        path_ids: dict[str, int] = {}
+        paths = np.asarray([path_ids.setdefault("/".join(c.get("heading_path", [])), len(path_ids)) for c in candidates])
+        kept_idx: list[int] = []
+        seen_texts: set[str] = set()
+        for i, c in enumerate(candidates):
+            text = self._normalized_text(str(c.get("chunk_text", "")))
+            if text in seen_texts:
                 continue
-            seen_hashes.add(text_hash)
-            kept.append(c)
-        return kept, filtered
+            if kept_idx:
+                kept = np.asarray(kept_idx)
+                if np.any((similarity[i, kept] >= threshold) & (paths[kept] == paths[i])):
+                    continue
+            seen_texts.add(text)
+            kept_idx.append(i)
+        return [candidates[i] for i in kept_idx], len(candidates) - len(kept_idx)
 
     def _budget_select(
         self,
@@ -233,10 +234,13 @@ class ContextExpansionEngine:
         steps: list[str],
         doc_rank: list[str] | None = None,
     ) -> tuple[list[dict], ExpansionDebugInfo]:
-        selected: list[dict] = []
-        used_tokens = 0
-        min_gain = float(settings.CONTEXT_EXPANSION_MIN_GAIN)
-        for candidate in sorted(
+        """Incremental max-marginal-relevance pick under ``token_budget``.
+
+        Each step takes the remaining candidate with the best ``final_score`` minus its
+        redundancy penalty against everything already picked (ties keep score order). The
+        penalty is read from one precomputed similarity matrix and updated incrementally.
+        """
+        ranked = sorted(
             candidates,
             key=lambda x: (
                 -float(x.get("final_score", 0.0)),
@@ -244,18 +248,32 @@ class ContextExpansionEngine:
                 int(x.get("ordinal", 0)),
                 str(x.get("chunk_id")),
             ),
-        ):
-            chunk_tokens = int(candidate.get("token_count") or estimate_tokens(str(candidate.get("chunk_text", ""))))
-            redundancy_penalty = self._redundancy_penalty(candidate, selected)
-            gain = float(candidate.get("final_score", 0.0)) - redundancy_penalty
-            if gain < min_gain:
-                steps.append(f"stop:min_gain:{gain:.4f}")
-                break
-            if used_tokens + chunk_tokens > token_budget:
-                steps.append(f"stop:budget:{used_tokens}+{chunk_tokens}>{token_budget}")
-                break
-            selected.append(candidate)
-            used_tokens += chunk_tokens
+        )
+        selected: list[dict] = []
+        used_tokens = 0
+        if ranked:
+            threshold = float(settings.CONTEXT_EXPANSION_REDUNDANCY_SIM_THRESHOLD)
+            min_gain = float(settings.CONTEXT_EXPANSION_MIN_GAIN)
+            scores = np.asarray([float(c.get("final_score", 0.0)) for c in ranked], dtype=np.float64)
+            tokens = np.asarray([self._candidate_tokens(c) for c in ranked], dtype=np.int64)
+            similarity = self._similarity_matrix(ranked)
+            max_sim = np.full(len(ranked), -np.inf)
+            available = np.ones(len(ranked), dtype=bool)
+            while available.any():
+                penalty = np.maximum(0.0, max_sim - threshold)
+                gains = np.where(available, scores - penalty, -np.inf)
+                pick = int(np.argmax(gains))
+                gain = float(gains[pick])
+                if gain < min_gain:
+                    steps.append(f"stop:min_gain:{gain:.4f}")
+                    break
+                if used_tokens + int(tokens[pick]) > token_budget:
+                    steps.append(f"stop:budget:{used_tokens}+{int(tokens[pick])}>{token_budget}")
+                    break
+                selected.append(ranked[pick])
+                used_tokens += int(tokens[pick])
+                available[pick] = False
+                max_sim = np.maximum(max_sim, similarity[:, pick])
 
         doc_rank_index = {doc_id: idx for idx, doc_id in enumerate(doc_rank or [])}
         ordered = sorted(
@@ -281,12 +299,10 @@ class ContextExpansionEngine:
         )
         return ordered, debug
 
-    def _redundancy_penalty(self, candidate: dict[str, Any], selected: list[dict]) -> float:
-        if not selected:
-            return 0.0
-        emb = list(candidate.get("embedding", []))
-        sim = max((self._cosine(emb, list(s.get("embedding", []))) for s in selected), default=0.0)
-        return max(0.0, sim - float(settings.CONTEXT_EXPANSION_REDUNDANCY_SIM_THRESHOLD))
+    @staticmethod
+    def _candidate_tokens(candidate: dict) -> int:
+        # Same counting as apply_context_budget, so expansion and the final budget agree.
+        return chunk_tokens(candidate)
 
     @staticmethod
     def _should_expand_links(base_candidates: list[dict], chosen_docs: list[tuple[str, list[dict]]]) -> bool:
@@ -6,14 +6,18 @@ import logging
 import re
 import time
 import uuid
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Protocol
 
+import numpy as np
+
 from app.clients.embeddings_client import EmbeddingsClient
 from app.cli.fts_rebuild import weighted_fts_expression
 from app.services.storage import ObjectStorage, StorageConfig
-from app.services.tokenizer import token_count
+from app.services.tokenizer import llm_token_count, llm_tokenizer_id, token_count
 
 Session = Any
 LOGGER = logging.getLogger(__name__)
@@ -40,7 +44,9 @@ except Exception:  # noqa: BLE001
         EMBEDDINGS_TIMEOUT_SECONDS=30,
         EMBEDDINGS_BATCH_SIZE=64,
         EMBEDDINGS_RETRY_ATTEMPTS=3,
+        EMBEDDINGS_INDEX_CONCURRENCY=2,
         EMBEDDINGS_DEFAULT_MODEL_ID="bge-m3",
+        EMBEDDINGS_ENCODING_FORMAT="float",
         CHUNK_TARGET_TOKENS=650,
         CHUNK_MAX_TOKENS=900,
         CHUNK_MIN_TOKENS=120,
@@ -54,6 +60,7 @@ except Exception:  # noqa: BLE001
 from app.db.repositories.source_sync_state import SourceSyncStateRepository
 from app.services.connectors import register_default_connectors
 from app.services.connectors.base import ConnectorListResult, SourceDescriptor, SourceItem, SyncContext
+from app.services.connectors.fetch_executor import ConnectorFetchExecutor, offloaded_conversion
 from app.services.connectors.registry import ConnectorRegistryError
 
 
@@ -701,69 +708,98 @@ def _insert_chunks(db: Session, tenant_id: uuid.UUID, document_id: uuid.UUID, so
         overlap_tokens=int(getattr(cfg, "CHUNK_OVERLAP_TOKENS", 80)),
     )
 
-    chunk_ids: list[uuid.UUID] = []
+    if not chunk_defs:
+        return []
+
+    tokenizer_id = llm_tokenizer_id()
+    columns: dict[str, list[Any]] = {
+        "chunk_id": [],
+        "chunk_path": [],
+        "chunk_text": [],
+        "token_count": [],
+        "ordinal": [],
+        "chunk_type": [],
+        "char_start": [],
+        "char_end": [],
+        "block_start_idx": [],
+        "block_end_idx": [],
+        "llm_token_count": [],
+    }
     for ordinal, chunk in enumerate(chunk_defs):
-        chunk_path = str(chunk.get("chunk_path", ""))
         chunk_text = str(chunk.get("chunk_text", ""))
-        chunk_id = stable_chunk_id(tenant_id, document_id, source_version_id, ordinal, chunk_text)
-        chunk_ids.append(chunk_id)
-        db.execute(
-            _sql(
-                """
-                INSERT INTO chunks (
-                    chunk_id, document_id, tenant_id, chunk_path, chunk_text, token_count, ordinal,
-                    chunk_type, char_start, char_end, block_start_idx, block_end_idx
-                )
-                VALUES (
-                    :chunk_id, :document_id, :tenant_id, :chunk_path, :chunk_text, :token_count, :ordinal,
-                    :chunk_type, :char_start, :char_end, :block_start_idx, :block_end_idx
-                )
-                """
-            ),
-            {
-                "chunk_id": chunk_id,
-                "document_id": document_id,
-                "tenant_id": tenant_id,
-                "chunk_path": chunk_path,
-                "chunk_text": chunk_text,
-                "token_count": int(chunk.get("token_count", _token_count(chunk_text))),
-                "ordinal": ordinal,
-                "chunk_type": str(chunk.get("chunk_type", "mixed")),
-                "char_start": int(chunk.get("char_start", 0)),
-                "char_end": int(chunk.get("char_end", 0)),
-                "block_start_idx": int(chunk.get("block_start_idx", 0)),
-                "block_end_idx": int(chunk.get("block_end_idx", 0)),
-            },
-        )
-    return chunk_ids
+        columns["chunk_id"].append(stable_chunk_id(tenant_id, document_id, source_version_id, ordinal, chunk_text))
+        columns["chunk_path"].append(str(chunk.get("chunk_path", "")))
+        columns["chunk_text"].append(chunk_text)
+        columns["token_count"].append(int(chunk.get("token_count", _token_count(chunk_text))))
+        columns["ordinal"].append(ordinal)
+        columns["chunk_type"].append(str(chunk.get("chunk_type", "mixed")))
+        columns["char_start"].append(int(chunk.get("char_start", 0)))
+        columns["char_end"].append(int(chunk.get("char_end", 0)))
+        columns["block_start_idx"].append(int(chunk.get("block_start_idx", 0)))
+        columns["block_end_idx"].append(int(chunk.get("block_end_idx", 0)))
+        columns["llm_token_count"].append(llm_token_count(chunk_text))
+
+    # One statement per document: each column travels as an array and is unnested server-side.
+    db.execute(
+        _sql(
+            """
+            INSERT INTO chunks (
+                chunk_id, document_id, tenant_id, chunk_path, chunk_text, token_count, ordinal,
+                chunk_type, char_start, char_end, block_start_idx, block_end_idx,
+                llm_token_count, llm_tokenizer
+            )
+            SELECT c.chunk_id, :document_id, :tenant_id, c.chunk_path, c.chunk_text, c.token_count, c.ordinal,
+                   c.chunk_type, c.char_start, c.char_end, c.block_start_idx, c.block_end_idx,
+                   c.llm_token_count, CAST(:llm_tokenizer AS text)
+            FROM unnest(
+                CAST(:chunk_id AS uuid[]), CAST(:chunk_path AS text[]), CAST(:chunk_text AS text[]),
+                CAST(:token_count AS integer[]), CAST(:ordinal AS integer[]), CAST(:chunk_type AS text[]),
+                CAST(:char_start AS integer[]), CAST(:char_end AS integer[]),
+                CAST(:block_start_idx AS integer[]), CAST(:block_end_idx AS integer[]),
+                CAST(:llm_token_count AS integer[])
+            ) AS c(
+                chunk_id, chunk_path, chunk_text, token_count, ordinal, chunk_type,
+                char_start, char_end, block_start_idx, block_end_idx, llm_token_count
+            )
+            """
+        ),
+        {
+            **columns,
+            "document_id": document_id,
+            "tenant_id": tenant_id,
+            "llm_tokenizer": tokenizer_id,
+        },
+    )
+    return columns["chunk_id"]
 
 
 def _insert_links(db: Session, tenant_id: uuid.UUID, document_id: uuid.UUID, links: list[str]) -> int:
-    created = 0
-    for link_url in links:
-        db.execute(
-            _sql(
-                """
-                INSERT INTO document_links (tenant_id, from_document_id, to_document_id, link_url, link_type)
-                VALUES (:tenant_id, :from_document_id, NULL, :link_url, 'CONFLUENCE_PAGE_LINK')
-                ON CONFLICT DO NOTHING
-                """
-            ),
-            {"tenant_id": tenant_id, "from_document_id": document_id, "link_url": link_url},
-        )
-        db.execute(
-            _sql(
-                """
-                INSERT INTO cross_links (from_document_id, to_document_id, link_url, link_type)
-                VALUES (:from_document_id, NULL, :link_url, 'CONFLUENCE_PAGE_LINK')
-                ON CONFLICT DO NOTHING
-                """
-            ),
-            {"tenant_id": tenant_id, "from_document_id": document_id, "link_url": link_url},
-        )
-        created += 1
-    return created
-
+    if not links:
+        return 0
+    params = {"tenant_id": tenant_id, "from_document_id": document_id, "link_url": list(links)}
+    db.execute(
+        _sql(
+            """
+            INSERT INTO document_links (tenant_id, from_document_id, to_document_id, link_url, link_type)
+            SELECT :tenant_id, :from_document_id, NULL, u.link_url, CAST('CONFLUENCE_PAGE_LINK' AS link_type)
+            FROM unnest(CAST(:link_url AS text[])) AS u(link_url)
+            ON CONFLICT DO NOTHING
+            """
+        ),
+        params,
+    )
+    db.execute(
+        _sql(
+            """
+            INSERT INTO cross_links (from_document_id, to_document_id, link_url, link_type)
+            SELECT :from_document_id, NULL, u.link_url, CAST('CONFLUENCE_PAGE_LINK' AS link_type)
+            FROM unnest(CAST(:link_url AS text[])) AS u(link_url)
+            ON CONFLICT DO NOTHING
+            """
+        ),
+        params,
+    )
+    return len(links)
 
 
 def _log_ingest_event(db: Session, tenant_id: uuid.UUID, event_type: str, payload: dict) -> None:
@@ -791,6 +827,71 @@ def _build_embedding_text(chunk_path: str, chunk_text: str) -> str:
     return f"[H] {path}\n{chunk_text}"
 
 
+def _insert_vector_batch(db: Session, tenant_id: uuid.UUID, model_id: str, chunk_ids: list[Any], embeddings: np.ndarray | list[list[float]]) -> None:
+    """Upsert one embedding batch in a single statement.
+
+    The float32 matrix is flattened into one list of Python floats, bound as a single array
+    parameter (cast to ``real[]`` server-side) and sliced per row in SQL, so a batch costs
+    one round trip instead of one ``INSERT`` per chunk.
+    """
+    try:
+        matrix = np.asarray(embeddings, dtype=np.float32)
+    except ValueError as exc:
+        raise EmbeddingIndexingError("S-EMB-INDEX-FAILED") from exc
+    if matrix.ndim != 2 or matrix.shape[0] != len(chunk_ids):
+        raise EmbeddingIndexingError("S-EMB-INDEX-FAILED")
+    db.execute(
+        _sql(
+            """
+            INSERT INTO chunk_vectors (chunk_id, tenant_id, embedding_model, embedding, embedding_dim, embedding_input_mode)
+            SELECT v.chunk_id, :tenant_id, :embedding_model,
+                   CAST(e.flat[(CAST(v.idx AS integer) - 1) * e.dim + 1 : CAST(v.idx AS integer) * e.dim] AS vector),
+                   e.dim, :embedding_input_mode
+            FROM unnest(CAST(:chunk_id AS uuid[])) WITH ORDINALITY AS v(chunk_id, idx)
+            CROSS JOIN (SELECT CAST(:embedding AS real[]) AS flat, CAST(:embedding_dim AS integer) AS dim) AS e
+            ON CONFLICT (tenant_id, chunk_id) DO UPDATE
+            SET tenant_id = EXCLUDED.tenant_id,
+                embedding_model = EXCLUDED.embedding_model,
+                embedding = EXCLUDED.embedding,
+                embedding_dim = EXCLUDED.embedding_dim,
+                embedding_input_mode = EXCLUDED.embedding_input_mode,
+                updated_at = now()
+            """
+        ),
+        {
+            "chunk_id": list(chunk_ids),
+            "tenant_id": tenant_id,
+            "embedding_model": model_id,
+            "embedding": matrix.ravel().tolist(),
+            "embedding_dim": int(matrix.shape[1]),
+            "embedding_input_mode": "path_text_v2",
+        },
+    )
+
+
+def _embed_batch_with_retry(
+    client: Any,
+    texts: list[str],
+    model_id: str,
+    tenant_id: str,
+    correlation_id: str,
+    retry_attempts: int,
+) -> tuple[np.ndarray | list[list[float]] | None, Exception | None]:
+    # embed_matrix hands back the decoded float32 matrix as-is, skipping the per-row lists
+    # embed_texts builds; _insert_vector_batch flattens it once for the bind parameter.
+    embed = getattr(client, "embed_matrix", None) or client.embed_texts
+    last_exc: Exception | None = None
+    for attempt in range(1, max(retry_attempts, 1) + 1):
+        try:
+            return embed(texts, model_id=model_id, tenant_id=tenant_id, correlation_id=correlation_id), None
+        except Exception as exc:  # noqa: BLE001
+            last_exc = exc
+            if attempt < max(retry_attempts, 1):
+                delay_seconds = min(2 ** (attempt - 1), 8)
+                time.sleep(delay_seconds)
+    return None, last_exc
+
+
 def _upsert_chunk_vectors(db: Session, tenant_id: uuid.UUID, chunk_ids: list[uuid.UUID]) -> None:
     if not chunk_ids:
         return
@@ -798,7 +899,11 @@ def _upsert_chunk_vectors(db: Session, tenant_id: uuid.UUID, chunk_ids: list[uui
     batch_size = int(getattr(cfg, "EMBEDDINGS_BATCH_SIZE", 64))
     retry_attempts = int(getattr(cfg, "EMBEDDINGS_RETRY_ATTEMPTS", 3))
     model_id = str(getattr(cfg, "EMBEDDINGS_DEFAULT_MODEL_ID", "bge-m3"))
-    client = EmbeddingsClient(getattr(cfg, "EMBEDDINGS_SERVICE_URL", None), getattr(cfg, "EMBEDDINGS_TIMEOUT_SECONDS", 30))
+    client = EmbeddingsClient(
+        getattr(cfg, "EMBEDDINGS_SERVICE_URL", None),
+        getattr(cfg, "EMBEDDINGS_TIMEOUT_SECONDS", 30),
+        encoding_format=str(getattr(cfg, "EMBEDDINGS_ENCODING_FORMAT", "float")),
+    )
 
     query_result = db.execute(
         _sql(
@@ -821,12 +926,12 @@ def _upsert_chunk_vectors(db: Session, tenant_id: uuid.UUID, chunk_ids: list[uui
     vectors_indexed_count = 0
     batch_count = 0
     start_all = time.perf_counter()
+    concurrency = max(1, int(getattr(cfg, "EMBEDDINGS_INDEX_CONCURRENCY", 2)))
+    batches = [rows[i : i + batch_size] for i in range(0, len(rows), batch_size)]
 
-    for i in range(0, len(rows), batch_size):
-        batch = rows[i : i + batch_size]
-        t0 = datetime.now(timezone.utc)
+    def _submit(executor: ThreadPoolExecutor, index: int) -> tuple[int, datetime, Future]:
+        batch = batches[index]
         texts = [_build_embedding_text(str(row.get("chunk_path") or ""), str(row["chunk_text"])) for row in batch]
-        correlation_id = str(uuid.uuid4())
         _log_ingest_event(
             db,
             tenant_id,
@@ -837,80 +942,58 @@ def _upsert_chunk_vectors(db: Session, tenant_id: uuid.UUID, chunk_ids: list[uui
                 "chunk_ids": [str(row["chunk_id"]) for row in batch],
             },
         )
-
-        last_exc: Exception | None = None
-        embeddings: list[list[float]] | None = None
-        for attempt in range(1, max(retry_attempts, 1) + 1):
-            try:
-                embeddings = client.embed_texts(
-                    texts,
-                    model_id=model_id,
-                    tenant_id=str(tenant_id),
-                    correlation_id=correlation_id,
+        future = executor.submit(_embed_batch_with_retry, client, texts, model_id, str(tenant_id), str(uuid.uuid4()), retry_attempts)
+        return index, datetime.now(timezone.utc), future
+
+    # Up to ``concurrency`` batches are embedding while this thread writes finished batches in
+    # order; the session is only ever touched from the calling thread.
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embed-index") as executor:
+        in_flight: deque[tuple[int, datetime, Future]] = deque()
+        next_index = 0
+        try:
+            while in_flight or next_index < len(batches):
+                while next_index < len(batches) and len(in_flight) < concurrency:
+                    in_flight.append(_submit(executor, next_index))
+                    next_index += 1
+                index, t0, future = in_flight.popleft()
+                batch = batches[index]
+                embeddings, last_exc = future.result()
+                if embeddings is None:
+                    _log_ingest_event(
+                        db,
+                        tenant_id,
+                        "ERROR",
+                        {
+                            "code": "S-EMB-INDEX-FAILED",
+                            "message": str(last_exc),
+                            "batch_start": index * batch_size,
+                            "attempts": max(retry_attempts, 1),
+                        },
+                    )
+                    raise EmbeddingIndexingError("S-EMB-INDEX-FAILED") from last_exc
+
+                if len(embeddings) != len(batch):
+                    raise EmbeddingIndexingError("S-EMB-INDEX-FAILED")
+
+                _insert_vector_batch(db, tenant_id, model_id, [row["chunk_id"] for row in batch], embeddings)
+                elapsed_ms = int((datetime.now(timezone.utc) - t0).total_seconds() * 1000)
+                _log_ingest_event(
+                    db,
+                    tenant_id,
+                    "EMBEDDINGS_RESPONSE",
+                    {
+                        "model": model_id,
+                        "batch_size": len(batch),
+                        "duration_ms": elapsed_ms,
+                        "indexed_count": len(batch),
+                    },
                 )
-                break
-            except Exception as exc:  # noqa: BLE001
-                last_exc = exc
-                if attempt < max(retry_attempts, 1):
-                    delay_seconds = min(2 ** (attempt - 1), 8)
-                    time.sleep(delay_seconds)
-
-        if embeddings is None:
-            _log_ingest_event(
-                db,
-                tenant_id,
-                "ERROR",
-                {
-                    "code": "S-EMB-INDEX-FAILED",
-                    "message": str(last_exc),
-                    "batch_start": i,
-                    "attempts": max(retry_attempts, 1),
-                },
-            )
-            raise EmbeddingIndexingError("S-EMB-INDEX-FAILED") from last_exc
-
-        if len(embeddings) != len(batch):
-            raise EmbeddingIndexingError("S-EMB-INDEX-FAILED")
-
-        for row, emb in zip(batch, embeddings):
-            db.execute(
-                _sql(
-                    """
-                    INSERT INTO chunk_vectors (chunk_id, tenant_id, embedding_model, embedding, embedding_dim, embedding_input_mode)
-                    VALUES (:chunk_id, :tenant_id, :embedding_model, CAST(:embedding AS vector), :embedding_dim, :embedding_input_mode)
-                    ON CONFLICT (tenant_id, chunk_id) DO UPDATE
-                    SET tenant_id = EXCLUDED.tenant_id,
-                        embedding_model = EXCLUDED.embedding_model,
-                        embedding = EXCLUDED.embedding,
-                        embedding_dim = EXCLUDED.embedding_dim,
-                        embedding_input_mode = EXCLUDED.embedding_input_mode,
-                        updated_at = now()
-                    """
-                ),
-                {
-                    "chunk_id": row["chunk_id"],
-                    "tenant_id": tenant_id,
-                    "embedding_model": model_id,
-                    "embedding": "[" + ",".join(f"{float(x):.8f}" for x in emb) + "]",
-                    "embedding_dim": len(emb),
-                    "embedding_input_mode": "path_text_v2",
-                },
-            )
-        elapsed_ms = int((datetime.now(timezone.utc) - t0).total_seconds() * 1000)
-        _log_ingest_event(
-            db,
-            tenant_id,
-            "EMBEDDINGS_RESPONSE",
-            {
-                "model": model_id,
-                "batch_size": len(batch),
-                "duration_ms": elapsed_ms,
-                "indexed_count": len(batch),
-            },
-        )
-        _log_ingest_event(db, tenant_id, "PIPELINE_STAGE", {"stage": "INDEX_VECTOR", "batch_size": len(batch), "duration_ms": elapsed_ms})
-        vectors_indexed_count += len(batch)
-        batch_count += 1
+                _log_ingest_event(db, tenant_id, "PIPELINE_STAGE", {"stage": "INDEX_VECTOR", "batch_size": len(batch), "duration_ms": elapsed_ms})
+                vectors_indexed_count += len(batch)
+                batch_count += 1
+        finally:
+            for _index, _t0, pending in in_flight:
+                pending.cancel()
 
     duration_ms = int((time.perf_counter() - start_all) * 1000)
     LOGGER.info(
@@ -950,6 +1033,22 @@ def _upsert_fts_for_chunks(db: Session, tenant_id: uuid.UUID, chunk_ids: list[uu
     _log_ingest_event(db, tenant_id, "PIPELINE_STAGE", {"stage": "INDEX_BM25", "chunks_indexed": len(chunk_ids)})
 
 
+def _bump_corpus_generation(db: Session, tenant_id: uuid.UUID) -> None:
+    # Invalidates cached /v1/query responses for the tenant (see QueryResponseCache).
+    db.execute(
+        _sql(
+            """
+            INSERT INTO tenant_corpus_generations (tenant_id, generation, updated_at)
+            VALUES (:tenant_id, 1, now())
+            ON CONFLICT (tenant_id) DO UPDATE
+            SET generation = tenant_corpus_generations.generation + 1,
+                updated_at = now()
+            """
+        ),
+        {"tenant_id": tenant_id},
+    )
+
+
 def ingest_source_items(
     db: Session,
     tenant_id: uuid.UUID,
@@ -1024,6 +1123,8 @@ def ingest_source_items(
         _upsert_chunk_vectors(db, tenant_id, chunk_ids)
         _upsert_fts_for_chunks(db, tenant_id, chunk_ids)
 
+    if items:
+        _bump_corpus_generation(db, tenant_id)
     if hasattr(db, "commit"):
         db.commit()
     return {"documents": docs, "chunks": chunks, "cross_links": links, "artifacts": artifacts}
@@ -1067,9 +1168,6 @@ def ingest_sources_sync(
         incremental_enabled=settings.CONNECTOR_INCREMENTAL_ENABLED,
     )
     repo = SourceSyncStateRepository(db)
-    items: list[SourceItem] = []
-    descriptor_by_ref: dict[str, SourceDescriptor] = {}
-    raw_payloads: dict[str, bytes] = {}
     seen_refs_by_source_type: dict[str, set[str]] = {}
     listing_complete_by_source_type: dict[str, bool] = {}
     counters = {
@@ -1078,49 +1176,111 @@ def ingest_sources_sync(
         "items_skipped_incremental": 0,
         "items_ingested": 0,
         "items_failed": 0,
+        "fetch_throttled": 0,
+        "batches_committed": 0,
     }
-
-    for source_type in source_types:
-        connector = connector_registry.get(source_type)
-        list_result = connector.list_descriptors(str(tenant_id), sync_context)
-        descriptors = list_result.descriptors[: settings.CONNECTOR_SYNC_MAX_ITEMS_PER_RUN]
-        listing_complete = bool(list_result.listing_complete)
-        counters["descriptors_listed"] += len(descriptors)
-        seen_refs_by_source_type[source_type] = {d.external_ref for d in descriptors}
-        listing_complete_by_source_type[source_type] = listing_complete
-        LOGGER.info("connector_list_descriptors", extra={"source_type": source_type, "descriptors": len(descriptors), "event": "connector_list_descriptors"})
-        for descriptor in descriptors:
-            state = repo.get_state(str(tenant_id), descriptor.source_type, descriptor.external_ref)
-            if not should_fetch(descriptor, state, settings.CONNECTOR_INCREMENTAL_ENABLED):
-                counters["items_skipped_incremental"] += 1
-                LOGGER.info(
-                    "file_catalog_skip_incremental",
-                    extra={
-                        "event": "file_catalog_skip_incremental",
-                        "source_type": descriptor.source_type,
-                        "external_ref": descriptor.external_ref,
-                    },
-                )
-                continue
-            result = connector.fetch_item(str(tenant_id), descriptor)
-            if result.error or result.item is None:
-                counters["items_failed"] += 1
-                repo.mark_failure(
-                    tenant_id=str(tenant_id),
-                    source_type=descriptor.source_type,
-                    external_ref=descriptor.external_ref,
-                    last_seen_modified_at=descriptor.last_modified,
-                    last_seen_checksum=descriptor.checksum_hint,
-                    last_synced_at=datetime.now(timezone.utc),
-                    error_code=(result.error.error_code if result.error else "I-CONNECTOR-EMPTY-ITEM"),
-                    error_message=(result.error.message if result.error else "Connector returned empty item"),
-                )
-                continue
-            counters["items_fetched"] += 1
-            descriptor_by_ref[descriptor.external_ref] = descriptor
-            items.append(result.item)
-            if result.raw_payload is not None:
-                raw_payloads[result.item.external_ref] = result.raw_payload
+    fetch_concurrency = int(getattr(settings, "CONNECTOR_FETCH_CONCURRENCY", 4))
+    fetch_overrides: dict[str, int] = getattr(settings, "connector_fetch_concurrency_overrides", {})
+    conversion_processes = int(getattr(settings, "CONNECTOR_CONVERSION_PROCESSES", 0))
+    conversion_pool = ProcessPoolExecutor(max_workers=conversion_processes) if conversion_processes > 0 else None
+
+    # Fetched items are ingested and committed in micro-batches (bounded by item count and by
+    # bytes held), so memory stays flat over a sync and a late failure keeps earlier batches.
+    batch_max_items = max(1, int(getattr(settings, "CONNECTOR_SYNC_BATCH_ITEMS", 50)))
+    batch_max_bytes = max(1, int(getattr(settings, "CONNECTOR_SYNC_BATCH_MAX_BYTES", 64 * 1024 * 1024)))
+    ingest_result = {"documents": 0, "chunks": 0, "cross_links": 0, "artifacts": 0}
+    batch: list[tuple[SourceItem, SourceDescriptor]] = []
+    batch_payloads: dict[str, bytes] = {}
+    batch_bytes = 0
+
+    def flush_batch() -> None:
+        nonlocal batch, batch_payloads, batch_bytes
+        if not batch:
+            return
+        synced_at = datetime.now(timezone.utc)
+        for item, descriptor in batch:
+            repo.mark_success(
+                tenant_id=str(tenant_id),
+                source_type=item.source_type,
+                external_ref=item.external_ref,
+                last_seen_modified_at=descriptor.last_modified,
+                last_seen_checksum=descriptor.checksum_hint,
+                last_synced_at=synced_at,
+            )
+        repo.flush()
+        # ingest_source_items commits, so the sync state above lands together with the content.
+        result = ingest_source_items(db, tenant_id, [item for item, _ in batch], storage=storage, raw_payloads=batch_payloads)
+        for key, value in result.items():
+            ingest_result[key] = ingest_result.get(key, 0) + value
+        counters["batches_committed"] += 1
+        LOGGER.info(
+            "connector_sync_batch_committed",
+            extra={"event": "connector_sync_batch_committed", "tenant_id": str(tenant_id), "items": len(batch), "bytes": batch_bytes},
+        )
+        batch, batch_payloads, batch_bytes = [], {}, 0
+
+    try:
+        for source_type in source_types:
+            connector = connector_registry.get(source_type)
+            list_result = connector.list_descriptors(str(tenant_id), sync_context)
+            descriptors = list_result.descriptors[: settings.CONNECTOR_SYNC_MAX_ITEMS_PER_RUN]
+            listing_complete = bool(list_result.listing_complete)
+            counters["descriptors_listed"] += len(descriptors)
+            seen_refs_by_source_type[source_type] = {d.external_ref for d in descriptors}
+            listing_complete_by_source_type[source_type] = listing_complete
+            LOGGER.info("connector_list_descriptors", extra={"source_type": source_type, "descriptors": len(descriptors), "event": "connector_list_descriptors"})
+            # One query for every known state of this source type; get_state below is served from memory.
+            repo.load_states(str(tenant_id), source_type)
+            to_fetch: list[SourceDescriptor] = []
+            for descriptor in descriptors:
+                state = repo.get_state(str(tenant_id), descriptor.source_type, descriptor.external_ref)
+                if not should_fetch(descriptor, state, settings.CONNECTOR_INCREMENTAL_ENABLED):
+                    counters["items_skipped_incremental"] += 1
+                    LOGGER.info(
+                        "file_catalog_skip_incremental",
+                        extra={
+                            "event": "file_catalog_skip_incremental",
+                            "source_type": descriptor.source_type,
+                            "external_ref": descriptor.external_ref,
+                        },
+                    )
+                    continue
+                to_fetch.append(descriptor)
+
+            # Fetches run concurrently; results come back in descriptor order and all state/counter
+            # bookkeeping stays on this thread and session.
+            fetcher = ConnectorFetchExecutor(
+                concurrency=fetch_overrides.get(source_type, fetch_concurrency),
+                throttle_retries=int(getattr(settings, "CONNECTOR_FETCH_THROTTLE_RETRIES", 3)),
+            )
+            with offloaded_conversion(connector, conversion_pool):
+                for descriptor, result in fetcher.fetch_all(connector, str(tenant_id), to_fetch):
+                    if result.error or result.item is None:
+                        counters["items_failed"] += 1
+                        repo.mark_failure(
+                            tenant_id=str(tenant_id),
+                            source_type=descriptor.source_type,
+                            external_ref=descriptor.external_ref,
+                            last_seen_modified_at=descriptor.last_modified,
+                            last_seen_checksum=descriptor.checksum_hint,
+                            last_synced_at=datetime.now(timezone.utc),
+                            error_code=(result.error.error_code if result.error else "I-CONNECTOR-EMPTY-ITEM"),
+                            error_message=(result.error.message if result.error else "Connector returned empty item"),
+                        )
+                        continue
+                    counters["items_fetched"] += 1
+                    batch.append((result.item, descriptor))
+                    batch_bytes += len(result.item.markdown)
+                    if result.raw_payload is not None:
+                        batch_payloads[result.item.external_ref] = result.raw_payload
+                        batch_bytes += len(result.raw_payload)
+                    if len(batch) >= batch_max_items or batch_bytes >= batch_max_bytes:
+                        flush_batch()
+            counters["fetch_throttled"] += fetcher.throttled
+        flush_batch()
+    finally:
+        if conversion_pool is not None:
+            conversion_pool.shutdown()
 
     for source_type in source_types:
         seen_refs = seen_refs_by_source_type.get(source_type, set())
@@ -1149,19 +1309,10 @@ def ingest_sources_sync(
                 last_synced_at=datetime.now(timezone.utc),
             )
 
-    ingest_result = ingest_source_items(db, tenant_id, items, storage=storage, raw_payloads=raw_payloads)
+    repo.flush()
+    if hasattr(db, "commit"):
+        db.commit()
     counters["items_ingested"] = ingest_result["documents"]
 
-    for item in items:
-        desc = descriptor_by_ref.get(item.external_ref)
-        repo.mark_success(
-            tenant_id=str(tenant_id),
-            source_type=item.source_type,
-            external_ref=item.external_ref,
-            last_seen_modified_at=(desc.last_modified if desc else None),
-            last_seen_checksum=(desc.checksum_hint if desc else None),
-            last_synced_at=datetime.now(timezone.utc),
-        )
-
     LOGGER.info("connector_summary", extra={"event": "connector_summary", "tenant_id": str(tenant_id), **counters})
     return ingest_result
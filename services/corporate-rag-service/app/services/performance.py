@@ -8,6 +8,7 @@ def build_stage_budgets(request_timeout_seconds: int, embeddings_timeout_seconds
     # Derived configurable budgets from existing env-backed timeouts.
     return {
         "t_parse_ms": max(10, int(total_budget_ms * 0.05)),
+        "t_embed_ms": max(10, int(vector_budget_ms * 0.40)),
         "t_lexical_ms": max(10, int(total_budget_ms * 0.20)),
         "t_vector_ms": max(10, int(vector_budget_ms * 0.60)),
         "t_rerank_ms": max(10, int(total_budget_ms * 0.25)),
@@ -35,5 +36,5 @@ def p95(values: list[int]) -> float:
 
 
 def summarize_perf(samples: list[dict[str, Any]]) -> dict[str, float]:
-    keys = ["t_parse_ms", "t_lexical_ms", "t_vector_ms", "t_rerank_ms", "t_total_ms", "t_llm_ms", "t_citations_ms"]
+    keys = ["t_parse_ms", "t_embed_ms", "t_lexical_ms", "t_vector_ms", "t_rerank_ms", "t_total_ms", "t_llm_ms", "t_citations_ms"]
     return {f"{k}_p95": p95([int(s.get(k, 0)) for s in samples]) for k in keys}
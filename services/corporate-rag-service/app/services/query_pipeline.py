@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from app.core.config import settings
+from app.services.tokenizer import llm_encoding, llm_tokenizer_id
 
 MAX_CONTEXT_WORDS = 12000
 DEFAULT_TOP_K = settings.DEFAULT_TOP_K
@@ -16,9 +17,9 @@ def token_count(text: str) -> int:
 
 
 def _tiktoken_estimate(text: str) -> int:
-    import tiktoken  # type: ignore
-
-    enc = tiktoken.get_encoding("cl100k_base")
+    enc = llm_encoding()
+    if enc is None:
+        raise RuntimeError("tiktoken is not installed")
     return len(enc.encode(text))
 
 
@@ -30,6 +31,14 @@ def estimate_tokens(text: str) -> int:
         return int(max(1, round(words * 1.33)))
 
 
+def chunk_tokens(chunk: dict, tokenizer_id: str | None = None) -> int:
+    """Stored ingestion-time count when it came from the current tokenizer, else a live estimate."""
+    stored = chunk.get("llm_token_count")
+    if stored is not None and chunk.get("llm_tokenizer") == (tokenizer_id or llm_tokenizer_id()):
+        return int(stored)
+    return estimate_tokens(str(chunk.get("chunk_text", "")))
+
+
 def _truncate_text_to_tokens(text: str, budget_tokens: int) -> str:
     if budget_tokens <= 0:
         return TRUNCATION_MARKER
@@ -58,7 +67,7 @@ def expand_neighbors(
         return base
 
     cap = min(12, max(top_k, DEFAULT_TOP_K) * 3)
-    neighbors = TenantRepository(db, tenant_id).fetch_neighbors(base, max(0, cap - len(base)), window=max(1, neighbor_window))
+    neighbors = TenantRepository(db, tenant_id).fetch_neighbors(base, max(0, cap - len(base)), window=max(1, neighbor_window), include_embeddings=False)
     expanded: list[dict] = []
     seen: set[str] = set()
     merged = [*base, *neighbors]
@@ -100,40 +109,45 @@ def apply_context_budget(
         }
 
     assembled = [dict(chunk) for chunk in chunks]
-    token_map = {str(c.get("chunk_id")): estimate_tokens(str(c.get("chunk_text", ""))) for c in assembled}
-    initial_tokens = sum(token_map.values())
+    tokenizer_id = llm_tokenizer_id()
+    tokens = [chunk_tokens(c, tokenizer_id) for c in assembled]
+    initial_tokens = sum(tokens)
 
     dropped = 0
     truncated = False
 
-    # Deterministic low-score trimming first.
-    while assembled and sum(token_map[str(c.get("chunk_id"))] for c in assembled) > effective_budget:
-        removable = sorted(
-            assembled,
-            key=lambda c: (
-                float(c.get("final_score", 0.0)),
-                str(c.get("chunk_id")),
-            ),
-        )[0]
-        assembled = [c for c in assembled if str(c.get("chunk_id")) != str(removable.get("chunk_id"))]
-        dropped += 1
+    # Deterministic low-score trimming first: one sort, then drop from the bottom until it fits.
+    total = initial_tokens
+    drop: set[int] = set()
+    if total > effective_budget:
+        for i in sorted(range(len(assembled)), key=lambda i: (float(assembled[i].get("final_score", 0.0)), str(assembled[i].get("chunk_id")))):
+            if total <= effective_budget:
+                break
+            drop.add(i)
+            total -= tokens[i]
+        dropped = len(drop)
+    kept = [i for i in range(len(assembled)) if i not in drop]
+    assembled = [assembled[i] for i in kept]
+    tokens = [tokens[i] for i in kept]
 
     if not assembled:
         best = dict(sorted(chunks, key=lambda c: (-float(c.get("final_score", 0.0)), str(c.get("chunk_id"))))[0])
         best["chunk_text"] = _truncate_text_to_tokens(str(best.get("chunk_text", "")), effective_budget)
         best["context_truncated"] = True
         assembled = [best]
+        tokens = [estimate_tokens(best["chunk_text"])]
         truncated = True
 
-    final_tokens = sum(estimate_tokens(str(c.get("chunk_text", ""))) for c in assembled)
+    final_tokens = sum(tokens)
     if final_tokens > effective_budget and assembled:
         tail = dict(assembled[-1])
-        keep = max(1, effective_budget - sum(estimate_tokens(str(c.get("chunk_text", ""))) for c in assembled[:-1]))
+        keep = max(1, effective_budget - sum(tokens[:-1]))
         tail["chunk_text"] = _truncate_text_to_tokens(str(tail.get("chunk_text", "")), keep)
         tail["context_truncated"] = True
         assembled[-1] = tail
+        tokens[-1] = estimate_tokens(tail["chunk_text"])
         truncated = True
-        final_tokens = sum(estimate_tokens(str(c.get("chunk_text", ""))) for c in assembled)
+        final_tokens = sum(tokens)
     trimmed_tokens = max(0, initial_tokens - final_tokens)
 
     before_words = sum(token_count(c.get("chunk_text", "")) for c in chunks)
@@ -1,31 +1,159 @@
+import hashlib
 import logging
+import threading
 import time
+from collections import OrderedDict
 
 LOGGER = logging.getLogger(__name__)
 
 
+def _digest(value: str) -> str:
+    return hashlib.blake2b(value.encode("utf-8"), digest_size=8).hexdigest()
+
+
 class RerankerService:
-    def __init__(self, model_id: str, model=None):
+    """Cross-encoder reranking with a bounded score cache and length-bucketed batches.
+
+    Scores are memoized by ``(model_id, query hash, chunk_id, chunk text hash)`` so repeated
+    queries only score new or changed chunks. Uncached pairs are sorted by text length and
+    scored in batches of ``batch_size`` so each batch pads to a similar length.
+
+    With a ``client`` (see ``RerankerClient``) pairs are scored by reranker-service and the
+    local cross-encoder is only loaded if a remote call fails and ``remote_fallback`` is set.
+    After a failure the remote service is skipped for ``remote_cooldown_seconds`` so requests
+    do not each wait out the client timeout while it is down.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        model=None,
+        max_length: int | None = None,
+        batch_size: int = 32,
+        cache_max_entries: int = 0,
+        client=None,
+        remote_fallback: bool = True,
+        remote_cooldown_seconds: float = 30.0,
+    ):
         self.model_id = model_id
-        if model is not None:
-            self.model = model
-        else:
-            from sentence_transformers import CrossEncoder
+        self.max_length = max_length
+        self.batch_size = max(1, int(batch_size))
+        self.cache_max_entries = max(0, int(cache_max_entries))
+        self.client = client
+        self.remote_fallback = remote_fallback
+        self.remote_cooldown_seconds = max(0.0, float(remote_cooldown_seconds))
+        self._remote_retry_at = 0.0
+        self._cache: OrderedDict[tuple[str, str, str, str], float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._model = model
+        if model is None and client is None:
+            self._model = self._load_model()
+
+    def _load_model(self):
+        from sentence_transformers import CrossEncoder
+
+        return CrossEncoder(self.model_id, max_length=self.max_length)
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _cache_key(self, query_hash: str, candidate: dict) -> tuple[str, str, str, str] | None:
+        chunk_id = candidate.get("chunk_id")
+        if not self.cache_max_entries or chunk_id is None:
+            return None
+        return (self.model_id, query_hash, str(chunk_id), _digest(str(candidate.get("chunk_text", ""))))
+
+    def _cache_get(self, key: tuple[str, str, str, str] | None) -> float | None:
+        if key is None:
+            return None
+        with self._lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _cache_put(self, key: tuple[str, str, str, str] | None, score: float) -> None:
+        if key is None:
+            return
+        with self._lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def _score_remote(self, query: str, candidates: list[dict]) -> tuple[list[float], list[int]] | None:
+        if self.remote_fallback and time.monotonic() < self._remote_retry_at:
+            return None
+        t0 = time.perf_counter()
+        try:
+            scores = self.client.score(query, [c["chunk_text"] for c in candidates], model_id=self.model_id)
+        except Exception as exc:  # noqa: BLE001
+            if not self.remote_fallback:
+                raise
+            self._remote_retry_at = time.monotonic() + self.remote_cooldown_seconds
+            LOGGER.warning(
+                "reranker_remote_fallback",
+                extra={"model_id": self.model_id, "error": str(exc), "cooldown_seconds": self.remote_cooldown_seconds},
+            )
+            return None
+        return scores, [int((time.perf_counter() - t0) * 1000)]
 
-            self.model = CrossEncoder(model_id)
+    def _score_pairs(self, query: str, candidates: list[dict]) -> tuple[list[float], list[int], str]:
+        if self.client is not None:
+            remote = self._score_remote(query, candidates)
+            if remote is not None:
+                return remote[0], remote[1], "remote"
+        order = sorted(range(len(candidates)), key=lambda i: len(candidates[i]["chunk_text"]))
+        scores = [0.0] * len(candidates)
+        batch_ms: list[int] = []
+        for offset in range(0, len(order), self.batch_size):
+            batch = order[offset : offset + self.batch_size]
+            t0 = time.perf_counter()
+            batch_scores = self.model.predict([[query, candidates[i]["chunk_text"]] for i in batch])
+            batch_ms.append(int((time.perf_counter() - t0) * 1000))
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+        return scores, batch_ms, "local"
 
     def rerank(self, query: str, candidates: list[dict]) -> tuple[list[dict], int]:
         if len(candidates) < 2:
             return candidates, 0
         start = time.perf_counter()
-        pairs = [[query, c["chunk_text"]] for c in candidates]
-        scores = self.model.predict(pairs)
-        for candidate, score in zip(candidates, scores):
-            candidate["rerank_score"] = float(score)
+        query_hash = _digest(query)
+        keys = [self._cache_key(query_hash, c) for c in candidates]
+        misses: list[int] = []
+        for i, (candidate, key) in enumerate(zip(candidates, keys)):
+            cached = self._cache_get(key)
+            if cached is None:
+                misses.append(i)
+            else:
+                candidate["rerank_score"] = cached
+        batch_ms: list[int] = []
+        mode = "cache"
+        if misses:
+            scores, batch_ms, mode = self._score_pairs(query, [candidates[i] for i in misses])
+            for i, score in zip(misses, scores):
+                candidates[i]["rerank_score"] = score
+                self._cache_put(keys[i], score)
         sorted_candidates = sorted(candidates, key=lambda x: x["rerank_score"], reverse=True)
         duration_ms = int((time.perf_counter() - start) * 1000)
+        cache_hits = len(candidates) - len(misses)
         LOGGER.info(
             "reranker_applied",
-            extra={"model_id": self.model_id, "candidate_count": len(candidates), "duration_ms": duration_ms},
+            extra={
+                "model_id": self.model_id,
+                "candidate_count": len(candidates),
+                "duration_ms": duration_ms,
+                "cache_hits": cache_hits,
+                "cache_hit_rate": cache_hits / len(candidates),
+                "batch_count": len(batch_ms),
+                "batch_ms": batch_ms,
+                "mode": mode,
+            },
         )
         return sorted_candidates, duration_ms
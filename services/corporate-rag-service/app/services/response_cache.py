@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+import numpy as np
+
+from app.clients.embedding_cache import normalize_query_text
+from app.services.telemetry import emit_metric, increment_counter
+
+
+def settings_fingerprint(values: dict[str, Any]) -> str:
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class QueryResponseCache:
+    """LRU/TTL cache of full ``/v1/query`` responses.
+
+    Keys combine ``(tenant_id, corpus generation, normalized resolved query, request options,
+    settings fingerprint)``. Ingestion bumps the tenant's corpus generation, so answers built
+    from an older corpus are never looked up again and simply age out of the LRU.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600.0,
+        now_fn: Callable[[], float] | None = None,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._entries: OrderedDict[tuple[str, int, str, str, str], tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._now_fn = now_fn or time.monotonic
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(tenant_id: str, generation: int, resolved_query: str, options: dict[str, Any], fingerprint: str) -> tuple[str, int, str, str, str]:
+        return (
+            str(tenant_id),
+            int(generation),
+            normalize_query_text(resolved_query),
+            json.dumps(options, sort_keys=True, default=str),
+            fingerprint,
+        )
+
+    def get(self, key: tuple[str, int, str, str, str]) -> Any | None:
+        now = self._now_fn()
+        value: Any | None = None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (self.ttl_seconds <= 0 or now - entry[0] < self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                value = entry[1]
+            else:
+                if entry is not None:
+                    self._entries.pop(key, None)
+                self.misses += 1
+        increment_counter("query_response_cache_hits" if value is not None else "query_response_cache_misses")
+        return value
+
+    def put(self, key: tuple[str, int, str, str, str], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._now_fn(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_INITIAL_TENANT_CAPACITY = 16
+
+
+class _TenantIndex:
+    def __init__(self, capacity: int, dim: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.scope_ids = np.full(capacity, -1, dtype=np.int64)
+        self.stored_at = np.zeros(capacity, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.int64)
+        self.values: list[Any] = [None] * capacity
+        self.scopes: dict[tuple[int, str, str], int] = {}
+        self.next_scope_id = 0
+
+    @property
+    def capacity(self) -> int:
+        return int(self.valid.shape[0])
+
+    def grow(self, capacity: int) -> None:
+        extra = capacity - self.capacity
+        self.vectors = np.vstack([self.vectors, np.zeros((extra, self.vectors.shape[1]), dtype=np.float32)])
+        self.valid = np.concatenate([self.valid, np.zeros(extra, dtype=bool)])
+        self.scope_ids = np.concatenate([self.scope_ids, np.full(extra, -1, dtype=np.int64)])
+        self.stored_at = np.concatenate([self.stored_at, np.zeros(extra, dtype=np.float64)])
+        self.last_used = np.concatenate([self.last_used, np.zeros(extra, dtype=np.int64)])
+        self.values.extend([None] * extra)
+
+
+class SemanticQueryCache:
+    """Per-tenant in-memory vector index of answered queries for paraphrase reuse.
+
+    Each tenant gets a matrix of unit-normalized query embeddings that starts small and doubles
+    up to ``max_entries`` rows. A lookup is one matrix-vector product restricted to rows with
+    the same scope ``(corpus generation, request options, settings fingerprint)``; the best row
+    is reused when its cosine similarity reaches ``similarity_threshold``. When a full index
+    needs a row, expired rows and rows of older corpus generations are overwritten first, then
+    the least recently used one. At most
+    ``max_tenants`` indexes are kept; the least recently used tenant is dropped beyond that,
+    so the process holds at most ``max_tenants * max_entries`` vectors.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 512,
+        ttl_seconds: float = 600.0,
+        max_tenants: int = 64,
+        now_fn: Callable[[], float] | None = None,
+    ):
+        self.similarity_threshold = float(similarity_threshold)
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_tenants = max(1, int(max_tenants))
+        self._tenants: OrderedDict[str, _TenantIndex] = OrderedDict()
+        self._lock = threading.Lock()
+        self._now_fn = now_fn or time.monotonic
+        self._tick = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _unit(embedding: list[float]) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if not vector.size or norm == 0.0:
+            return None
+        return vector / norm
+
+    def _live(self, index: _TenantIndex, now: float) -> np.ndarray:
+        if self.ttl_seconds <= 0:
+            return index.valid
+        return index.valid & (now - index.stored_at < self.ttl_seconds)
+
+    def get(self, tenant_id: str, scope: tuple[int, str, str], embedding: list[float]) -> tuple[Any, float] | None:
+        """Return ``(cached value, similarity)`` for the closest live paraphrase, if close enough."""
+        query = self._unit(embedding)
+        now = self._now_fn()
+        result: tuple[Any, float] | None = None
+        with self._lock:
+            index = self._tenants.get(str(tenant_id))
+            if index is not None:
+                self._tenants.move_to_end(str(tenant_id))
+            scope_id = index.scopes.get(scope) if index is not None else None
+            if query is not None and scope_id is not None and index.vectors.shape[1] == query.shape[0]:
+                mask = self._live(index, now) & (index.scope_ids == scope_id)
+                if mask.any():
+                    sims = np.where(mask, index.vectors @ query, -np.inf)
+                    best = int(np.argmax(sims))
+                    if float(sims[best]) >= self.similarity_threshold:
+                        self._tick += 1
+                        index.last_used[best] = self._tick
+                        result = (index.values[best], float(sims[best]))
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        increment_counter("query_semantic_cache_hits" if result is not None else "query_semantic_cache_misses")
+        if result is not None:
+            emit_metric("query_semantic_cache_similarity", result[1])
+        return result
+
+    def put(self, tenant_id: str, scope: tuple[int, str, str], embedding: list[float], value: Any) -> None:
+        vector = self._unit(embedding)
+        if vector is None:
+            return
+        now = self._now_fn()
+        with self._lock:
+            index = self._tenants.get(str(tenant_id))
+            if index is None or index.vectors.shape[1] != vector.shape[0]:
+                index = _TenantIndex(min(self.max_entries, _INITIAL_TENANT_CAPACITY), vector.shape[0])
+                self._tenants[str(tenant_id)] = index
+            self._tenants.move_to_end(str(tenant_id))
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+            scope_id = index.scopes.get(scope)
+            if scope_id is None:
+                # Scopes of older corpus generations are dropped, so their rows (live or not)
+                # count as free below and are overwritten before any current-generation row.
+                live_scopes = set(index.scope_ids[self._live(index, now)].tolist())
+                index.scopes = {s: i for s, i in index.scopes.items() if i in live_scopes and s[0] >= scope[0]}
+                scope_id = index.next_scope_id
+                index.next_scope_id += 1
+                index.scopes[scope] = scope_id
+            free = np.flatnonzero(~self._live(index, now) | ~np.isin(index.scope_ids, list(index.scopes.values())))
+            if free.size:
+                slot = int(free[0])
+            elif index.capacity < self.max_entries:
+                slot = index.capacity
+                index.grow(min(self.max_entries, index.capacity * 2))
+            else:
+                slot = int(np.argmin(index.last_used))
+            self._tick += 1
+            index.vectors[slot] = vector
+            index.valid[slot] = True
+            index.scope_ids[slot] = scope_id
+            index.stored_at[slot] = now
+            index.last_used[slot] = self._tick
+            index.values[slot] = value
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "tenants": len(self._tenants),
+                "entries": sum(int(index.valid.sum()) for index in self._tenants.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tenants.clear()
+            self.hits = 0
+            self.misses = 0
@@ -2,6 +2,8 @@ import math
 import time
 from collections import Counter
 
+import numpy as np
+
 from app.core.config import settings
 
 
@@ -25,6 +27,17 @@ def vector_score(query_embedding: list[float], embedding: list[float]) -> float:
     return dot / (nq * nd)
 
 
+def cosine_matrix(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every row of ``left`` against every row of ``right``."""
+    left = np.asarray(left, dtype=np.float32)
+    right = np.asarray(right, dtype=np.float32)
+    left_norm = np.linalg.norm(left, axis=1, keepdims=True)
+    right_norm = np.linalg.norm(right, axis=1, keepdims=True)
+    left = np.divide(left, left_norm, out=np.zeros_like(left), where=left_norm > 0)
+    right = np.divide(right, right_norm, out=np.zeros_like(right), where=right_norm > 0)
+    return left @ right.T
+
+
 def min_max_normalize(values: list[float]) -> list[float]:
     if not values:
         return []
@@ -35,13 +48,85 @@ def min_max_normalize(values: list[float]) -> list[float]:
     return [(v - min_v) / (max_v - min_v) for v in values]
 
 
+def _min_max_normalize_array(values: np.ndarray) -> np.ndarray:
+    if values.size == 0:
+        return values
+    min_v = float(values.min())
+    max_v = float(values.max())
+    if max_v == min_v:
+        return np.ones_like(values)
+    return (values - min_v) / (max_v - min_v)
+
+
 def sigmoid_scale(value: float) -> float:
     return 1.0 / (1.0 + math.exp(-value))
 
 
-def _normalize_similarity_01(value: float) -> float:
-    clipped = max(-1.0, min(1.0, float(value)))
-    return (clipped + 1.0) / 2.0
+def _normalize_similarity_01(values: np.ndarray) -> np.ndarray:
+    return (np.clip(values, -1.0, 1.0) + 1.0) / 2.0
+
+
+class VectorScoringEngine:
+    """Batched cosine scoring of candidates against one query embedding.
+
+    Embeddings of not-yet-scored candidates are stacked into a float32 block and scored
+    with one matrix-vector product. Candidates hydrated without an embedding reuse the
+    SQL-computed ``vec_cosine`` instead. Scores are memoized by chunk_id, so the second
+    ``hybrid_rank`` pass after rerank reuses them instead of re-scoring.
+    """
+
+    def __init__(self, query_embedding: list[float]):
+        self.query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        self.query_norm = float(np.linalg.norm(self.query))
+        self._rows: dict[str, int] = {}
+        self._scores = np.empty(0, dtype=np.float32)
+
+    def _append(self, candidates: list[dict]) -> None:
+        pending: dict[str, object] = {}
+        precomputed: dict[str, float] = {}
+        for c in candidates:
+            chunk_id = str(c.get("chunk_id"))
+            if chunk_id in self._rows or chunk_id in pending or chunk_id in precomputed:
+                continue
+            embedding = c.get("embedding")
+            if embedding is None:
+                precomputed[chunk_id] = float(c.get("vec_cosine", 0.0))
+            else:
+                pending[chunk_id] = embedding
+        if precomputed:
+            offset = len(self._scores)
+            for row, chunk_id in enumerate(precomputed):
+                self._rows[chunk_id] = offset + row
+            self._scores = np.concatenate([self._scores, np.fromiter(precomputed.values(), dtype=np.float32, count=len(precomputed))])
+        if not pending:
+            return
+
+        dim = self.query.shape[0]
+        block = np.zeros((len(pending), dim), dtype=np.float32)
+        norms = np.empty(len(pending), dtype=np.float32)
+        for row, embedding in enumerate(pending.values()):
+            values = np.asarray(embedding, dtype=np.float32).ravel()
+            # Mirror vector_score for ragged/foreign-dimension rows: the dot product runs
+            # over the shared prefix (zip), but the norm is taken over the full row.
+            width = min(dim, values.shape[0])
+            block[row, :width] = values[:width]
+            norms[row] = np.linalg.norm(values)
+
+        dots = block @ self.query
+        denom = norms * self.query_norm
+        scores = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+        offset = len(self._scores)
+        for row, chunk_id in enumerate(pending):
+            self._rows[chunk_id] = offset + row
+        self._scores = np.concatenate([self._scores, scores])
+
+    def cosine_scores(self, candidates: list[dict]) -> np.ndarray:
+        if not candidates:
+            return np.empty(0, dtype=np.float32)
+        self._append(candidates)
+        index = np.fromiter((self._rows[str(c.get("chunk_id"))] for c in candidates), dtype=np.intp, count=len(candidates))
+        return self._scores[index]
 
 
 def _dedup_by_chunk_id(candidates: list[dict]) -> list[dict]:
@@ -67,47 +152,60 @@ def hybrid_rank(
     candidates: list[dict],
     query_embedding: list[float],
     normalize_scores: bool = False,
+    scoring_engine: VectorScoringEngine | None = None,
 ) -> tuple[list[dict], dict[str, int]]:
     timer = {}
     t0 = time.perf_counter()
     candidates = _dedup_by_chunk_id(candidates)
 
-    for c in candidates:
-        lex = c.get("lex_score", lexical_score(query, c["chunk_text"]))
-        c["lex_score"] = float(lex)
-        c["lex_raw"] = float(lex)
+    lex_raws = np.empty(len(candidates), dtype=np.float64)
+    for idx, c in enumerate(candidates):
+        lex = c["lex_score"] if "lex_score" in c else lexical_score(query, c["chunk_text"])
+        lex_raws[idx] = float(lex)
     timer["t_lexical_ms"] = int((time.perf_counter() - t0) * 1000)
 
     t1 = time.perf_counter()
-    for c in candidates:
-        computed = vector_score(query_embedding, c["embedding"])
-        vec = max(float(c.get("vec_score", 0.0)), computed)
-        c["vec_score"] = float(vec)
-        c["vec_raw"] = float(vec)
+    engine = scoring_engine if scoring_engine is not None else VectorScoringEngine(query_embedding)
+    computed = engine.cosine_scores(candidates).astype(np.float64)
+    prior = np.fromiter((float(c.get("vec_score", 0.0)) for c in candidates), dtype=np.float64, count=len(candidates))
+    vec_raws = np.maximum(prior, computed)
     timer["t_vector_ms"] = int((time.perf_counter() - t1) * 1000)
 
     # R6: keep both channels normalized into [0,1] for deterministic weighted merge.
-    fts_raws = [max(0.0, float(c.get("lex_raw", 0.0))) for c in candidates]
-    vec_raws = [_normalize_similarity_01(float(c.get("vec_raw", 0.0))) for c in candidates]
-    lex_norms = min_max_normalize(fts_raws)
-    vec_norms = min_max_normalize(vec_raws)
-    rerank_raws = [float(c.get("rerank_score", 0.0)) for c in candidates]
-    rerank_norms = min_max_normalize(rerank_raws) if normalize_scores else rerank_raws
+    lex_norms = np.clip(_min_max_normalize_array(np.maximum(lex_raws, 0.0)), 0.0, 1.0)
+    vec_norms = np.clip(_min_max_normalize_array(_normalize_similarity_01(vec_raws)), 0.0, 1.0)
+    rerank_raws = np.fromiter((float(c.get("rerank_score", 0.0)) for c in candidates), dtype=np.float64, count=len(candidates))
+    rerank_norms = _min_max_normalize_array(rerank_raws) if normalize_scores else rerank_raws
 
     weight_vec = float(settings.HYBRID_W_VECTOR)
     weight_fts = float(settings.HYBRID_W_FTS)
+    hybrid_scores = (weight_vec * vec_norms) + (weight_fts * lex_norms)
 
-    for c, lex_norm, vec_norm, rerank_raw, rerank_norm in zip(candidates, lex_norms, vec_norms, rerank_raws, rerank_norms):
+    rows = zip(
+        candidates,
+        lex_raws.tolist(),
+        vec_raws.tolist(),
+        lex_norms.tolist(),
+        vec_norms.tolist(),
+        rerank_raws.tolist(),
+        rerank_norms.tolist(),
+        hybrid_scores.tolist(),
+    )
+    for c, lex_raw, vec_raw, lex_norm, vec_norm, rerank_raw, rerank_norm, hybrid_score in rows:
         boost = 0.05 if c.get("author") else 0.0
         c["boosts_applied"] = [{"name": "author_presence", "value": boost, "reason": "document has author"}] if boost else []
 
-        c["lex_norm"] = float(max(0.0, min(1.0, lex_norm)))
-        c["vec_norm"] = float(max(0.0, min(1.0, vec_norm)))
-        c["rerank_raw"] = float(rerank_raw)
-        c["rerank_norm"] = float(rerank_norm)
-
-        c["hybrid_score"] = (weight_vec * c["vec_norm"]) + (weight_fts * c["lex_norm"])
-        c["final_score"] = c["hybrid_score"]
+        c["lex_score"] = lex_raw
+        c["lex_raw"] = lex_raw
+        c["vec_score"] = vec_raw
+        c["vec_raw"] = vec_raw
+        c["lex_norm"] = lex_norm
+        c["vec_norm"] = vec_norm
+        c["rerank_raw"] = rerank_raw
+        c["rerank_norm"] = rerank_norm
+
+        c["hybrid_score"] = hybrid_score
+        c["final_score"] = hybrid_score
 
     ranked = sorted(
         candidates,
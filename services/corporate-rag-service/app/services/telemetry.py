@@ -1,25 +1,192 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import math
+import re
+import threading
+from collections import deque
+from typing import Any
+
+import numpy as np
 
 from app.core.logging import log_event
 
-_METRICS: dict[str, list[float]] = defaultdict(list)
+WINDOW_SIZE = 1024
+MAX_SERIES_PER_METRIC = 512
+SUMMARY_QUANTILES = (0.5, 0.9, 0.99)
+_OVERFLOW_LABELS = (("label_overflow", "true"),)
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_:]")
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _Series:
+    __slots__ = ("count", "sum", "latest", "window")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.latest: float | None = None
+        self.window: deque[float] = deque(maxlen=WINDOW_SIZE)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.latest = value
+        self.window.append(value)
+
+
+class MetricsRegistry:
+    """Bounded in-process metrics: summaries, counters and gauges keyed by name and labels.
+
+    Summaries keep running ``count``/``sum``/``latest`` plus a ring buffer of the last
+    ``WINDOW_SIZE`` observations, from which quantiles are computed at scrape time, so memory
+    per series is constant no matter how long the process runs. Each metric holds at most
+    ``MAX_SERIES_PER_METRIC`` label sets; further label sets fold into one
+    ``label_overflow="true"`` series.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._summaries: dict[str, dict[Labels, _Series]] = {}
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {}
+
+    @staticmethod
+    def _labels(labels: dict[str, Any] | None) -> Labels:
+        return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+    @staticmethod
+    def _slot(family: dict[Labels, Any], key: Labels) -> Labels:
+        if key in family or len(family) < MAX_SERIES_PER_METRIC:
+            return key
+        return _OVERFLOW_LABELS
+
+    def observe(self, name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            family = self._summaries.setdefault(name, {})
+            key = self._slot(family, self._labels(labels))
+            series = family.get(key)
+            if series is None:
+                series = family[key] = _Series()
+            series.observe(float(value))
+
+    def inc(self, name: str, amount: float = 1.0, labels: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            key = self._slot(family, self._labels(labels))
+            family[key] = family.get(key, 0.0) + float(amount)
+
+    def set(self, name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+        with self._lock:
+            family = self._gauges.setdefault(name, {})
+            family[self._slot(family, self._labels(labels))] = float(value)
+
+    def samples(self, name: str, labels: dict[str, Any] | None = None) -> list[float]:
+        with self._lock:
+            series = self._summaries.get(name, {}).get(self._labels(labels))
+            return list(series.window) if series is not None else []
+
+    def counter(self, name: str, labels: dict[str, Any] | None = None) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(self._labels(labels), 0.0)
+
+    def summary(self, name: str) -> dict[str, Any]:
+        """Aggregate of every label set of ``name``: count, sum and the latest unlabeled value."""
+        with self._lock:
+            family = self._summaries.get(name, {})
+            count = sum(series.count for series in family.values())
+            total = sum(series.sum for series in family.values())
+            unlabeled = family.get(())
+            latest = unlabeled.latest if unlabeled is not None else None
+        return {"count": count, "sum": total, "latest": latest}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._summaries.clear()
+            self._counters.clear()
+            self._gauges.clear()
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            summaries = {name: {key: (s.count, s.sum, list(s.window)) for key, s in family.items()} for name, family in self._summaries.items()}
+            counters = {name: dict(family) for name, family in self._counters.items()}
+            gauges = {name: dict(family) for name, family in self._gauges.items()}
+        lines: list[str] = []
+        for name in sorted(summaries):
+            metric = _metric_name(name)
+            lines.append(f"# TYPE {metric} summary")
+            for key, (count, total, window) in sorted(summaries[name].items()):
+                if window:
+                    values = np.quantile(np.asarray(window, dtype=np.float64), SUMMARY_QUANTILES)
+                    for q, v in zip(SUMMARY_QUANTILES, values):
+                        lines.append(f"{metric}{_format_labels(key + (('quantile', str(q)),))} {_format_value(float(v))}")
+                lines.append(f"{metric}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{metric}_count{_format_labels(key)} {count}")
+        for kind, families, suffix in (("counter", counters, "_total"), ("gauge", gauges, "")):
+            for name in sorted(families):
+                metric = _metric_name(name)
+                if suffix and not metric.endswith(suffix):
+                    metric += suffix
+                lines.append(f"# TYPE {metric} {kind}")
+                for key, value in sorted(families[name].items()):
+                    lines.append(f"{metric}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name: str) -> str:
+    cleaned = _NAME_RE.sub("_", name)
+    return cleaned if not cleaned[:1].isdigit() else f"_{cleaned}"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels:
+        escaped = value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{_metric_name(key)}="{escaped}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+REGISTRY = MetricsRegistry()
+
+
+def emit_metric(name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+    REGISTRY.observe(name, value, labels)
+
+
+def increment_counter(name: str, amount: float = 1.0, labels: dict[str, Any] | None = None) -> None:
+    REGISTRY.inc(name, amount, labels)
+
+
+def set_gauge(name: str, value: float, labels: dict[str, Any] | None = None) -> None:
+    REGISTRY.set(name, value, labels)
 
 
-def emit_metric(name: str, value: float) -> None:
-    _METRICS[name].append(float(value))
+def metric_samples(name: str, labels: dict[str, Any] | None = None) -> list[float]:
+    """Most recent observations (at most ``WINDOW_SIZE``) of one series."""
+    return REGISTRY.samples(name, labels)
 
 
-def metric_samples(name: str) -> list[float]:
-    return list(_METRICS.get(name, []))
+def counter_value(name: str, labels: dict[str, Any] | None = None) -> float:
+    return REGISTRY.counter(name, labels)
 
 
 def reset_metrics() -> None:
-    _METRICS.clear()
+    REGISTRY.reset()
 
 
-def log_stage_latency(*, stage: str, latency_ms: int, model_id: str, request_id: str) -> None:
+def log_stage_latency(*, stage: str, latency_ms: int, model_id: str, request_id: str, tenant_id: str | None = None) -> None:
+    labels = {"stage": stage} if tenant_id is None else {"stage": stage, "tenant_id": tenant_id}
+    REGISTRY.observe("rag_stage_latency_ms", float(latency_ms), labels)
     log_event(
         "rag.stage.latency",
         payload={
@@ -1,21 +1,37 @@
-"""Token estimation utilities used by chunking.
+"""Token estimation utilities used by chunking and context budgeting.
 
-The default estimator remains ``split`` for backwards-compatible runtime behavior.
+The default chunking estimator remains ``split`` for backwards-compatible runtime behavior.
 Set ``TOKEN_ESTIMATOR=tiktoken`` to use tiktoken when installed.
+
+``llm_token_count`` is the LLM-side count stored per chunk at ingestion
+(``chunks.llm_token_count``) together with ``llm_tokenizer_id()`` so the query-time
+budget can trust stored counts only when they came from the tokenizer in use.
 """
 
+from functools import lru_cache
+
+LLM_TOKEN_ENCODING = "cl100k_base"
+WORD_ESTIMATE_TOKENIZER_ID = "words_x1.33"
+
 
 def split_token_count(text: str) -> int:
     return len([t for t in text.split() if t])
 
 
-def tiktoken_token_count(text: str) -> int:
+@lru_cache(maxsize=1)
+def llm_encoding():
+    """The tiktoken encoding used for LLM-side counts, or ``None`` when tiktoken is missing."""
     try:
         import tiktoken
     except Exception:  # noqa: BLE001
-        return split_token_count(text)
+        return None
+    return tiktoken.get_encoding(LLM_TOKEN_ENCODING)
+
 
-    enc = tiktoken.get_encoding("cl100k_base")
+def tiktoken_token_count(text: str) -> int:
+    enc = llm_encoding()
+    if enc is None:
+        return split_token_count(text)
     return len(enc.encode(text))
 
 
@@ -23,3 +39,14 @@ def token_count(text: str, *, estimator: str = "split") -> int:
     if estimator == "tiktoken":
         return tiktoken_token_count(text)
     return split_token_count(text)
+
+
+def llm_tokenizer_id() -> str:
+    return f"tiktoken:{LLM_TOKEN_ENCODING}" if llm_encoding() is not None else WORD_ESTIMATE_TOKENIZER_ID
+
+
+def llm_token_count(text: str) -> int:
+    enc = llm_encoding()
+    if enc is not None:
+        return len(enc.encode(text))
+    return int(max(1, round(split_token_count(text) * 1.33)))
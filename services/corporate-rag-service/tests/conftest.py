@@ -1,6 +1,17 @@
 from pathlib import Path
 import sys
 
+import pytest
+
 SERVICE_ROOT = Path(__file__).resolve().parents[1]
 if str(SERVICE_ROOT) not in sys.path:
     sys.path.insert(0, str(SERVICE_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _reset_http_pool():
+    from app.clients.http_pool import close_http_clients
+
+    close_http_clients()
+    yield
+    close_http_clients()
@@ -12,11 +12,12 @@ class SeededRepo:
         self.docs = docs
         self.links = {}
 
-    def fetch_document_neighbors(self, document_id: str, anchor_chunk_id: str, window: int = 1):
-        chunks = self.docs[document_id]
-        anchor = next(c for c in chunks if c["chunk_id"] == anchor_chunk_id)
-        lo, hi = anchor["ordinal"] - window, anchor["ordinal"] + window
-        return [c for c in chunks if lo <= c["ordinal"] <= hi]
+    def fetch_neighbor_windows(self, windows, include_embeddings: bool = True):
+        _ = include_embeddings
+        return [
+            [c for c in self.docs[document_id] if ordinal - window <= c["ordinal"] <= ordinal + window]
+            for document_id, ordinal, window in windows
+        ]
 
     def fetch_outgoing_linked_documents(self, document_ids: list[str], max_docs: int):
         out = []
@@ -36,8 +36,8 @@ class FakeDb:
             return FakeResult(rows)
 
         if "INSERT INTO chunk_vectors" in stmt:
-            self.vectorized_chunk_ids.add(payload["chunk_id"])
-            self.upsert_count += 1
+            self.vectorized_chunk_ids.update(payload["chunk_id"])
+            self.upsert_count += len(payload["chunk_id"])
             return FakeResult()
 
         return FakeResult()
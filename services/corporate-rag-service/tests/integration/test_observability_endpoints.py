@@ -114,3 +114,28 @@ def test_v1_ready_returns_degraded_on_failed_model(monkeypatch):
     assert body["status"] == "degraded"
     assert body["checks"]["model"]["ok"] is False
     assert "model probe failed" in body["checks"]["model"]["detail"]
+
+
+def test_metrics_prometheus_exposition_with_stage_labels():
+    from app.services.telemetry import increment_counter, log_stage_latency
+
+    reset_metrics()
+    emit_metric("token_usage", 10)
+    emit_metric("token_usage", 30)
+    log_stage_latency(stage="retrieval_agent", latency_ms=12, model_id="m", request_id="r1", tenant_id="t1")
+    increment_counter("audit_events_written", 3)
+
+    client = TestClient(app)
+    response = client.get("/metrics", headers={"Accept": "text/plain;version=0.0.4"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert "# TYPE token_usage summary" in body
+    assert 'token_usage{quantile="0.5"} 20.0' in body
+    assert "token_usage_sum 40.0" in body
+    assert "token_usage_count 2" in body
+    assert 'rag_stage_latency_ms_count{stage="retrieval_agent",tenant_id="t1"} 1' in body
+    assert "audit_events_written_total 3.0" in body
+
+    assert client.get("/metrics").json()["metrics"]["token_usage"]["count"] == 2
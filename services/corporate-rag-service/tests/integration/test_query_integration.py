@@ -1374,3 +1374,216 @@ def test_clarification_rate_metric_reflects_pipeline_clarification(monkeypatch):
     assert response.json()["answer"] == "Уточните, пожалуйста"
     assert any(name == "clarification_rate" and float(value) == 1.0 for name, value in metric_calls)
     assert any(name == "coverage_ratio" and float(value) == 0.0 for name, value in metric_calls)
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for frame in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_query_stream_emits_tokens_then_final_response(monkeypatch):
+    from app.api import routes
+    from app.schemas.api import QueryResponse
+
+    def fake_run_query(payload, _db, *_headers, on_token=None):
+        for delta in ['{"status":"success","ans', 'wer":"Vaca', 'tion 28 days"}']:
+            on_token(delta)
+        return QueryResponse(answer="Vacation 28 days", only_sources_verdict="PASS", citations=[], correlation_id=uuid.uuid4())
+
+    monkeypatch.setattr(routes, "_run_query", fake_run_query)
+    app.dependency_overrides[get_db] = override_db_with_rows([])
+    client = TestClient(app)
+    response = client.post("/v1/query/stream", json={"tenant_id": "11111111-1111-1111-1111-111111111111", "query": "vacation", "top_k": 1})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(response.text)
+    assert "".join(data["delta"] for name, data in events if name == "token") == "Vacation 28 days"
+    assert events[-1][0] == "final"
+    assert events[-1][1]["only_sources_verdict"] == "PASS"
+
+
+def test_query_stream_keeps_http_status_for_early_errors(monkeypatch):
+    from app.api import routes
+
+    def rejecting_run_query(_payload, _db, *_headers, on_token=None):
+        raise routes.HTTPException(status_code=429, detail="Too many requests")
+
+    monkeypatch.setattr(routes, "_run_query", rejecting_run_query)
+    app.dependency_overrides[get_db] = override_db_with_rows([])
+    client = TestClient(app)
+    response = client.post("/v1/query/stream", json={"tenant_id": "11111111-1111-1111-1111-111111111111", "query": "x", "top_k": 1})
+
+    assert response.status_code == 429
+    assert response.json()["detail"] == "Too many requests"
+
+
+class _TrackedSession:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_query_stream_worker_uses_own_session_not_request_session(monkeypatch):
+    from app.api import routes
+    from app.schemas.api import QueryResponse
+
+    request_holder = {}
+    worker_sessions = []
+    seen = {}
+
+    def session_factory():
+        worker_sessions.append(_TrackedSession())
+        return worker_sessions[-1]
+
+    def fake_run_query(_payload, db, *_headers, on_token=None):
+        seen["db"] = db
+        return QueryResponse(answer="ok", only_sources_verdict="PASS", citations=[], correlation_id=uuid.uuid4())
+
+    monkeypatch.setattr(routes, "_run_query", fake_run_query)
+    monkeypatch.setattr(routes, "SessionLocal", session_factory)
+    app.dependency_overrides[get_db] = override_db_with_rows([], holder=request_holder)
+    client = TestClient(app)
+    response = client.post("/v1/query/stream", json={"tenant_id": "11111111-1111-1111-1111-111111111111", "query": "vacation", "top_k": 1})
+
+    assert response.status_code == 200
+    assert seen["db"] is worker_sessions[0]
+    assert seen["db"] is not request_holder.get("db")
+    assert worker_sessions[0].closed
+
+
+def test_query_stream_client_disconnect_stops_worker(monkeypatch):
+    import asyncio
+    import threading
+
+    from app.api import routes
+    from app.schemas.api import QueryRequest
+
+    resume = threading.Event()
+    finished = threading.Event()
+    outcome = {"tokens_after_disconnect": 0}
+
+    def fake_run_query(_payload, _db, *_headers, on_token=None):
+        try:
+            on_token('{"status":"success","answer":"first')
+            resume.wait(5)
+            for _ in range(100):
+                on_token(" more")
+                outcome["tokens_after_disconnect"] += 1
+        except routes._StreamCancelled:
+            outcome["cancelled"] = True
+            raise
+        finally:
+            finished.set()
+
+    monkeypatch.setattr(routes, "_run_query", fake_run_query)
+    monkeypatch.setattr(routes, "SessionLocal", _TrackedSession)
+    response = routes.post_query_stream(
+        QueryRequest(tenant_id="11111111-1111-1111-1111-111111111111", query="vacation", top_k=1),
+        x_conversation_id=None,
+        x_client_turn_id=None,
+        x_user_id=None,
+        x_user_role=None,
+        x_debug_mode=None,
+        x_cache_bypass=None,
+    )
+
+    async def read_first_then_disconnect():
+        first = await response.body_iterator.__anext__()
+        await response.body_iterator.aclose()
+        return first
+
+    first = asyncio.run(read_first_then_disconnect())
+    resume.set()
+
+    assert "event: token" in (first.decode() if isinstance(first, bytes) else first)
+    assert finished.wait(5)
+    assert outcome.get("cancelled") is True
+    assert outcome["tokens_after_disconnect"] == 0
+
+
+def test_query_response_cache_hit_skips_pipeline_and_bypass_header_recomputes(monkeypatch):
+    from app.api import routes
+    from app.schemas.api import QueryResponse
+    from app.services.response_cache import QueryResponseCache
+
+    monkeypatch.setattr(routes.settings, "QUERY_RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(routes.settings, "USE_LLM_QUERY_REWRITE", False)
+    cache = QueryResponseCache()
+    key = ("11111111-1111-1111-1111-111111111111", 7, "vacation policy", "{}", "fp")
+    cached_corr = uuid.uuid4()
+    cache.put(key, QueryResponse(answer="28 days", only_sources_verdict="PASS", citations=[], correlation_id=cached_corr, trace={"trace_id": cached_corr, "scoring_trace": []}))
+    monkeypatch.setattr(routes, "get_query_response_cache", lambda: cache)
+    monkeypatch.setattr(routes, "_response_cache_key", lambda _db, _payload, resolved: key if resolved == "vacation policy" else None)
+
+    def pipeline_not_expected():
+        raise RuntimeError("pipeline executed")
+
+    monkeypatch.setattr(routes, "get_query_stage_executor", pipeline_not_expected)
+    app.dependency_overrides[get_db] = override_db_with_rows([])
+    client = TestClient(app)
+    body = {"tenant_id": "11111111-1111-1111-1111-111111111111", "query": "vacation policy", "top_k": 3}
+
+    headers = {"X-User-Id": f"cache-{uuid.uuid4()}"}
+    response = client.post("/v1/query", json=body, headers=headers)
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["answer"] == "28 days"
+    assert payload["correlation_id"] != str(cached_corr)
+    assert payload["trace"]["trace_id"] == payload["correlation_id"]
+    assert cache.stats()["hits"] == 1
+
+    with pytest.raises(RuntimeError, match="pipeline executed"):
+        client.post("/v1/query", json=body, headers={**headers, "X-Cache-Bypass": "true"})
+    assert cache.stats()["hits"] == 1
+
+
+def test_semantic_query_cache_reuses_paraphrase_answer_without_retrieval(monkeypatch):
+    from concurrent.futures import Future
+
+    from app.api import routes
+    from app.schemas.api import QueryResponse
+    from app.services.response_cache import SemanticQueryCache
+
+    monkeypatch.setattr(routes.settings, "QUERY_SEMANTIC_CACHE_ENABLED", True)
+    monkeypatch.setattr(routes.settings, "USE_LLM_QUERY_REWRITE", False)
+    monkeypatch.setattr(routes.settings, "QUERY_PARALLEL_LEXICAL_PREFETCH", False)
+    tenant_id = "11111111-1111-1111-1111-111111111111"
+    key = (tenant_id, 7, "vacation request process", "{}", "fp")
+    cache = SemanticQueryCache(similarity_threshold=0.9)
+    cached_corr = uuid.uuid4()
+    cache.put(tenant_id, (7, "{}", "fp"), [1.0, 0.0, 0.1], QueryResponse(answer="Submit form HR-7", only_sources_verdict="PASS", citations=[], correlation_id=cached_corr, trace={"trace_id": cached_corr, "scoring_trace": []}))
+    monkeypatch.setattr(routes, "get_semantic_query_cache", lambda: cache)
+    monkeypatch.setattr(routes, "_response_cache_key", lambda _db, _payload, _resolved: key)
+
+    class _Executor:
+        def submit(self, _fn, *_args, **_kwargs):
+            future: Future = Future()
+            future.set_result(([0.98, 0.05, 0.1], 3))
+            return future
+
+    def retrieval_not_expected(*_args, **_kwargs):
+        raise RuntimeError("retrieval executed")
+
+    monkeypatch.setattr(routes, "get_query_stage_executor", lambda: _Executor())
+    monkeypatch.setattr(routes, "_fetch_candidates", retrieval_not_expected)
+    app.dependency_overrides[get_db] = override_db_with_rows([])
+    client = TestClient(app)
+
+    response = client.post(
+        "/v1/query",
+        json={"tenant_id": tenant_id, "query": "how do I request vacation", "top_k": 3},
+        headers={"X-User-Id": f"semantic-{uuid.uuid4()}"},
+    )
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["answer"] == "Submit form HR-7"
+    assert payload["correlation_id"] != str(cached_corr)
+    assert cache.stats()["hits"] == 1
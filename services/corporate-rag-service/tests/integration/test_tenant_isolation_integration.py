@@ -16,17 +16,11 @@ def test_fetch_candidates_and_filtering_preserve_tenant_isolation(monkeypatch):
         def __init__(self, _db, tenant_id):
             self.tenant_id = tenant_id
 
-        def fetch_lexical_candidate_scores(self, _query, _top_n):
-            return {"chunk-a": 0.9, "chunk-b": 0.9}
-
-        def fetch_vector_candidates(self, _embedding, _top_n, use_similarity=False):
-            return [{"chunk_id": "chunk-a", "vec_score": 0.9}, {"chunk_id": "chunk-b", "vec_score": 0.9}]
-
-        def hydrate_candidates(self, _chunk_ids, lexical_scores, vector_score_map):
+        def fetch_hybrid_candidates(self, _query, _embedding, _lexical_top_n, _vector_top_n, use_similarity=False, include_embeddings=True, **_kwargs):
             return [
-                {"chunk_id": "chunk-a", "tenant_id": self.tenant_id, "lex_score": lexical_scores["chunk-a"], "vec_score": vector_score_map["chunk-a"], "chunk_text": "a", "embedding": [1.0]},
-                {"chunk_id": "chunk-b", "tenant_id": tenant_b, "lex_score": lexical_scores["chunk-b"], "vec_score": vector_score_map["chunk-b"], "chunk_text": "b", "embedding": [1.0]},
-            ]
+                {"chunk_id": "chunk-a", "tenant_id": self.tenant_id, "lex_score": 0.9, "vec_score": 0.9, "chunk_text": "a", "embedding": [1.0]},
+                {"chunk_id": "chunk-b", "tenant_id": tenant_b, "lex_score": 0.9, "vec_score": 0.9, "chunk_text": "b", "embedding": [1.0]},
+            ], 2, 2
 
     monkeypatch.setattr("app.api.routes.TenantRepository", FakeRepo)
 
@@ -98,9 +98,10 @@ def test_golden_neighbor_expectations_are_expandable():
 
         class _Repo:
             @staticmethod
-            def fetch_document_neighbors(document_id: str, anchor_chunk_id: str, window: int = 1):
-                if document_id == doc_id and anchor_chunk_id == anchor_id and window == 1:
-                    return [
+            def fetch_neighbor_windows(windows, include_embeddings: bool = True):
+                _ = include_embeddings
+                return [
+                    [
                         {
                             "chunk_id": anchor_id,
                             "document_id": doc_id,
@@ -122,7 +123,10 @@ def test_golden_neighbor_expectations_are_expandable():
                             "heading_path": ["section"],
                         },
                     ]
-                return []
+                    if (document_id, ordinal, window) == (doc_id, 2, 1)
+                    else []
+                    for document_id, ordinal, window in windows
+                ]
 
             @staticmethod
             def fetch_outgoing_linked_documents(_document_ids: list[str], _max_docs: int):
@@ -4,6 +4,8 @@ pytest.importorskip("sqlalchemy")
 
 import uuid
 
+import numpy as np
+
 from app.services.query_pipeline import apply_context_budget, expand_neighbors
 from app.services.retrieval import hybrid_rank, min_max_normalize
 from app.cli.fts_rebuild import weighted_fts_expression
@@ -266,3 +268,121 @@ def test_hybrid_rank_is_stable_across_repeated_runs(monkeypatch):
         if expected is None:
             expected = ordering
         assert ordering == expected
+
+
+def test_hybrid_candidates_single_statement_unions_fts_and_ann_with_tenant_filter():
+    captured = []
+    document_id = uuid.uuid4()
+
+    class FakeDB:
+        def execute(self, statement, params):
+            captured.append((str(statement), params))
+            return FakeExecResult([
+                {
+                    "chunk_id": "a",
+                    "document_id": document_id,
+                    "tenant_id": "11111111-1111-1111-1111-111111111111",
+                    "chunk_text": "alpha",
+                    "chunk_path": "Guide/Intro",
+                    "ordinal": 0,
+                    "title": "Guide",
+                    "url": None,
+                    "labels": '["hr"]',
+                    "author": None,
+                    "updated_date": None,
+                    "embedding": [1.0, 0.0],
+                    "lex_score": 0.4,
+                    "vec_score": None,
+                    "lexical_count": 3,
+                    "vector_count": 2,
+                }
+            ])
+
+    repo = TenantRepository(FakeDB(), "11111111-1111-1111-1111-111111111111")
+    candidates, lexical_count, vector_count = repo.fetch_hybrid_candidates("alpha", [1.0, 0.0], 5, 4, use_similarity=True)
+
+    assert len(captured) == 2
+    sql, params = captured[1]
+    assert "plainto_tsquery('simple', :query_text)" in sql
+    assert "ORDER BY cv.embedding <=> CAST(:qvec AS vector)" in sql
+    assert "UNION" in sql
+    assert "cv.tenant_id = CAST(:tenant_id AS uuid)" in sql
+    assert params["lexical_limit"] == 5 and params["vector_limit"] == 4
+    assert (lexical_count, vector_count) == (3, 2)
+    assert candidates[0]["heading_path"] == ["Guide", "Intro"]
+    assert candidates[0]["labels"] == ["hr"]
+    assert candidates[0]["vec_score"] == 0.0
+    assert candidates[0]["embedding"].dtype == np.float32
+    assert candidates[0]["embedding"].tolist() == [1.0, 0.0]
+
+
+def test_hybrid_candidates_apply_search_params_and_configured_operator():
+    captured = []
+
+    class FakeDB:
+        def execute(self, statement, params):
+            captured.append((str(statement), params))
+            return FakeExecResult([])
+
+    repo = TenantRepository(FakeDB(), "11111111-1111-1111-1111-111111111111")
+    repo.fetch_hybrid_candidates(
+        "alpha",
+        [1.0, 0.0],
+        5,
+        4,
+        use_similarity=True,
+        distance_metric="inner_product",
+        search_params={"hnsw.ef_search": 120, "ivfflat.probes": 8},
+    )
+
+    assert len(captured) == 2
+    set_sql, set_params = captured[0]
+    assert set_sql.count("set_config(") == 3 and ", true)" in set_sql
+    assert set_params == {
+        "name_0": "hnsw.ef_search",
+        "value_0": "120",
+        "name_1": "ivfflat.probes",
+        "value_1": "8",
+        "name_2": "plan_cache_mode",
+        "value_2": "force_custom_plan",
+    }
+    assert "ORDER BY cv.embedding <#> CAST(:qvec AS vector)" in captured[1][0]
+
+
+def test_hybrid_candidates_reuse_prefetched_lexical_hits():
+    captured = []
+
+    class FakeDB:
+        def execute(self, statement, params):
+            captured.append((str(statement), params))
+            if "unnest" in str(statement):
+                return FakeExecResult([])
+            return FakeExecResult([{"chunk_id": "c1", "lex_score": 0.7}, {"chunk_id": "c2", "lex_score": None}])
+
+    repo = TenantRepository(FakeDB(), "11111111-1111-1111-1111-111111111111")
+    hits = repo.fetch_lexical_hits("alpha", 5)
+    assert hits == [("c1", 0.7), ("c2", 0.0)]
+    assert "FROM chunk_fts cf" in captured[0][0] and captured[0][1]["lexical_limit"] == 5
+
+    assert repo.fetch_hybrid_candidates("alpha", [1.0, 0.0], 5, 4, use_similarity=True, lexical_hits=hits) == ([], 2, 0)
+    assert "plan_cache_mode" in captured[1][1].values()
+    sql, params = captured[2]
+    assert "FROM chunk_fts" not in sql
+    assert "unnest(CAST(:lex_ids AS uuid[])" in sql
+    assert params["lex_ids"] == ["c1", "c2"] and params["lex_scores"] == [0.7, 0.0]
+
+
+def test_hybrid_candidates_flag_off_uses_ordinal_vector_cte():
+    captured = {}
+
+    class FakeDB:
+        def execute(self, statement, params):
+            captured["sql"] = str(statement)
+            captured["params"] = params
+            return FakeExecResult([])
+
+    repo = TenantRepository(FakeDB(), "11111111-1111-1111-1111-111111111111")
+    assert repo.fetch_hybrid_candidates("alpha", [1.0, 0.0], 5, 4, use_similarity=False) == ([], 0, 0)
+    assert "ORDER BY c.ordinal ASC" in captured["sql"]
+    assert "<->" not in captured["sql"]
+    assert "<=>" in captured["sql"]
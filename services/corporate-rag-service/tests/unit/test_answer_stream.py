@@ -0,0 +1,32 @@
+from app.services.answer_stream import AnswerFieldExtractor, format_sse
+
+
+def test_extractor_emits_only_answer_text_across_split_deltas():
+    raw = '{"status":"success","answer":"Vacation is 28 \\"calendar\\" days\\nper year \\u2014 ok","citations":[{"chunk_id":"c1"}]}'
+    extractor = AnswerFieldExtractor()
+
+    streamed = "".join(extractor.feed(raw[i : i + 3]) for i in range(0, len(raw), 3))
+
+    assert streamed == 'Vacation is 28 "calendar" days\nper year — ok'
+    assert extractor.done
+    assert extractor.feed('"answer":"again"') == ""
+
+
+def test_extractor_ignores_refusal_payload_without_answer():
+    extractor = AnswerFieldExtractor()
+    assert extractor.feed('{"status":"insufficient_evidence","message":"no"}') == ""
+    assert not extractor.done
+
+
+def test_format_sse_frames_event_and_json_data():
+    assert format_sse("token", {"delta": "ok"}) == 'event: token\ndata: {"delta": "ok"}\n\n'
+
+
+def test_extractor_pairs_escaped_surrogates_into_encodable_text():
+    raw = '{"answer":"ok \\ud83d\\ude00 done, lone \\ud83d! and \\ude00"}'
+    extractor = AnswerFieldExtractor()
+
+    streamed = "".join(extractor.feed(ch) for ch in raw)
+
+    assert streamed == "ok \U0001F600 done, lone \ufffd! and \ufffd"
+    assert format_sse("token", {"delta": streamed}).encode("utf-8")
@@ -1,18 +1,20 @@
 import json
 
+import numpy as np
+
 from app.services import anti_hallucination
 from app.services.anti_hallucination import build_structured_refusal, verify_answer
 
 
 def test_anti_hallucination_passes_supported_sentence(monkeypatch):
-    monkeypatch.setattr(anti_hallucination, "_semantic_similarity", lambda *_args, **_kwargs: 1.0)
+    monkeypatch.setattr(anti_hallucination, "_semantic_similarity_matrix", lambda sentences, chunks, *_a: np.ones((len(sentences), len(chunks))))
     valid, payload = verify_answer("Security training is required.", ["Security training is required for all employees."], 0.1, 0.2)
     assert valid is True
     assert payload["refusal_triggered"] is False
 
 
 def test_anti_hallucination_rejects_unsupported_sentence(monkeypatch):
-    monkeypatch.setattr(anti_hallucination, "_semantic_similarity", lambda *_args, **_kwargs: 0.0)
+    monkeypatch.setattr(anti_hallucination, "_semantic_similarity_matrix", lambda sentences, chunks, *_a: np.zeros((len(sentences), len(chunks))))
     valid, payload = verify_answer("Mars colony is approved.", ["Security training is required for all employees."], 0.9, 0.9)
     assert valid is False
     assert payload["refusal_triggered"] is True
@@ -24,3 +26,48 @@ def test_structured_refusal_payload_is_json():
     body = json.loads(refusal)
     assert body["refusal"]["code"] == "ONLY_SOURCES_VIOLATION"
     assert body["refusal"]["correlation_id"] == "trace-1"
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        return np.asarray([[1.0, 0.0] if "vpn" in t.lower() else [0.0, 1.0] if "mars" in t.lower() else [0.0, -1.0] for t in texts])
+
+
+def test_semantic_check_encodes_sentences_and_chunks_in_one_batch(monkeypatch):
+    encoder = CountingEncoder()
+    monkeypatch.setattr(anti_hallucination, "_load_sentence_transformer", lambda _name: encoder)
+    answer = "Reconnect the VPN client. Then restart VPN. Mars colony is approved."
+    chunks = ["vpn reset guide", "holiday calendar", "expense policy"]
+
+    valid, payload = verify_answer(answer, chunks, 0.9, 0.99)
+
+    assert len(encoder.calls) == 1
+    assert len(encoder.calls[0]) == 3 + len(chunks)
+    assert valid is False
+    assert payload["unsupported_sentence_texts"] == ["Mars colony is approved."]
+
+
+def test_semantic_check_reuses_stored_chunk_embeddings(monkeypatch):
+    monkeypatch.setattr(anti_hallucination, "_load_sentence_transformer", lambda _name: (_ for _ in ()).throw(AssertionError("local model loaded")))
+    embedded = []
+
+    def embed_texts(sentences):
+        embedded.append(list(sentences))
+        return [[1.0, 0.0] for _ in sentences]
+
+    valid, payload = verify_answer(
+        "Remote access needs a token. Another unrelated claim.",
+        ["alpha", "beta"],
+        0.9,
+        0.99,
+        chunk_embeddings=[np.asarray([0.0, 1.0]), np.asarray([2.0, 0.0])],
+        embed_texts=embed_texts,
+    )
+
+    assert embedded == [["Remote access needs a token.", "Another unrelated claim."]]
+    assert valid is True
+    assert payload["unsupported_sentences"] == 0
@@ -0,0 +1,87 @@
+import threading
+
+from app.services.audit import AuditEventWriter
+from app.services.telemetry import counter_value, reset_metrics
+
+
+class RecordingSession:
+    def __init__(self, batches, gate=None, fail=False, poison=None):
+        self.batches = batches
+        self.gate = gate
+        self.fail = fail
+        self.poison = poison
+
+    def execute(self, _stmt, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.fail:
+            raise RuntimeError("db down")
+        if any(row["event_type"] == self.poison for row in rows):
+            raise ValueError("invalid event_type")
+        self.batches.append([row["event_type"] for row in rows])
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_events_are_written_in_multi_row_batches_and_flushed_on_close():
+    batches = []
+    writer = AuditEventWriter(lambda: RecordingSession(batches), batch_size=4, flush_interval_seconds=1.0)
+
+    for i in range(6):
+        assert writer.submit("t1", "c1", f"E{i}", {"i": i})
+    writer.close()
+
+    assert [event for batch in batches for event in batch] == [f"E{i}" for i in range(6)]
+    assert max(len(batch) for batch in batches) <= 4
+    assert len(batches) < 6
+    assert writer.stats()["written"] == 6
+
+    writer.submit("t1", "c1", "LATE", {})
+    assert batches[-1] == ["LATE"]
+
+
+def test_drop_policy_discards_events_when_buffer_is_full():
+    reset_metrics()
+    batches = []
+    gate = threading.Event()
+    writer = AuditEventWriter(lambda: RecordingSession(batches, gate=gate), max_buffer=1, batch_size=1, flush_interval_seconds=0, overflow_policy="drop")
+
+    results = [writer.submit("t1", "c1", f"E{i}", {}) for i in range(5)]
+    gate.set()
+    writer.close()
+
+    assert results.count(False) == writer.stats()["dropped"] >= 3
+    assert writer.stats()["written"] == results.count(True)
+    assert counter_value("audit_events_dropped") == results.count(False)
+
+
+def test_failed_flush_is_counted_and_does_not_raise():
+    writer = AuditEventWriter(lambda: RecordingSession([], fail=True), flush_interval_seconds=0)
+
+    writer.submit("t1", "c1", "E", {})
+    writer.close()
+
+    assert writer.stats()["failed"] == 1
+    assert writer.stats()["written"] == 0
+
+
+def test_poison_row_fails_alone_and_is_counted():
+    reset_metrics()
+    batches = []
+    writer = AuditEventWriter(lambda: RecordingSession(batches, poison="BAD"), batch_size=8, flush_interval_seconds=1.0)
+
+    for event_type in ["E0", "E1", "BAD", "E3", "E4"]:
+        writer.submit("t1", "c1", event_type, {})
+    writer.close()
+
+    assert sorted(event for batch in batches for event in batch) == ["E0", "E1", "E3", "E4"]
+    assert writer.stats()["written"] == 4
+    assert writer.stats()["failed"] == 1
+    assert counter_value("audit_events_failed") == 1
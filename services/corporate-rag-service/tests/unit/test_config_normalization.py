@@ -27,4 +27,25 @@ def test_conflicting_llm_aliases_are_rejected(monkeypatch):
     monkeypatch.setenv("LLM_MODEL", "new")
     monkeypatch.setenv("OLLAMA_MODEL", "old")
     with pytest.raises(ValueError, match="LLM_MODEL and OLLAMA_MODEL"):
-        Settings()
\ No newline at end of file
+        Settings()
+
+def test_vector_search_tenant_overrides_are_parsed_once_and_capped(monkeypatch):
+    cfg = Settings(VECTOR_SEARCH_TENANT_OVERRIDES='{"t1": {"ef_search": 200, "probes": 8}}')
+    assert cfg.vector_search_tenant_overrides == {"t1": {"ef_search": 200, "probes": 8}}
+
+    monkeypatch.setattr("app.core.config.json.loads", lambda _: pytest.fail("overrides re-parsed"))
+    assert cfg.vector_search_tenant_overrides is cfg.vector_search_tenant_overrides
+
+    monkeypatch.undo()
+    for raw in ('{"t1": {"ef_search": 5000}}', '{"t1": {"probes": "8"}}', '{"t1": {"probes": true}}'):
+        with pytest.raises(ValueError, match="VECTOR_SEARCH_TENANT_OVERRIDES"):
+            Settings(VECTOR_SEARCH_TENANT_OVERRIDES=raw)
+
+
+def test_connector_fetch_concurrency_overrides_are_validated_at_startup():
+    cfg = Settings(CONNECTOR_FETCH_CONCURRENCY_OVERRIDES="CONFLUENCE_PAGE=8, S3_CATALOG_OBJECT=2,")
+    assert cfg.connector_fetch_concurrency_overrides == {"CONFLUENCE_PAGE": 8, "S3_CATALOG_OBJECT": 2}
+
+    for raw in ("CONFLUENCE_PAGE=eight", "CONFLUENCE_PAGES=8", "S3_CATALOG_OBJECT=0", "bad"):
+        with pytest.raises(ValueError, match="CONNECTOR_FETCH_CONCURRENCY_OVERRIDES"):
+            Settings(CONNECTOR_FETCH_CONCURRENCY_OVERRIDES=raw)
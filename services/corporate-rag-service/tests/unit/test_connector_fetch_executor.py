@@ -0,0 +1,96 @@
+import threading
+import time
+
+from app.services.connectors.base import ConnectorError, ConnectorFetchResult, SourceDescriptor, SourceItem
+from app.services.connectors.fetch_executor import AdaptiveLimiter, ConnectorFetchExecutor, offloaded_conversion
+
+
+class FakeConnector:
+    source_type = "CONFLUENCE_PAGE"
+
+    def __init__(self, throttle_first: dict[str, int] | None = None, delays: dict[str, float] | None = None):
+        self.throttle_first = dict(throttle_first or {})
+        self.delays = delays or {}
+        self.calls: list[str] = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def fetch_item(self, tenant_id: str, descriptor: SourceDescriptor) -> ConnectorFetchResult:
+        ref = descriptor.external_ref
+        with self._lock:
+            self.calls.append(ref)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(ref, 0.0))
+            with self._lock:
+                remaining = self.throttle_first.get(ref, 0)
+                if remaining:
+                    self.throttle_first[ref] = remaining - 1
+                    return ConnectorFetchResult(error=ConnectorError("C-FETCH-FAILED", "rate limited", True, status_code=429))
+            return ConnectorFetchResult(item=SourceItem(source_type=self.source_type, external_ref=ref, title=ref, markdown=f"# {ref}"))
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def _descriptors(n: int) -> list[SourceDescriptor]:
+    return [SourceDescriptor(source_type="CONFLUENCE_PAGE", external_ref=f"page:{i}", title=f"p{i}") for i in range(n)]
+
+
+def test_fetch_all_yields_in_descriptor_order_with_bounded_concurrency():
+    descriptors = _descriptors(12)
+    connector = FakeConnector(delays={f"page:{i}": 0.02 * (12 - i) / 12 for i in range(12)})
+    executor = ConnectorFetchExecutor(concurrency=3, sleep_fn=lambda _: None)
+
+    results = list(executor.fetch_all(connector, "t1", descriptors))
+
+    assert [d.external_ref for d, _ in results] == [d.external_ref for d in descriptors]
+    assert [r.item.external_ref for _, r in results] == [d.external_ref for d in descriptors]
+    assert 1 < connector.max_active <= 3
+
+
+def test_throttled_fetch_is_retried_and_shrinks_limit():
+    descriptors = _descriptors(4)
+    connector = FakeConnector(throttle_first={"page:1": 2})
+    sleeps: list[float] = []
+    executor = ConnectorFetchExecutor(concurrency=4, throttle_retries=3, backoff_seconds=0.5, sleep_fn=sleeps.append)
+
+    results = dict((d.external_ref, r) for d, r in executor.fetch_all(connector, "t1", descriptors))
+
+    assert results["page:1"].item is not None
+    assert connector.calls.count("page:1") == 3
+    assert executor.throttled == 2
+    assert sleeps == [0.5, 1.0]
+    assert executor.limiter.limit == 1
+
+
+def test_throttle_retries_exhausted_returns_last_error():
+    connector = FakeConnector(throttle_first={"page:0": 5})
+    executor = ConnectorFetchExecutor(concurrency=1, throttle_retries=1, sleep_fn=lambda _: None)
+
+    [(_, result)] = list(executor.fetch_all(connector, "t1", _descriptors(1)))
+
+    assert result.error is not None and result.error.status_code == 429
+    assert connector.calls == ["page:0", "page:0"]
+
+
+def test_adaptive_limiter_recovers_after_successes():
+    limiter = AdaptiveLimiter(4, recovery_successes=2)
+    limiter.acquire()
+    limiter.release(throttled=True)
+    assert limiter.limit == 2
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(throttled=False)
+    assert limiter.limit == 4
+
+
+def test_offloaded_conversion_noop():
+    class WithIngestor:
+        file_ingestor = "original"
+
+    connector = WithIngestor()
+    with offloaded_conversion(connector, None):
+        assert connector.file_ingestor == "original"
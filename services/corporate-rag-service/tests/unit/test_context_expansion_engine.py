@@ -5,6 +5,7 @@ import pytest
 pytest.importorskip("pydantic")
 
 from app.services.context_expansion import ContextExpansionEngine
+from app.services.tokenizer import llm_tokenizer_id
 
 
 class FakeRepo:
@@ -13,8 +14,9 @@ class FakeRepo:
         self.linked_docs = []
         self.linked_chunks = {}
 
-    def fetch_document_neighbors(self, document_id: str, anchor_chunk_id: str, window: int = 1):
-        return list(self.neighbors.get((document_id, anchor_chunk_id, window), []))
+    def fetch_neighbor_windows(self, windows, include_embeddings: bool = True):
+        _ = include_embeddings
+        return [[dict(n) for n in self.neighbors.get((document_id, ordinal, window), [])] for document_id, ordinal, window in windows]
 
     def fetch_outgoing_linked_documents(self, document_ids: list[str], max_docs: int):
         _ = document_ids
@@ -34,6 +36,8 @@ def _cand(chunk_id: str, doc_id: str, ordinal: int, score: float, emb: list[floa
         "embedding": emb,
         "chunk_text": text,
         "token_count": 20,
+        "llm_token_count": 20,
+        "llm_tokenizer": llm_tokenizer_id(),
         "heading_path": ["h1"],
     }
 
@@ -42,7 +46,7 @@ def test_neighbor_expansion_adds_window_chunks(monkeypatch):
     repo = FakeRepo()
     doc_id = str(uuid.uuid4())
     anchor = _cand("a", doc_id, 2, 0.9, [1.0, 0.0], "anchor")
-    repo.neighbors[(doc_id, "a", 1)] = [_cand("n1", doc_id, 1, 0.1, [0.9, 0.0]), _cand("a", doc_id, 2, 0.9, [1.0, 0.0]), _cand("n2", doc_id, 3, 0.1, [0.8, 0.0])]
+    repo.neighbors[(doc_id, 2, 1)] = [_cand("n1", doc_id, 1, 0.1, [0.9, 0.0]), _cand("a", doc_id, 2, 0.9, [1.0, 0.0]), _cand("n2", doc_id, 3, 0.1, [0.8, 0.0])]
 
     monkeypatch.setattr("app.services.context_expansion.settings.CONTEXT_EXPANSION_TOPK_BASE", 8)
     monkeypatch.setattr("app.services.context_expansion.settings.CONTEXT_EXPANSION_TOPK_HARD_CAP", 20)
@@ -67,8 +71,8 @@ def test_doc_limit_and_extra_chunks_cap_enforced(monkeypatch):
     repo = FakeRepo()
     doc_a, doc_b = str(uuid.uuid4()), str(uuid.uuid4())
     base = [_cand("a1", doc_a, 1, 0.9, [1, 0]), _cand("b1", doc_b, 1, 0.8, [0, 1])]
-    repo.neighbors[(doc_a, "a1", 1)] = [_cand("a2", doc_a, 2, 0.2, [1, 0.1])]
-    repo.neighbors[(doc_b, "b1", 1)] = [_cand("b2", doc_b, 2, 0.2, [0.1, 1])]
+    repo.neighbors[(doc_a, 1, 1)] = [_cand("a2", doc_a, 2, 0.2, [1, 0.1])]
+    repo.neighbors[(doc_b, 1, 1)] = [_cand("b2", doc_b, 2, 0.2, [0.1, 1])]
 
     monkeypatch.setattr("app.services.context_expansion.settings.CONTEXT_EXPANSION_MAX_DOCS", 1)
     monkeypatch.setattr("app.services.context_expansion.settings.EXPAND_MAX_EXTRA_TOTAL", 1)
@@ -185,7 +189,7 @@ def test_neighbor_mode_adds_neighbors_without_links(monkeypatch):
     repo = FakeRepo()
     doc_a = str(uuid.uuid4())
     base = [_cand("a1", doc_a, 2, 0.9, [1, 0])]
-    repo.neighbors[(doc_a, "a1", 1)] = [_cand("a0", doc_a, 1, 0.1, [0.9, 0]), _cand("a2", doc_a, 3, 0.1, [0.8, 0.1])]
+    repo.neighbors[(doc_a, 2, 1)] = [_cand("a0", doc_a, 1, 0.1, [0.9, 0]), _cand("a2", doc_a, 3, 0.1, [0.8, 0.1])]
 
     monkeypatch.setattr("app.services.context_expansion.settings.EXPAND_NEIGHBORS_WINDOW", 1)
     monkeypatch.setattr("app.services.context_expansion.settings.EXPAND_MAX_EXTRA_TOTAL", 12)
@@ -206,7 +210,7 @@ def test_budget_stop_recorded_when_chunk_overflow(monkeypatch):
     repo = FakeRepo()
     doc = str(uuid.uuid4())
     big = _cand("big", doc, 1, 0.9, [1, 0], text="x" * 100)
-    big["token_count"] = 500
+    big["llm_token_count"] = 500
 
     monkeypatch.setattr("app.services.context_expansion.settings.CONTEXT_EXPANSION_MIN_GAIN", 0.0)
 
@@ -226,8 +230,8 @@ def test_doc_neighbor_per_doc_cap_and_metrics(monkeypatch):
     repo = FakeRepo()
     doc_a, doc_b = str(uuid.uuid4()), str(uuid.uuid4())
     base = [_cand("a1", doc_a, 2, 0.9, [1, 0]), _cand("b1", doc_b, 2, 0.8, [0, 1])]
-    repo.neighbors[(doc_a, "a1", 1)] = [_cand("a0", doc_a, 1, 0.2, [1, 0.1]), _cand("a2", doc_a, 3, 0.2, [1, 0.2])]
-    repo.neighbors[(doc_b, "b1", 1)] = [_cand("b0", doc_b, 1, 0.2, [0.1, 1]), _cand("b2", doc_b, 3, 0.2, [0.2, 1])]
+    repo.neighbors[(doc_a, 2, 1)] = [_cand("a0", doc_a, 1, 0.2, [1, 0.1]), _cand("a2", doc_a, 3, 0.2, [1, 0.2])]
+    repo.neighbors[(doc_b, 2, 1)] = [_cand("b0", doc_b, 1, 0.2, [0.1, 1]), _cand("b2", doc_b, 3, 0.2, [0.2, 1])]
 
     monkeypatch.setattr("app.services.context_expansion.settings.EXPAND_MAX_EXTRA_TOTAL", 3)
     monkeypatch.setattr("app.services.context_expansion.settings.EXPAND_MAX_EXTRA_PER_DOC", 1)
@@ -246,3 +250,54 @@ def test_doc_neighbor_per_doc_cap_and_metrics(monkeypatch):
     assert debug.expanded_total == 2
     assert debug.expanded_per_doc[doc_a] == 1
     assert debug.expanded_per_doc[doc_b] == 1
+
+
+def test_expansion_attaches_embeddings_for_candidates_hydrated_without_them(monkeypatch):
+    class LazyRepo(FakeRepo):
+        def __init__(self):
+            super().__init__()
+            self.attached = []
+
+        def attach_embeddings(self, candidates):
+            self.attached.extend(c["chunk_id"] for c in candidates if c.get("embedding") is None)
+            for c in candidates:
+                c.setdefault("embedding", [1.0, 0.0])
+            return len(self.attached)
+
+    repo = LazyRepo()
+    doc_id = str(uuid.uuid4())
+    anchor = _cand("a", doc_id, 1, 0.9, [1.0, 0.0])
+    del anchor["embedding"]
+
+    monkeypatch.setattr("app.services.context_expansion.settings.EXPAND_NEIGHBORS_WINDOW", 1)
+    selected, _ = ContextExpansionEngine(repo).expand(
+        final_query="q",
+        base_candidates=[anchor],
+        token_budget=200,
+        mode="doc_neighbor",
+        query_embedding=[1.0, 0.0],
+    )
+
+    assert repo.attached == ["a"]
+    assert selected[0]["embedding"] == [1.0, 0.0]
+
+
+def test_budget_select_is_incremental_mmr_over_similarity_matrix(monkeypatch):
+    monkeypatch.setattr("app.services.context_expansion.settings.CONTEXT_EXPANSION_REDUNDANCY_SIM_THRESHOLD", 0.5)
+    monkeypatch.setattr("app.services.context_expansion.settings.CONTEXT_EXPANSION_MIN_GAIN", 0.01)
+    doc = str(uuid.uuid4())
+    best = _cand("best", doc, 1, 0.9, [1.0, 0.0])
+    near_copy = {**_cand("near_copy", doc, 2, 0.8, [1.0, 0.05]), "heading_path": ["h2"]}
+    diverse = {**_cand("diverse", doc, 3, 0.6, [0.0, 1.0]), "heading_path": ["h3"]}
+
+    selected, debug = ContextExpansionEngine(FakeRepo()).expand(
+        final_query="q",
+        base_candidates=[best, near_copy, diverse],
+        token_budget=40,
+        mode="off",
+        query_embedding=[1.0, 0.0],
+    )
+
+    assert [c["chunk_id"] for c in selected] == ["best", "diverse"]
+    assert debug.final_context_token_estimate == 40
+    assert debug.context_selection_steps[-1] == "stop:budget:40+20>40"
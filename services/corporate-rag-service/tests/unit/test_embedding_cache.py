@@ -0,0 +1,91 @@
+import pytest
+
+from app.clients.embedding_cache import CachedEmbeddingsClient
+from app.services.telemetry import counter_value, reset_metrics
+
+
+class CountingEmbeddingsClient:
+    def __init__(self):
+        self.calls = []
+
+    def embed_text(self, text, tenant_id=None, correlation_id=None, model_id="bge-m3"):
+        self.calls.append((text, tenant_id, model_id))
+        return [float(len(text)), 1.0]
+
+    def embed_texts(self, texts, model_id="bge-m3", tenant_id=None, correlation_id=None):
+        self.calls.append((tuple(texts), tenant_id, model_id))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+def test_repeated_query_hits_cache_after_whitespace_normalization():
+    reset_metrics()
+    inner = CountingEmbeddingsClient()
+    cache = CachedEmbeddingsClient(inner)
+
+    first = cache.embed_text("how to  reset vpn", tenant_id="t1")
+    second = cache.embed_text("  how to reset vpn\n", tenant_id="t1", correlation_id="c2")
+
+    assert first == second
+    assert len(inner.calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert (counter_value("query_embedding_cache_hits"), counter_value("query_embedding_cache_misses")) == (1.0, 1.0)
+
+
+def test_tenant_isolation_and_model_are_part_of_key():
+    inner = CountingEmbeddingsClient()
+    cache = CachedEmbeddingsClient(inner, tenant_isolation=True)
+
+    cache.embed_text("q", tenant_id="t1")
+    cache.embed_text("q", tenant_id="t2")
+    cache.embed_text("q", tenant_id="t1", model_id="other")
+    assert len(inner.calls) == 3
+
+    shared = CachedEmbeddingsClient(CountingEmbeddingsClient(), tenant_isolation=False)
+    shared.embed_text("q", tenant_id="t1")
+    shared.embed_text("q", tenant_id="t2")
+    assert shared.stats()["hits"] == 1
+
+
+def test_ttl_expiry_and_lru_eviction():
+    now = [0.0]
+    inner = CountingEmbeddingsClient()
+    cache = CachedEmbeddingsClient(inner, max_entries=2, ttl_seconds=10, now_fn=lambda: now[0])
+
+    cache.embed_text("a")
+    cache.embed_text("b")
+    cache.embed_text("a")
+    cache.embed_text("c")
+    cache.embed_text("a")
+    assert cache.stats()["entries"] == 2
+    assert [call[0] for call in inner.calls] == ["a", "b", "c"]
+
+    cache.embed_text("b")
+    assert [call[0] for call in inner.calls][-1] == "b"
+
+    now[0] = 11.0
+    cache.embed_text("a")
+    assert [call[0] for call in inner.calls][-1] == "a"
+
+
+def test_embed_texts_fetches_only_misses_and_cached_vectors_are_copies():
+    inner = CountingEmbeddingsClient()
+    cache = CachedEmbeddingsClient(inner)
+
+    vector = cache.embed_text("x")
+    vector.append(99.0)
+    vectors = cache.embed_texts(["x", "yy"])
+
+    assert vectors == [[1.0, 1.0], [2.0, 1.0]]
+    assert inner.calls[-1] == (("yy",), None, "bge-m3")
+
+
+def test_embed_texts_raises_on_short_inner_response():
+    class ShortEmbeddingsClient:
+        def embed_texts(self, texts, model_id="bge-m3", tenant_id=None, correlation_id=None):
+            return [[1.0, 0.0] for _ in texts[:-1]]
+
+    cache = CachedEmbeddingsClient(ShortEmbeddingsClient())
+
+    with pytest.raises(RuntimeError):
+        cache.embed_texts(["a", "b"])
+    assert cache.stats()["entries"] == 0
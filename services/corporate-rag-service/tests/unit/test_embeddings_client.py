@@ -32,7 +32,7 @@ class FakeHttpxClient:
 def test_embed_texts_positive_batches_payload(monkeypatch):
     calls = []
 
-    monkeypatch.setattr("httpx.Client", lambda timeout: FakeHttpxClient(calls))
+    monkeypatch.setattr("httpx.Client", lambda timeout, **_kwargs: FakeHttpxClient(calls))
     client = EmbeddingsClient(base_url="http://emb", timeout_seconds=5)
     vectors = client.embed_texts(["a", "b"], model_id="m1", tenant_id="t1", correlation_id="c1")
 
@@ -47,8 +47,76 @@ def test_embed_text_negative_empty_data(monkeypatch):
         def post(self, url, json):
             return FakeResponse({"data": []})
 
-    monkeypatch.setattr("httpx.Client", lambda timeout: EmptyDataHttpxClient([]))
+    monkeypatch.setattr("httpx.Client", lambda timeout, **_kwargs: EmptyDataHttpxClient([]))
     client = EmbeddingsClient(base_url="http://emb", timeout_seconds=5)
 
     with pytest.raises(RuntimeError):
         client.embed_text("x")
+
+
+class FakeBinaryResponse:
+    def __init__(self, content, headers):
+        self.content = content
+        self.headers = headers
+
+    def raise_for_status(self):
+        return None
+
+
+def test_embed_matrix_decodes_base64_float32(monkeypatch):
+    import base64
+
+    import numpy as np
+
+    rows = [np.asarray([0.5, -1.0], dtype="<f4"), np.asarray([0.25, 2.0], dtype="<f4")]
+    body = {"data": [{"index": i, "embedding": base64.b64encode(r.tobytes()).decode("ascii")} for i, r in enumerate(rows)]}
+
+    class Base64HttpxClient(FakeHttpxClient):
+        def post(self, url, json):
+            self.recorder.append((url, json))
+            return FakeResponse(body)
+
+    calls = []
+    monkeypatch.setattr("httpx.Client", lambda timeout, **_kwargs: Base64HttpxClient(calls))
+    client = EmbeddingsClient(base_url="http://emb", timeout_seconds=5, encoding_format="base64")
+
+    matrix = client.embed_matrix(["a", "b"])
+    assert calls[0][1]["encoding_format"] == "base64"
+    assert matrix.dtype == np.dtype("<f4")
+    assert matrix.tolist() == [[0.5, -1.0], [0.25, 2.0]]
+    assert client.embed_texts(["a", "b"]) == [[0.5, -1.0], [0.25, 2.0]]
+
+
+def test_embed_matrix_decodes_binary_frame(monkeypatch):
+    import numpy as np
+
+    frame = np.asarray([[1.0, 0.0, -1.0]], dtype="<f4").tobytes()
+
+    class BinaryHttpxClient(FakeHttpxClient):
+        def post(self, url, json, headers=None):
+            self.recorder.append((url, json, headers))
+            return FakeBinaryResponse(frame, {"x-embedding-count": "1", "x-embedding-dim": "3"})
+
+    calls = []
+    monkeypatch.setattr("httpx.Client", lambda timeout, **_kwargs: BinaryHttpxClient(calls))
+    client = EmbeddingsClient(base_url="http://emb", timeout_seconds=5, encoding_format="binary")
+
+    assert client.embed_text("x") == [1.0, 0.0, -1.0]
+    assert calls[0][2] == {"Accept": "application/octet-stream"}
+
+
+def test_embed_matrix_negative_malformed_binary_frame(monkeypatch):
+    class BadFrameHttpxClient(FakeHttpxClient):
+        def post(self, url, json, headers=None):
+            return FakeBinaryResponse(b"\x00" * 8, {"x-embedding-count": "1", "x-embedding-dim": "3"})
+
+    monkeypatch.setattr("httpx.Client", lambda timeout, **_kwargs: BadFrameHttpxClient([]))
+    client = EmbeddingsClient(base_url="http://emb", timeout_seconds=5, encoding_format="binary")
+
+    with pytest.raises(RuntimeError):
+        client.embed_matrix(["x"])
+
+
+def test_unknown_encoding_format_rejected():
+    with pytest.raises(ValueError):
+        EmbeddingsClient(base_url="http://emb", timeout_seconds=5, encoding_format="fp16")
@@ -0,0 +1,116 @@
+from app.clients.embeddings_client import EmbeddingsClient
+from app.clients.http_pool import HttpClientPool, close_http_clients, get_http_client, http_pool_stats
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return {"data": [{"embedding": [0.1, 0.2]}]}
+
+
+class RecordingClient:
+    def __init__(self, created, **kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+        created.append(self)
+
+    def post(self, url, json):
+        return FakeResponse()
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_client_per_origin_and_applies_limits(monkeypatch):
+    created = []
+    monkeypatch.setattr("httpx.Client", lambda **kwargs: RecordingClient(created, **kwargs))
+
+    client = EmbeddingsClient(base_url="http://emb", timeout_seconds=5)
+    client.embed_texts(["a"])
+    client.embed_texts(["b"])
+    EmbeddingsClient(base_url="http://emb/", timeout_seconds=5).embed_texts(["c"])
+
+    assert len(created) == 1
+    assert created[0].kwargs["limits"].max_connections >= 1
+    assert created[0].kwargs["timeout"] == 5.0
+
+
+def test_pool_separates_clients_by_origin_and_headers(monkeypatch):
+    created = []
+    monkeypatch.setattr("httpx.Client", lambda **kwargs: RecordingClient(created, **kwargs))
+
+    a = get_http_client("http://conf/rest/api/content/search", timeout=30, headers={"Authorization": "Bearer x"})
+    b = get_http_client("http://conf/rest/api/content/1", timeout=30, headers={"Authorization": "Bearer x"})
+    c = get_http_client("http://conf/rest/api/content/1", timeout=30, headers={"Authorization": "Bearer y"})
+    d = get_http_client("http://files/download/1", timeout=30, headers={"Authorization": "Bearer x"})
+
+    assert a is b
+    assert len({id(a), id(c), id(d)}) == 3
+    assert created[0].kwargs["headers"] == {"Authorization": "Bearer x"}
+
+
+def test_close_releases_clients_and_reports_stats(monkeypatch):
+    created = []
+    monkeypatch.setattr("httpx.Client", lambda **kwargs: RecordingClient(created, **kwargs))
+
+    get_http_client("http://ollama.local/api/generate", timeout=5)
+    stats = http_pool_stats()
+    assert stats[0]["origin"] == "http://ollama.local"
+    assert stats[0]["requests"] == 0
+
+    close_http_clients()
+
+    assert created[0].closed is True
+    assert http_pool_stats() == []
+
+
+def test_real_client_pool_counts_requests_and_disables_http2_without_h2(monkeypatch):
+    import httpx
+
+    monkeypatch.setattr("app.clients.http_pool._http2_available", lambda: False)
+    pool = HttpClientPool()
+    client = pool.get("http://svc", timeout=5)
+    assert pool.stats()[0]["http2"] is False
+    assert pool.stats()[0]["max_connections"] >= 1
+    client._transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+    client.get("http://svc/health")
+    client.get("http://svc/health")
+
+    assert pool.stats()[0]["requests"] == 2
+    pool.close()
+
+
+def test_concurrent_responses_are_all_counted_and_utilization_sampled_on_demand(monkeypatch):
+    import threading
+
+    import httpx
+
+    from app.services.telemetry import metric_samples, reset_metrics
+
+    reset_metrics()
+    pool = HttpClientPool()
+    client = pool.get("http://svc", timeout=5)
+    client._transport = httpx.MockTransport(lambda request: httpx.Response(200, json={}))
+
+    def worker():
+        for _ in range(50):
+            client.get("http://svc/health")
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert pool.stats()[0]["requests"] == 400
+    assert metric_samples("http_pool_utilization") == []
+    pool.close()
+
+    idle = HttpClientPool()
+    idle.get("http://svc", timeout=5)
+    idle.sample_utilization()
+    assert metric_samples("http_pool_utilization") == [0.0]
+    idle.close()
@@ -89,16 +89,16 @@ class FakeDb:
             return FakeResult([{"chunk_id": chunk_id} for chunk_id in ids])
         if "INSERT INTO chunks" in stmt:
             document_id = payload.get("document_id")
-            chunk_id = payload.get("chunk_id")
-            self.chunks_by_document.setdefault(document_id, []).append(chunk_id)
-            self.chunk_texts[chunk_id] = payload.get("chunk_text", "")
+            for chunk_id, chunk_text in zip(payload.get("chunk_id", []), payload.get("chunk_text", [])):
+                self.chunks_by_document.setdefault(document_id, []).append(chunk_id)
+                self.chunk_texts[chunk_id] = chunk_text
             return FakeResult()
 
 
         if "FROM source_sync_state" in stmt and "SELECT" in stmt:
             if "external_ref" in stmt and payload.get("external_ref") is None:
                 rows = [
-                    {"external_ref": key[2]}
+                    dict(row)
                     for key, row in self.sync_state.items()
                     if key[0] == payload.get("tenant_id") and key[1] == payload.get("source_type")
                 ]
@@ -107,18 +107,10 @@ class FakeDb:
             row = self.sync_state.get(key)
             return FakeResult([] if row is None else [row])
         if "INSERT INTO source_sync_state" in stmt:
-            key = (payload.get("tenant_id"), payload.get("source_type"), payload.get("external_ref"))
-            self.sync_state[key] = {
-                "tenant_id": payload.get("tenant_id"),
-                "source_type": payload.get("source_type"),
-                "external_ref": payload.get("external_ref"),
-                "last_seen_modified_at": payload.get("last_seen_modified_at"),
-                "last_seen_checksum": payload.get("last_seen_checksum"),
-                "last_synced_at": payload.get("last_synced_at"),
-                "last_status": payload.get("last_status"),
-                "last_error_code": payload.get("last_error_code"),
-                "last_error_message": payload.get("last_error_message"),
-            }
+            columns = list(payload)
+            for values in zip(*(payload[c] for c in columns)):
+                row = dict(zip(columns, values))
+                self.sync_state[(row["tenant_id"], row["source_type"], row["external_ref"])] = row
             return FakeResult()
         if "SELECT c.chunk_id, c.chunk_path, c.chunk_text" in stmt and "LEFT JOIN chunk_vectors" in stmt:
             chunk_ids = payload.get("chunk_ids", [])
@@ -626,7 +618,7 @@ def test_file_upload_source_type_is_ingested_via_connector_registry(monkeypatch)
         return {"documents": 1, "chunks": 1, "cross_links": 0, "artifacts": 1}
 
     monkeypatch.setattr("app.services.ingestion.settings", FakeSettings())
-    monkeypatch.setattr("app.services.ingestion.SourceSyncStateRepository", lambda db: type("R", (), {"get_state": lambda *a: None, "list_external_refs": lambda *a: [], "mark_deleted": lambda *a, **k: None, "mark_failure": lambda *a, **k: None, "mark_success": lambda *a, **k: None})())
+    monkeypatch.setattr("app.services.ingestion.SourceSyncStateRepository", lambda db: type("R", (), {"load_states": lambda *a: {}, "flush": lambda *a: 0, "get_state": lambda *a: None, "list_external_refs": lambda *a: [], "mark_deleted": lambda *a, **k: None, "mark_failure": lambda *a, **k: None, "mark_success": lambda *a, **k: None})())
     monkeypatch.setattr("app.services.ingestion.ingest_source_items", fake_ingest_source_items)
 
     result = ingest_sources_sync(
@@ -641,6 +633,84 @@ def test_file_upload_source_type_is_ingested_via_connector_registry(monkeypatch)
     assert captured["raw_payloads"] == {"upload:1": b"hello"}
 
 
+def test_ingest_sources_sync_commits_micro_batches_bounded_by_items_and_bytes(monkeypatch):
+    from app.services.connectors.base import ConnectorFetchResult, ConnectorListResult, SourceDescriptor, SourceItem
+    from app.services.ingestion import ingest_sources_sync
+
+    payload_sizes = {"upload:0": 10, "upload:1": 10, "upload:2": 500, "upload:3": 10, "upload:4": 10}
+
+    class UploadConnector:
+        source_type = "FILE_UPLOAD_OBJECT"
+
+        def is_configured(self):
+            return True, None
+
+        def list_descriptors(self, tenant_id, sync_context):
+            descriptors = [SourceDescriptor(source_type=self.source_type, external_ref=ref, title=ref) for ref in payload_sizes]
+            return ConnectorListResult(descriptors=descriptors, listing_complete=True)
+
+        def fetch_item(self, tenant_id, descriptor):
+            item = SourceItem(source_type=self.source_type, external_ref=descriptor.external_ref, title=descriptor.title, markdown="x")
+            return ConnectorFetchResult(item=item, raw_payload=b"x" * payload_sizes[descriptor.external_ref])
+
+    class FakeRegistry:
+        def get(self, source_type):
+            return UploadConnector()
+
+    class FakeSettings:
+        CONNECTOR_REGISTRY_ENABLED = True
+        CONNECTOR_SYNC_MAX_ITEMS_PER_RUN = 5000
+        CONNECTOR_SYNC_PAGE_SIZE = 100
+        CONNECTOR_INCREMENTAL_ENABLED = True
+        CONNECTOR_SYNC_BATCH_ITEMS = 4
+        CONNECTOR_SYNC_BATCH_MAX_BYTES = 256
+
+    events = []
+
+    class FakeRepo:
+        def load_states(self, *a):
+            return {}
+
+        def flush(self):
+            events.append(("flush",))
+
+        def get_state(self, *a):
+            return None
+
+        def list_external_refs(self, *a):
+            return []
+
+        def mark_success(self, **kwargs):
+            events.append(("success", kwargs["external_ref"]))
+
+        def mark_failure(self, **kwargs):
+            events.append(("failure", kwargs["external_ref"]))
+
+        def mark_deleted(self, **kwargs):
+            events.append(("deleted", kwargs["external_ref"]))
+
+    def fake_ingest_source_items(db, tenant, items, storage=None, raw_payloads=None):
+        events.append(("ingest", [item.external_ref for item in items], sorted(raw_payloads)))
+        return {"documents": len(items), "chunks": len(items), "cross_links": 0, "artifacts": len(items)}
+
+    monkeypatch.setattr("app.services.ingestion.settings", FakeSettings())
+    monkeypatch.setattr("app.services.ingestion.SourceSyncStateRepository", lambda db: FakeRepo())
+    monkeypatch.setattr("app.services.ingestion.ingest_source_items", fake_ingest_source_items)
+
+    result = ingest_sources_sync(
+        db=object(),
+        tenant_id=uuid.UUID("11111111-1111-1111-1111-111111111111"),
+        source_types=["FILE_UPLOAD_OBJECT"],
+        connector_registry=FakeRegistry(),
+    )
+
+    batches = [event[1] for event in events if event[0] == "ingest"]
+    # upload:2 pushes the batch over the byte cap, upload:4 is flushed at the end of the source.
+    assert batches == [["upload:0", "upload:1", "upload:2"], ["upload:3", "upload:4"]]
+    assert events[:5] == [("success", "upload:0"), ("success", "upload:1"), ("success", "upload:2"), ("flush",), ("ingest", batches[0], batches[0])]
+    assert result == {"documents": 5, "chunks": 5, "cross_links": 0, "artifacts": 5}
+
+
 def test_should_fetch_positive_and_negative():
     from datetime import datetime, timezone
 
@@ -934,6 +1004,12 @@ def test_sp1_skip_tombstone_when_descriptor_listing_hits_cap(monkeypatch, caplog
         def __init__(self, _db):
             pass
 
+        def load_states(self, *_args, **_kwargs):
+            return {}
+
+        def flush(self):
+            return 0
+
         def get_state(self, *_args, **_kwargs):
             return None
 
@@ -995,6 +1071,12 @@ def test_sp1_skip_tombstone_for_legacy_connector_without_listing_metadata(monkey
         def __init__(self, _db):
             pass
 
+        def load_states(self, *_args, **_kwargs):
+            return {}
+
+        def flush(self):
+            return 0
+
         def get_state(self, *_args, **_kwargs):
             return None
 
@@ -1052,6 +1134,12 @@ def test_sp1_mark_tombstone_when_descriptor_listing_complete(monkeypatch):
         def __init__(self, _db):
             pass
 
+        def load_states(self, *_args, **_kwargs):
+            return {}
+
+        def flush(self):
+            return 0
+
         def get_state(self, *_args, **_kwargs):
             return None
 
@@ -1223,3 +1311,93 @@ def test_pipeline_trace_documents_versioned_markdown_artifact_paths():
     text = Path("docs/pipeline_trace.md").read_text(encoding="utf-8")
     assert "<markdown-bucket>/<tenant>/<source>/<source_version>/normalized.md" in text
     assert "<markdown-bucket>/<tenant>/<source>/<source_version>/artifacts/ingestion.json" in text
+
+
+def test_bulk_writers_issue_one_statement_per_table_with_array_params():
+    from app.services.ingestion import _insert_links, _insert_vector_batch
+
+    db = FakeDb()
+    tenant = uuid.UUID("11111111-1111-1111-1111-111111111111")
+    document_id = uuid.uuid4()
+    chunk_ids = [uuid.uuid4(), uuid.uuid4()]
+
+    assert _insert_links(db, tenant, document_id, ["https://a", "https://b", "https://c"]) == 3
+    _insert_vector_batch(db, tenant, "bge-m3", chunk_ids, [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
+
+    assert [sql.split("(")[0].strip() for sql, _ in db.calls] == ["INSERT INTO document_links", "INSERT INTO cross_links", "INSERT INTO chunk_vectors"]
+    assert db.calls[0][1]["link_url"] == ["https://a", "https://b", "https://c"]
+    vector_params = db.calls[2][1]
+    assert vector_params["chunk_id"] == chunk_ids
+    assert vector_params["embedding_dim"] == 3
+    assert vector_params["embedding"] == pytest.approx([0.1, 0.2, 0.3, 0.4, 0.5, 0.6])
+
+    with pytest.raises(EmbeddingIndexingError):
+        _insert_vector_batch(db, tenant, "bge-m3", chunk_ids, [[0.1, 0.2], [0.3]])
+
+
+def test_upsert_chunk_vectors_passes_embed_matrix_arrays_through(monkeypatch):
+    import numpy as np
+
+    db = FakeDb()
+    tenant = uuid.UUID("11111111-1111-1111-1111-111111111111")
+    matrices = []
+    written = []
+
+    class MatrixEmbeddingsClient:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def embed_matrix(self, texts, **_kwargs):
+            matrices.append(np.full((len(texts), 3), 0.5, dtype=np.float32))
+            return matrices[-1]
+
+        def embed_texts(self, texts, **_kwargs):
+            raise AssertionError("list API must not be used for indexing")
+
+    monkeypatch.setattr("app.services.ingestion.EmbeddingsClient", MatrixEmbeddingsClient)
+    monkeypatch.setattr("app.services.ingestion._insert_vector_batch", lambda _db, _tenant, _model, ids, embeddings: written.append(embeddings))
+
+    _upsert_chunk_vectors(db, tenant, [uuid.uuid4(), uuid.uuid4()])
+
+    assert len(written) == 1
+    assert written[0] is matrices[0]
+
+
+def test_upsert_chunk_vectors_overlaps_embedding_batches_and_writes_in_order(monkeypatch):
+    import threading
+
+    db = FakeDb()
+    tenant = uuid.UUID("11111111-1111-1111-1111-111111111111")
+    chunk_ids = [uuid.uuid4() for _ in range(6)]
+    db.chunk_texts = {cid: f"text-{i}" for i, cid in enumerate(chunk_ids)}
+    first_batch_started = threading.Event()
+    second_batch_started = threading.Event()
+
+    class SlowFirstBatchClient:
+        def __init__(self, *_args, **_kwargs):
+            pass
+
+        def embed_texts(self, texts, **_kwargs):
+            if texts[0] == "text-0":
+                first_batch_started.set()
+                assert second_batch_started.wait(5), "second batch was not requested concurrently"
+            elif texts[0] == "text-2":
+                second_batch_started.set()
+            return [[float(t.split("-")[1]), 1.0] for t in texts]
+
+    class FakeSettings:
+        EMBEDDINGS_BATCH_SIZE = 2
+        EMBEDDINGS_RETRY_ATTEMPTS = 1
+        EMBEDDINGS_INDEX_CONCURRENCY = 2
+        EMBEDDINGS_DEFAULT_MODEL_ID = "bge-m3"
+        EMBEDDINGS_SERVICE_URL = "http://localhost:8200"
+        EMBEDDINGS_TIMEOUT_SECONDS = 30
+
+    monkeypatch.setattr("app.services.ingestion.EmbeddingsClient", SlowFirstBatchClient)
+    monkeypatch.setattr("app.services.ingestion._load_settings", lambda: FakeSettings())
+
+    _upsert_chunk_vectors(db, tenant, chunk_ids)
+
+    writes = [params for sql, params in db.calls if "INSERT INTO chunk_vectors" in sql]
+    assert [params["chunk_id"] for params in writes] == [chunk_ids[0:2], chunk_ids[2:4], chunk_ids[4:6]]
+    assert [params["embedding"][0::2] for params in writes] == [[0.0, 1.0], [2.0, 3.0], [4.0, 5.0]]
@@ -9,19 +9,12 @@ class FakeRepo:
     def __init__(self, *_args, **_kwargs):
         pass
 
-    def fetch_lexical_candidate_scores(self, _query, _k_lex):
-        return {"chunk-a": 0.5, "chunk-b": 0.1}
-
-    def fetch_vector_candidates(self, _query_embedding, _k_vec, use_similarity=False):
+    def fetch_hybrid_candidates(self, _query, _query_embedding, lexical_top_n, vector_top_n, use_similarity=False, include_embeddings=True, **_kwargs):
         assert isinstance(use_similarity, bool)
-        return [{"chunk_id": "chunk-a", "vec_score": 0.9}, {"chunk_id": "chunk-c", "vec_score": 0.3}]
-
-    def hydrate_candidates(self, chunk_ids, lexical_scores, vector_scores):
-        assert chunk_ids == {"chunk-a", "chunk-b", "chunk-c"}
-        assert "chunk-a" in lexical_scores
-        assert "chunk-c" in vector_scores
-        return [{"chunk_id": "chunk-a"}, {"chunk_id": "chunk-b"}, {"chunk_id": "chunk-c"}]
-
+        assert isinstance(include_embeddings, bool)
+        assert lexical_top_n >= 5
+        assert vector_top_n >= 5
+        return [{"chunk_id": "chunk-a"}, {"chunk_id": "chunk-b"}, {"chunk_id": "chunk-c"}], 2, 2
 
 def test_fetch_candidates_returns_counts(monkeypatch):
     monkeypatch.setattr(routes, "TenantRepository", FakeRepo)
@@ -38,3 +31,62 @@ def test_fetch_candidates_returns_counts(monkeypatch):
     assert lexical_ms >= 0
     assert fts_count == 2
     assert vector_count == 2
+
+
+def test_fetch_candidates_passes_tenant_vector_search_params(monkeypatch):
+    seen = {}
+
+    class RecordingRepo(FakeRepo):
+        def fetch_hybrid_candidates(self, *args, **kwargs):
+            seen.update(kwargs)
+            return [], 0, 0
+
+    monkeypatch.setattr(routes, "TenantRepository", RecordingRepo)
+    monkeypatch.setattr(routes.settings, "VECTOR_HNSW_EF_SEARCH", 64)
+    monkeypatch.setattr(routes.settings, "VECTOR_IVFFLAT_PROBES", 0)
+    monkeypatch.setattr(routes.settings, "VECTOR_SEARCH_TENANT_OVERRIDES", '{"tenant-1": {"probes": 16}}')
+
+    routes._fetch_candidates(db=object(), tenant_id="tenant-1", query="hello", query_embedding=[0.1], top_n=5)
+    assert seen["search_params"] == {"hnsw.ef_search": 64, "ivfflat.probes": 16}
+    assert seen["distance_metric"] == routes.settings.VECTOR_DISTANCE_METRIC
+
+    routes._fetch_candidates(db=object(), tenant_id="tenant-2", query="hello", query_embedding=[0.1], top_n=5)
+    assert seen["search_params"] == {"hnsw.ef_search": 64}
+
+
+def test_verification_embeds_sentences_without_the_query_cache(monkeypatch):
+    import numpy as np
+
+    class MatrixClient:
+        def __init__(self):
+            self.calls = []
+
+        def embed_matrix(self, sentences, tenant_id=None, correlation_id=None):
+            self.calls.append(list(sentences))
+            return np.ones((len(sentences), 2), dtype=np.float32)
+
+    def query_cache_not_expected():
+        raise AssertionError("query embedding cache used for verification")
+
+    uncached = MatrixClient()
+    monkeypatch.setattr(routes.settings, "ANTI_HALLUCINATION_ENCODER", "chunk_vectors")
+    monkeypatch.setattr(routes, "get_embeddings_client", query_cache_not_expected)
+    monkeypatch.setattr(routes, "get_uncached_embeddings_client", lambda: uncached)
+
+    kwargs = routes._verification_encoder_kwargs(object(), "tenant-1", "corr-1", [{"chunk_id": "c1", "embedding": [1.0, 0.0]}])
+    matrix = kwargs["embed_texts"](["s1", "s2"])
+
+    assert kwargs["chunk_embeddings"] == [[1.0, 0.0]]
+    assert matrix.shape == (2, 2)
+    assert uncached.calls == [["s1", "s2"]]
+
+
+def test_query_embedding_time_is_measured_inside_the_worker():
+    import time
+
+    future = routes.get_query_stage_executor().submit(routes._timed_call, lambda text: [float(len(text))], "vpn")
+    time.sleep(0.2)  # lexical prefetch running on the request thread meanwhile
+
+    vector, embed_ms = future.result()
+    assert vector == [3.0]
+    assert embed_ms < 100
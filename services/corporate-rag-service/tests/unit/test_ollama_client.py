@@ -97,3 +97,38 @@ def test_fetch_model_num_ctx_from_model_info(monkeypatch):
     client = OllamaClient(endpoint="http://ollama.local/api/generate", model="qwen", timeout_seconds=5)
 
     assert client.fetch_model_num_ctx() == 32768
+
+
+class DummyStreamResponse(DummyResponse):
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_args):
+        return False
+
+    def iter_lines(self):
+        return iter(self.lines)
+
+
+class DummyStreamClient(DummyClient):
+    def stream(self, method, _endpoint, json):
+        self.method = method
+        self.payload = json
+        return DummyStreamResponse(['{"response": "Hel", "done": false}', "", '{"response": "lo", "done": false}', '{"response": "", "done": true, "eval_count": 2}'])
+
+
+def test_generate_streams_deltas_to_on_token(monkeypatch):
+    recorder = DummyStreamClient()
+    monkeypatch.setattr("httpx.Client", lambda *_args, **_kwargs: recorder)
+
+    deltas = []
+    client = OllamaClient(endpoint="http://ollama.local/api/generate", model="qwen", timeout_seconds=5)
+    response = client.generate("hello", on_token=deltas.append)
+
+    assert recorder.payload["stream"] is True
+    assert deltas == ["Hel", "lo"]
+    assert response["response"] == "Hello"
+    assert response["eval_count"] == 2
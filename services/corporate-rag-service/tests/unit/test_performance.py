@@ -5,6 +5,7 @@ def test_build_stage_budgets_from_env_timeouts_positive():
     budgets = build_stage_budgets(30, 10)
     assert budgets["t_total_ms"] == 30000
     assert budgets["t_vector_ms"] <= 10000
+    assert 10 <= budgets["t_embed_ms"] <= 10000
 
 
 def test_exceeded_budgets_negative_detection():
@@ -48,4 +48,40 @@ def test_apply_context_budget_logs_initial_trimmed_final_tokens():
     retained, log = apply_context_budget(chunks, use_token_budget_assembly=True, max_context_tokens=300)
     assert retained
     assert log["initial_tokens"] >= log["final_tokens"]
-    assert log["trimmed_tokens"] == log["initial_tokens"] - log["final_tokens"]
\ No newline at end of file
+    assert log["trimmed_tokens"] == log["initial_tokens"] - log["final_tokens"]
+
+def test_apply_context_budget_uses_stored_counts_for_current_tokenizer(monkeypatch):
+    from app.services import query_pipeline
+
+    monkeypatch.setattr(query_pipeline, "llm_tokenizer_id", lambda: "tok:v2")
+    estimated = []
+    monkeypatch.setattr(query_pipeline, "estimate_tokens", lambda text: estimated.append(text) or 1000)
+    monkeypatch.setattr(query_pipeline.settings, "TOKEN_BUDGET_SAFETY_MARGIN", 0)
+    chunks = [
+        {"chunk_id": "1", "chunk_text": "a", "final_score": 0.9, "llm_token_count": 40, "llm_tokenizer": "tok:v2"},
+        {"chunk_id": "2", "chunk_text": "b", "final_score": 0.1, "llm_token_count": 40, "llm_tokenizer": "tok:v2"},
+        {"chunk_id": "3", "chunk_text": "c", "final_score": 0.05, "llm_token_count": 40, "llm_tokenizer": "tok:v1"},
+    ]
+
+    retained, log = apply_context_budget(chunks, use_token_budget_assembly=True, max_context_tokens=100)
+
+    assert estimated == ["c"]
+    assert log["initial_tokens"] == 1080
+    assert [c["chunk_id"] for c in retained] == ["1", "2"]
+    assert log["chunks_dropped_count"] == 1
+    assert log["final_tokens"] == 80
+
+
+def test_apply_context_budget_drops_lowest_scores_and_keeps_rank_order(monkeypatch):
+    monkeypatch.setattr("app.services.query_pipeline.settings.TOKEN_BUDGET_SAFETY_MARGIN", 0)
+    chunks = [
+        {"chunk_id": str(i), "chunk_text": "x", "final_score": score, "llm_token_count": 10, "llm_tokenizer": None}
+        for i, score in enumerate([0.9, 0.2, 0.8, 0.1, 0.7])
+    ]
+    for chunk in chunks:
+        chunk["chunk_text"] = "w " * 30
+
+    retained, log = apply_context_budget(chunks, use_token_budget_assembly=True, max_context_tokens=130)
+
+    assert [c["chunk_id"] for c in retained] == ["0", "2", "4"]
+    assert log["chunks_dropped_count"] == 2
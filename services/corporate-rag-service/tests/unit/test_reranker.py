@@ -14,3 +14,101 @@ def test_reranker_reorders_candidates():
     ]
     ranked, _ = service.rerank("query", candidates)
     assert ranked[0]["chunk_text"] == "second"
+
+
+class RecordingModel:
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs):
+        self.batches.append([text for _query, text in pairs])
+        return [float(len(text)) for _query, text in pairs]
+
+
+def test_reranker_scores_length_sorted_batches():
+    model = RecordingModel()
+    service = RerankerService("fake", model=model, batch_size=2)
+    candidates = [{"chunk_text": "x" * n} for n in (5, 1, 4, 2, 3)]
+
+    ranked, _ = service.rerank("query", candidates)
+
+    assert [len(batch) for batch in model.batches] == [2, 2, 1]
+    assert [len(text) for batch in model.batches for text in batch] == [1, 2, 3, 4, 5]
+    assert [c["rerank_score"] for c in ranked] == [5.0, 4.0, 3.0, 2.0, 1.0]
+
+
+def test_reranker_cache_reuses_scores_per_query_and_chunk():
+    model = RecordingModel()
+    service = RerankerService("fake", model=model, cache_max_entries=2)
+
+    service.rerank("q", [{"chunk_id": "a", "chunk_text": "aa"}, {"chunk_id": "b", "chunk_text": "b"}])
+    service.rerank("q", [{"chunk_id": "a", "chunk_text": "aa"}, {"chunk_id": "b", "chunk_text": "b"}])
+    assert len(model.batches) == 1
+
+    service.rerank("q", [{"chunk_id": "a", "chunk_text": "changed"}, {"chunk_id": "b", "chunk_text": "b"}])
+    assert model.batches[-1] == ["changed"]
+
+    service.rerank("other", [{"chunk_id": "a", "chunk_text": "aa"}, {"chunk_id": "b", "chunk_text": "b"}])
+    assert sorted(model.batches[-1]) == ["aa", "b"]
+    assert len(service._cache) == 2
+
+
+class FakeRerankerClient:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    def score(self, query, documents, model_id):
+        self.calls.append((query, list(documents), model_id))
+        if self.fail:
+            raise RuntimeError("reranker-service unavailable")
+        return [float(len(document)) for document in documents]
+
+
+def test_reranker_client_mode_scores_remotely_without_loading_model():
+    client = FakeRerankerClient()
+    service = RerankerService("fake", client=client)
+
+    ranked, _ = service.rerank("q", [{"chunk_text": "a"}, {"chunk_text": "bbb"}])
+
+    assert service._model is None
+    assert client.calls == [("q", ["a", "bbb"], "fake")]
+    assert [c["chunk_text"] for c in ranked] == ["bbb", "a"]
+
+
+def test_reranker_client_mode_falls_back_to_local_model():
+    model = RecordingModel()
+    service = RerankerService("fake", model=model, client=FakeRerankerClient(fail=True))
+
+    ranked, _ = service.rerank("q", [{"chunk_text": "a"}, {"chunk_text": "bbb"}])
+
+    assert model.batches == [["a", "bbb"]]
+    assert ranked[0]["chunk_text"] == "bbb"
+
+
+def test_reranker_logs_mode_that_scored_and_skips_remote_during_cooldown(monkeypatch, caplog):
+    import logging
+
+    from app.services import reranker as reranker_module
+
+    now = [100.0]
+    monkeypatch.setattr(reranker_module.time, "monotonic", lambda: now[0])
+    client = FakeRerankerClient(fail=True)
+    model = RecordingModel()
+    service = RerankerService("fake", model=model, client=client, remote_cooldown_seconds=30)
+    candidates = [{"chunk_text": "a"}, {"chunk_text": "bbb"}]
+
+    caplog.set_level(logging.INFO, logger="app.services.reranker")
+    service.rerank("q", candidates)
+    service.rerank("q", candidates)
+    modes = [record.mode for record in caplog.records if record.getMessage() == "reranker_applied"]
+
+    assert modes == ["local", "local"]
+    assert len(client.calls) == 1
+    assert len(model.batches) == 2
+
+    client.fail = False
+    now[0] += 31
+    service.rerank("q", candidates)
+    assert len(client.calls) == 2
+    assert [record.mode for record in caplog.records if record.getMessage() == "reranker_applied"][-1] == "remote"
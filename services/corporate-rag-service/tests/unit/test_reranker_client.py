@@ -0,0 +1,31 @@
+from app.clients.reranker_client import RerankerClient
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        return None
+
+    def json(self):
+        return self._payload
+
+
+class FakeHttpxClient:
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def post(self, url, json):
+        self.recorder.append((url, json))
+        return FakeResponse({"model": json["model"], "results": [{"index": 1, "score": 0.2}, {"index": 0, "score": 0.9}]})
+
+
+def test_score_posts_pairs_and_orders_results_by_index(monkeypatch):
+    calls = []
+    monkeypatch.setattr("httpx.Client", lambda timeout, **_kwargs: FakeHttpxClient(calls))
+
+    scores = RerankerClient("http://reranker/", timeout_seconds=3).score("q", ["a", "b"], model_id="m1")
+
+    assert scores == [0.9, 0.2]
+    assert calls == [("http://reranker/v1/rerank", {"model": "m1", "query": "q", "documents": ["a", "b"]})]
@@ -0,0 +1,106 @@
+from app.services.response_cache import QueryResponseCache, SemanticQueryCache, settings_fingerprint
+from app.services.telemetry import counter_value, reset_metrics
+
+
+def test_key_normalizes_query_and_includes_generation_and_options():
+    fp = settings_fingerprint({"LLM_MODEL": "m"})
+    base = QueryResponseCache.key("t1", 3, "how to  reset vpn", {"top_k": 5}, fp)
+
+    assert base == QueryResponseCache.key("t1", 3, " how to reset vpn\n", {"top_k": 5}, fp)
+    assert base != QueryResponseCache.key("t1", 4, "how to reset vpn", {"top_k": 5}, fp)
+    assert base != QueryResponseCache.key("t2", 3, "how to reset vpn", {"top_k": 5}, fp)
+    assert base != QueryResponseCache.key("t1", 3, "how to reset vpn", {"top_k": 6}, fp)
+    assert base != QueryResponseCache.key("t1", 3, "how to reset vpn", {"top_k": 5}, settings_fingerprint({"LLM_MODEL": "other"}))
+
+
+def test_hit_rate_metric_ttl_and_lru_eviction():
+    reset_metrics()
+    now = [0.0]
+    cache = QueryResponseCache(max_entries=2, ttl_seconds=10, now_fn=lambda: now[0])
+    a, b, c = (("t", 0, q, "{}", "fp") for q in "abc")
+
+    assert cache.get(a) is None
+    cache.put(a, "A")
+    cache.put(b, "B")
+    assert cache.get(a) == "A"
+    cache.put(c, "C")
+    assert cache.get(b) is None
+    assert cache.get(a) == "A"
+    assert (counter_value("query_response_cache_hits"), counter_value("query_response_cache_misses")) == (2.0, 2.0)
+    assert cache.stats()["hit_rate"] == 0.5
+
+    now[0] = 11.0
+    assert cache.get(a) is None
+    assert cache.stats()["entries"] == 1
+
+
+def test_semantic_cache_matches_paraphrase_within_scope_and_threshold():
+    reset_metrics()
+    cache = SemanticQueryCache(similarity_threshold=0.9)
+    scope = (3, '{"top_k": 5}', "fp")
+    cache.put("t1", scope, [1.0, 0.0, 0.0], "vacation answer")
+    cache.put("t1", scope, [0.0, 1.0, 0.0], "vpn answer")
+
+    value, similarity = cache.get("t1", scope, [0.95, 0.1, 0.0])
+    assert value == "vacation answer"
+    assert similarity > 0.9
+    assert cache.get("t1", scope, [0.6, 0.6, 0.0]) is None
+    assert cache.get("t1", (4, '{"top_k": 5}', "fp"), [1.0, 0.0, 0.0]) is None
+    assert cache.get("t2", scope, [1.0, 0.0, 0.0]) is None
+    assert (counter_value("query_semantic_cache_hits"), counter_value("query_semantic_cache_misses")) == (1.0, 3.0)
+
+
+def test_semantic_cache_evicts_lru_and_reuses_rows_of_superseded_generations():
+    now = [0.0]
+    cache = SemanticQueryCache(similarity_threshold=0.99, max_entries=2, ttl_seconds=10, now_fn=lambda: now[0])
+    old, new = (1, "{}", "fp"), (2, "{}", "fp")
+    cache.put("t", old, [1.0, 0.0], "a")
+    cache.put("t", old, [0.0, 1.0], "b")
+    assert cache.get("t", old, [1.0, 0.0])[0] == "a"
+    cache.put("t", old, [1.0, 1.0], "c")
+    assert cache.get("t", old, [0.0, 1.0]) is None
+    assert cache.get("t", old, [1.0, 0.0])[0] == "a"
+
+    cache.put("t", new, [0.0, 1.0], "b2")
+    cache.put("t", new, [1.0, 0.0], "a2")
+    assert cache.get("t", new, [1.0, 0.0])[0] == "a2"
+    assert cache.get("t", new, [0.0, 1.0])[0] == "b2"
+    assert cache.get("t", old, [1.0, 0.0]) is None
+
+    now[0] = 11.0
+    assert cache.get("t", new, [1.0, 0.0]) is None
+    assert cache.stats()["entries"] == 2
+
+
+def test_semantic_cache_grows_tenant_index_lazily_and_evicts_lru_tenants():
+    cache = SemanticQueryCache(similarity_threshold=0.99, max_entries=40, max_tenants=2)
+    scope = (1, "{}", "fp")
+    cache.put("t1", scope, [1.0, 0.0], "a")
+    assert cache._tenants["t1"].capacity == 16
+
+    for i in range(20):
+        cache.put("t1", scope, [1.0, float(i + 1)], f"v{i}")
+    assert cache._tenants["t1"].capacity == 32
+    assert cache.get("t1", scope, [1.0, 0.0])[0] == "a"
+
+    cache.put("t2", scope, [1.0, 0.0], "b")
+    cache.get("t1", scope, [1.0, 0.0])
+    cache.put("t3", scope, [1.0, 0.0], "c")
+
+    assert list(cache._tenants) == ["t1", "t3"]
+    assert cache.get("t2", scope, [1.0, 0.0]) is None
+    assert cache.stats()["tenants"] == 2
+
+
+def test_semantic_cache_overwrites_superseded_generation_rows_before_current_ones():
+    cache = SemanticQueryCache(similarity_threshold=0.99, max_entries=2)
+    old, new = (1, "{}", "fp"), (2, "{}", "fp")
+    cache.put("t1", old, [1.0, 0.0, 0.0], "old answer")
+    cache.put("t1", new, [0.0, 1.0, 0.0], "current answer")
+    assert cache.get("t1", old, [1.0, 0.0, 0.0]) is None
+
+    cache.put("t1", new, [0.0, 0.0, 1.0], "another current answer")
+
+    assert cache.get("t1", new, [0.0, 1.0, 0.0])[0] == "current answer"
+    assert cache.get("t1", new, [0.0, 0.0, 1.0])[0] == "another current answer"
+    assert cache.stats()["entries"] == 2
@@ -47,22 +47,6 @@ class FakeDB:
         return q
 
 
-def test_fetch_document_neighbors_never_crosses_doc_boundary():
-    db = FakeDB()
-    repo = TenantRepository(db, str(uuid.uuid4()))
-
-    anchor_query = FakeQuery(first_result=type("Anchor", (), {"ordinal": 10})())
-    neighbors_query = FakeQuery(all_result=[])
-    db.queries = [anchor_query, neighbors_query]
-    db.query = lambda *_args, **_kwargs: db.queries.pop(0)
-
-    _ = repo.fetch_document_neighbors("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa", "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb", window=2)
-
-    assert any("chunks.document_id = :document_id_1" in f for f in neighbors_query.filters)
-    assert any("chunks.ordinal >= :ordinal_1" in f for f in neighbors_query.filters)
-    assert any("chunks.ordinal <= :ordinal_1" in f or "chunks.ordinal <= :ordinal_2" in f for f in neighbors_query.filters)
-
-
 def test_fetch_outgoing_linked_documents_is_deterministic_and_limited():
     db = FakeDB()
     repo = TenantRepository(db, str(uuid.uuid4()))
@@ -76,3 +60,54 @@ def test_fetch_outgoing_linked_documents_is_deterministic_and_limited():
     assert linked == ["aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"]
     assert q.limit_value == 1
     assert any("document_links.to_document_id" in ob for ob in q.order_bys)
+
+
+def test_fetch_neighbor_windows_is_one_query_grouped_per_window():
+    doc_id = uuid.UUID("aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa")
+    captured = []
+
+    def row(window_idx, chunk_id, ordinal):
+        return {
+            "window_idx": window_idx,
+            "chunk_id": chunk_id,
+            "document_id": doc_id,
+            "tenant_id": "t",
+            "chunk_text": chunk_id,
+            "chunk_path": "a/b",
+            "ordinal": ordinal,
+            "llm_token_count": None,
+            "llm_tokenizer": None,
+            "title": "Doc",
+            "url": None,
+            "labels": None,
+            "author": None,
+            "updated_date": None,
+            "embedding": None,
+            "lex_score": 0.0,
+            "vec_score": 0.0,
+        }
+
+    class Result:
+        def mappings(self):
+            return self
+
+        def all(self):
+            return [row(1, "c1", 1), row(1, "c2", 2), row(2, "c2", 2), row(2, "c3", 3)]
+
+    class DB:
+        def execute(self, statement, params):
+            captured.append((str(statement), params))
+            return Result()
+
+    repo = TenantRepository(DB(), str(uuid.uuid4()))
+    grouped = repo.fetch_neighbor_windows([(str(doc_id), 1, 1), (str(doc_id), 3, 1), (str(doc_id), 9, 0)], include_embeddings=False)
+
+    assert len(captured) == 1
+    sql, params = captured[0]
+    assert "unnest(CAST(:document_ids AS uuid[])" in sql
+    assert "c.ordinal BETWEEN w.ordinal - w.win AND w.ordinal + w.win" in sql
+    assert "NULL AS embedding" in sql
+    assert params["ordinals"] == [1, 3, 9]
+    assert params["windows"] == [1, 1, 0]
+    assert [[c["chunk_id"] for c in window] for window in grouped] == [["c1", "c2"], ["c2", "c3"], []]
+    assert grouped[0][1] is not grouped[1][0]
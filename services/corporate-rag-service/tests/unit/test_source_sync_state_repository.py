@@ -0,0 +1,69 @@
+from datetime import datetime, timezone
+
+from app.db.repositories.source_sync_state import SourceSyncStateRepository
+from tests.unit.test_ingestion_pipeline import FakeDb
+
+
+def _seed(db, refs):
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for ref in refs:
+        db.sync_state[("t1", "FILE_CATALOG_OBJECT", ref)] = {
+            "tenant_id": "t1",
+            "source_type": "FILE_CATALOG_OBJECT",
+            "external_ref": ref,
+            "last_seen_modified_at": now,
+            "last_seen_checksum": f"h:{ref}",
+            "last_synced_at": now,
+            "last_status": "success",
+            "last_error_code": None,
+            "last_error_message": None,
+        }
+
+
+def test_load_states_serves_lookups_from_memory_with_one_query():
+    db = FakeDb()
+    _seed(db, [f"fs:{i}.md" for i in range(50)])
+    repo = SourceSyncStateRepository(db)
+
+    states = repo.load_states("t1", "FILE_CATALOG_OBJECT")
+    calls_after_load = len(db.calls)
+
+    assert len(states) == 50
+    assert repo.get_state("t1", "FILE_CATALOG_OBJECT", "fs:7.md").last_seen_checksum == "h:fs:7.md"
+    assert repo.get_state("t1", "FILE_CATALOG_OBJECT", "fs:missing.md") is None
+    assert sorted(repo.list_external_refs("t1", "FILE_CATALOG_OBJECT")) == sorted(states)
+    assert len(db.calls) == calls_after_load == 1
+
+
+def test_staged_writes_flush_as_one_upsert_and_update_loaded_states():
+    db = FakeDb()
+    _seed(db, ["fs:a.md", "fs:b.md"])
+    repo = SourceSyncStateRepository(db)
+    repo.load_states("t1", "FILE_CATALOG_OBJECT")
+    now = datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    repo.mark_success(tenant_id="t1", source_type="FILE_CATALOG_OBJECT", external_ref="fs:c.md", last_seen_modified_at=now, last_seen_checksum="h3", last_synced_at=now)
+    repo.mark_failure(
+        tenant_id="t1",
+        source_type="FILE_CATALOG_OBJECT",
+        external_ref="fs:a.md",
+        last_seen_modified_at=now,
+        last_seen_checksum="h1",
+        last_synced_at=now,
+        error_code="C-FETCH-FAILED",
+        error_message="x" * 600,
+    )
+    repo.mark_deleted(tenant_id="t1", source_type="FILE_CATALOG_OBJECT", external_ref="fs:b.md", last_synced_at=now)
+    repo.mark_success(tenant_id="t1", source_type="FILE_CATALOG_OBJECT", external_ref="fs:c.md", last_seen_modified_at=now, last_seen_checksum="h4", last_synced_at=now)
+
+    assert repo.get_state("t1", "FILE_CATALOG_OBJECT", "fs:c.md").last_seen_checksum == "h4"
+    assert not any("INSERT INTO source_sync_state" in stmt for stmt, _ in db.calls)
+
+    assert repo.flush() == 3
+    inserts = [params for stmt, params in db.calls if "INSERT INTO source_sync_state" in stmt]
+    assert len(inserts) == 1
+    assert db.sync_state[("t1", "FILE_CATALOG_OBJECT", "fs:a.md")]["last_status"] == "failed"
+    assert len(db.sync_state[("t1", "FILE_CATALOG_OBJECT", "fs:a.md")]["last_error_message"]) == 512
+    assert db.sync_state[("t1", "FILE_CATALOG_OBJECT", "fs:b.md")]["last_status"] == "deleted"
+    assert db.sync_state[("t1", "FILE_CATALOG_OBJECT", "fs:c.md")]["last_seen_checksum"] == "h4"
+    assert repo.flush() == 0
@@ -19,3 +19,21 @@ def test_log_stage_latency_structured_fields(caplog):
     assert getattr(record, "latency_ms") == 21
     assert getattr(record, "model_id") == "model-x"
     assert getattr(record, "request_id") == "req-1"
+
+
+def test_samples_window_is_bounded_and_label_sets_are_capped(monkeypatch):
+    from app.services import telemetry
+
+    reset_metrics()
+    monkeypatch.setattr(telemetry, "MAX_SERIES_PER_METRIC", 2)
+    for i in range(telemetry.WINDOW_SIZE + 10):
+        emit_metric("rag_answer_latency", i)
+    for tenant in ("a", "b", "c"):
+        emit_metric("per_tenant", 1, labels={"tenant_id": tenant})
+
+    samples = metric_samples("rag_answer_latency")
+    assert len(samples) == telemetry.WINDOW_SIZE
+    assert samples[-1] == float(telemetry.WINDOW_SIZE + 9)
+    assert telemetry.REGISTRY.summary("rag_answer_latency")["count"] == telemetry.WINDOW_SIZE + 10
+    assert metric_samples("per_tenant", labels={"tenant_id": "c"}) == []
+    assert metric_samples("per_tenant", labels={"label_overflow": "true"}) == [1.0]
@@ -0,0 +1,79 @@
+import pytest
+
+from app.cli import vector_index
+
+TENANT = "11111111-1111-1111-1111-111111111111"
+
+
+def test_parse_args_requires_scope_negative():
+    with pytest.raises(SystemExit):
+        vector_index.parse_args([])
+
+
+def test_tenant_index_ddl_is_partial_with_metric_opclass():
+    ddl = vector_index.tenant_index_ddl(TENANT, "cosine")
+    assert "ix_chunk_vectors_cos_11111111111111111111111111111111" in ddl
+    assert ddl.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS ")
+    assert "USING hnsw (embedding vector_cosine_ops)" in ddl
+    assert f"WHERE tenant_id = '{TENANT}'::uuid" in ddl
+
+    ivf = vector_index.tenant_index_ddl(TENANT, "inner_product", method="ivfflat")
+    assert "USING ivfflat (embedding vector_ip_ops) WITH (lists = 100)" in ivf
+
+
+def test_tenant_index_ddl_rejects_non_uuid_tenant_negative():
+    with pytest.raises(ValueError):
+        vector_index.tenant_index_ddl("x'; DROP TABLE chunks; --", "cosine")
+
+
+def test_main_calls_build(monkeypatch):
+    called = {}
+
+    def fake_build(tenant_id=None, all_tenants=False, metric="cosine"):
+        called.update(tenant_id=tenant_id, all_tenants=all_tenants, metric=metric)
+        return 2
+
+    monkeypatch.setattr(vector_index, "build_tenant_indexes", fake_build)
+    assert vector_index.main(["--all", "--metric", "l2"]) == 0
+    assert called == {"tenant_id": None, "all_tenants": True, "metric": "l2"}
+
+
+def test_build_tenant_indexes_runs_ddl_on_autocommit_connection(monkeypatch):
+    from app.db import session
+
+    executed = []
+
+    class FakeResult:
+        def __init__(self, sql):
+            self.sql = sql
+
+        def scalar(self):
+            return True
+
+        def all(self):
+            return [(TENANT,)]
+
+    class FakeConnection:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def execute(self, statement):
+            executed.append(str(statement))
+            return FakeResult(str(statement))
+
+    class FakeEngine:
+        def execution_options(self, **options):
+            executed.append(options)
+            return self
+
+        def connect(self):
+            return FakeConnection()
+
+    monkeypatch.setattr(session, "engine", FakeEngine())
+
+    assert vector_index.build_tenant_indexes(all_tenants=True) == 1
+    assert executed[0] == {"isolation_level": "AUTOCOMMIT"}
+    assert executed[-1] == vector_index.tenant_index_ddl(TENANT, "cosine", "hnsw")
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.services.retrieval import VectorScoringEngine, hybrid_rank, vector_score
+
+
+def test_engine_matches_pure_python_cosine():
+    query = [0.3, -0.2, 0.9]
+    candidates = [
+        {"chunk_id": "a", "embedding": [0.1, 0.4, 0.2]},
+        {"chunk_id": "b", "embedding": [-0.5, 0.0, 0.7]},
+        {"chunk_id": "c", "embedding": [0.0, 0.0, 0.0]},
+    ]
+    scores = VectorScoringEngine(query).cosine_scores(candidates)
+    for candidate, score in zip(candidates, scores):
+        assert float(score) == pytest.approx(vector_score(query, candidate["embedding"]), abs=1e-6)
+
+
+def test_engine_reuses_matrix_for_second_pass():
+    engine = VectorScoringEngine([1.0, 0.0])
+    candidates = [
+        {"chunk_id": "a", "chunk_text": "policy", "embedding": [1.0, 0.0], "lex_score": 0.5},
+        {"chunk_id": "b", "chunk_text": "policy", "embedding": [0.0, 1.0], "lex_score": 0.2},
+    ]
+    ranked, _ = hybrid_rank("policy", candidates, [1.0, 0.0], normalize_scores=True, scoring_engine=engine)
+
+    reranked = [{**c, "embedding": [0.0, 0.0]} for c in reversed(ranked)]
+    ranked_again, _ = hybrid_rank("policy", reranked, [1.0, 0.0], normalize_scores=True, scoring_engine=engine)
+    assert engine.cosine_scores(reranked).tolist() == pytest.approx([0.0, 1.0])
+    assert [c["chunk_id"] for c in ranked_again] == ["a", "b"]
+
+
+def test_engine_handles_dimension_mismatch_like_zip():
+    engine = VectorScoringEngine([1.0, 0.0])
+    scores = engine.cosine_scores([{"chunk_id": "short", "embedding": [1.0]}, {"chunk_id": "long", "embedding": [0.6, 0.0, 0.8]}])
+    assert float(scores[0]) == pytest.approx(vector_score([1.0, 0.0], [1.0]))
+    assert float(scores[1]) == pytest.approx(vector_score([1.0, 0.0], [0.6, 0.0, 0.8]), abs=1e-6)
+
+
+def test_engine_uses_sql_cosine_when_embedding_not_hydrated():
+    engine = VectorScoringEngine([1.0, 0.0])
+    candidates = [
+        {"chunk_id": "a", "vec_cosine": 0.25, "chunk_text": "alpha", "lex_score": 0.0},
+        {"chunk_id": "b", "embedding": [1.0, 0.0], "chunk_text": "beta", "lex_score": 0.0},
+    ]
+
+    scores = engine.cosine_scores(candidates)
+
+    assert scores.tolist() == pytest.approx([0.25, 1.0])
+    assert engine.cosine_scores([{"chunk_id": "a", "embedding": [0.0, 1.0]}]).tolist() == pytest.approx([0.25])
+    ranked, _ = hybrid_rank("q", candidates, [1.0, 0.0], scoring_engine=engine)
+    assert [c["chunk_id"] for c in ranked] == ["b", "a"]
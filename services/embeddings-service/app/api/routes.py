@@ -1,17 +1,23 @@
 import logging
 import time
 
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
 
 from app.core.config import settings
 from app.schemas.api import EmbeddingData, EmbeddingsRequest, EmbeddingsResponse, EmbeddingsUsage, ErrorResponse, HealthResponse
+from app.services.batching import MicroBatcher
 from app.services.encoder import EmbeddingDimensionMismatchError, EncoderRegistry
+from app.services.transport import BINARY_MEDIA_TYPE, encode_base64_rows, encode_binary_frame
 
 router = APIRouter()
 LOGGER = logging.getLogger(__name__)
 
 
 registry = EncoderRegistry(expected_dim=settings.EMBEDDING_DIM)
+batcher = MicroBatcher(
+    max_batch_size=settings.EMBEDDINGS_MICROBATCH_MAX_SIZE,
+    max_wait_ms=settings.EMBEDDINGS_MICROBATCH_MAX_WAIT_MS,
+)
 
 
 @router.get("/v1/health", response_model=HealthResponse)
@@ -26,15 +32,17 @@ def healthz() -> HealthResponse:
         default_model_id=settings.EMBEDDINGS_DEFAULT_MODEL_ID,
         embedding_dim=settings.EMBEDDING_DIM,
         loaded_models=registry.loaded_models(),
+        batching=batcher.stats(),
     )
 
 
-@router.post("/v1/embeddings", response_model=EmbeddingsResponse, responses={422: {"model": ErrorResponse}})
-def create_embeddings(payload: EmbeddingsRequest, request: Request) -> EmbeddingsResponse:
+@router.post("/v1/embeddings", response_model=EmbeddingsResponse, responses={200: {"content": {BINARY_MEDIA_TYPE: {}}}, 422: {"model": ErrorResponse}})
+def create_embeddings(payload: EmbeddingsRequest, request: Request) -> EmbeddingsResponse | Response:
     start = time.perf_counter()
     model_id = payload.model or settings.EMBEDDINGS_DEFAULT_MODEL_ID
     encoder = registry.get_encoder(model_id)
-    vectors = encoder.encode(payload.input)
+    method = "encode" if payload.encoding_format == "float" else "encode_array"
+    vectors = batcher.submit((model_id, method), getattr(encoder, method), payload.input)
 
     try:
         embedding_dim = registry.validate_embedding_dim(model_id, vectors)
@@ -55,11 +63,24 @@ def create_embeddings(payload: EmbeddingsRequest, request: Request) -> Embedding
             "model_id": model_id,
             "embedding_dim": embedding_dim,
             "batch_size": len(payload.input),
+            "encoding_format": payload.encoding_format,
             "duration_ms": duration_ms,
         },
     )
+    if payload.encoding_format == "binary":
+        return Response(
+            content=encode_binary_frame(vectors),
+            media_type=BINARY_MEDIA_TYPE,
+            headers={
+                "X-Embedding-Model": model_id,
+                "X-Embedding-Count": str(len(payload.input)),
+                "X-Embedding-Dim": str(embedding_dim),
+                "X-Embedding-Dtype": "float32-le",
+            },
+        )
+    embeddings = encode_base64_rows(vectors) if payload.encoding_format == "base64" else vectors
     return EmbeddingsResponse(
         model=model_id,
-        data=[EmbeddingData(index=i, embedding=e) for i, e in enumerate(vectors)],
+        data=[EmbeddingData(index=i, embedding=e) for i, e in enumerate(embeddings)],
         usage=EmbeddingsUsage(input_texts=len(payload.input), total_tokens_estimate=sum(len(x.split()) for x in payload.input)),
     )
@@ -41,6 +41,8 @@ class Settings(BaseSettings):
 
     EMBEDDING_DIM: int = 1024
     EMBEDDINGS_DEFAULT_MODEL_ID: str = "bge-m3"
+    EMBEDDINGS_MICROBATCH_MAX_SIZE: int = 64
+    EMBEDDINGS_MICROBATCH_MAX_WAIT_MS: float = 5.0
 
     LLM_PROVIDER: str = "ollama"
     LLM_ENDPOINT: str = Field(
@@ -70,6 +72,10 @@ class Settings(BaseSettings):
             raise ValueError("SERVICE_PORT must be between 1 and 65535")
         if self.EMBEDDING_DIM < 1:
             raise ValueError("EMBEDDING_DIM must be >= 1")
+        if self.EMBEDDINGS_MICROBATCH_MAX_SIZE < 1:
+            raise ValueError("EMBEDDINGS_MICROBATCH_MAX_SIZE must be >= 1")
+        if self.EMBEDDINGS_MICROBATCH_MAX_WAIT_MS < 0:
+            raise ValueError("EMBEDDINGS_MICROBATCH_MAX_WAIT_MS must be >= 0")
         return self
 
     @model_validator(mode="after")
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Literal
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -11,19 +11,20 @@ class HealthResponse(BaseModel):
     default_model_id: str | None = None
     embedding_dim: int | None = None
     loaded_models: list[str] = Field(default_factory=list)
+    batching: dict[str, Any] | None = None
 
 
 class EmbeddingsRequest(BaseModel):
     model: str | None = None
     input: list[str] = Field(min_length=1, max_length=256)
-    encoding_format: str = "float"
+    encoding_format: Literal["float", "base64", "binary"] = "float"
     tenant_id: UUID | None = None
     correlation_id: UUID | None = None
 
 
 class EmbeddingData(BaseModel):
     index: int
-    embedding: list[float]
+    embedding: list[float] | str
 
 
 class EmbeddingsUsage(BaseModel):
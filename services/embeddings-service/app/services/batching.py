@@ -0,0 +1,162 @@
+"""Request micro-batcher for embedding encodes.
+
+``reranker-service/app/services/batching.py`` is a deliberate fork of this module (the service
+images share no package); mirror behavioural fixes in both.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+LOGGER = logging.getLogger(__name__)
+
+EncodeFn = Callable[[list[str]], Any]
+
+
+@dataclass
+class _PendingRequest:
+    texts: list[str]
+    encode_fn: EncodeFn
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class _BatchQueue:
+    def __init__(self) -> None:
+        self.pending: deque[_PendingRequest] = deque()
+        self.condition = threading.Condition()
+        self.worker: threading.Thread | None = None
+
+
+def _batch_size_bucket(size: int) -> str:
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return f"le_{bucket}"
+
+
+class MicroBatcher:
+    """Coalesces concurrent encode requests for the same model into one forward pass.
+
+    Requests are queued per key (model id + encode method). A dispatcher thread per key
+    collects requests until ``max_batch_size`` texts are gathered or the oldest request
+    has waited ``max_wait_ms``, encodes the concatenated inputs once and hands each caller
+    its own slice of the result. ``max_wait_ms <= 0`` disables coalescing.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = float(max_wait_ms)
+        self._queues: dict[tuple[str, str], _BatchQueue] = {}
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._histogram: dict[str, int] = {}
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait_ms > 0
+
+    def submit(self, key: tuple[str, str], encode_fn: EncodeFn, texts: list[str]) -> Any:
+        if not self.enabled or len(texts) >= self.max_batch_size:
+            return encode_fn(texts)
+        request = _PendingRequest(texts=list(texts), encode_fn=encode_fn)
+        queue = self._queue_for(key)
+        with queue.condition:
+            queue.pending.append(request)
+            queue.condition.notify()
+        return request.future.result()
+
+    def _queue_for(self, key: tuple[str, str]) -> _BatchQueue:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = _BatchQueue()
+                self._queues[key] = queue
+            if queue.worker is None:
+                queue.worker = threading.Thread(target=self._run, args=(key, queue), name=f"embed-batcher-{key[0]}", daemon=True)
+                queue.worker.start()
+            return queue
+
+    def _collect(self, queue: _BatchQueue) -> list[_PendingRequest]:
+        with queue.condition:
+            while not queue.pending:
+                queue.condition.wait()
+            batch = [queue.pending.popleft()]
+            size = len(batch[0].texts)
+            deadline = batch[0].enqueued_at + self.max_wait_ms / 1000.0
+            while size < self.max_batch_size:
+                if queue.pending:
+                    if size + len(queue.pending[0].texts) > self.max_batch_size:
+                        break
+                    request = queue.pending.popleft()
+                    batch.append(request)
+                    size += len(request.texts)
+                    continue
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                queue.condition.wait(timeout=remaining)
+            return batch
+
+    def _run(self, key: tuple[str, str], queue: _BatchQueue) -> None:
+        while True:
+            batch = self._collect(queue)
+            self._execute(key, queue, batch)
+
+    def _execute(self, key: tuple[str, str], queue: _BatchQueue, batch: list[_PendingRequest]) -> None:
+        started = time.perf_counter()
+        texts = [text for request in batch for text in request.texts]
+        try:
+            vectors = batch[0].encode_fn(texts)
+        except Exception as exc:  # noqa: BLE001
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        offset = 0
+        for request in batch:
+            request.future.set_result(vectors[offset : offset + len(request.texts)])
+            offset += len(request.texts)
+
+        wait_ms = (started - batch[0].enqueued_at) * 1000.0
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            bucket = _batch_size_bucket(len(texts))
+            self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        LOGGER.info(
+            "embeddings_batch_executed",
+            extra={
+                "model_id": key[0],
+                "batch_size": len(texts),
+                "coalesced_requests": len(batch),
+                "queue_depth": len(queue.pending),
+                "wait_ms": round(wait_ms, 3),
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+            },
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            queue_depth: dict[str, int] = {}
+            for (model_id, _method), queue in self._queues.items():
+                queue_depth[model_id] = queue_depth.get(model_id, 0) + len(queue.pending)
+            return {
+                "enabled": self.enabled,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "batches": self._batches,
+                "requests": self._requests,
+                "queue_depth": queue_depth,
+                "batch_size_histogram": dict(sorted(self._histogram.items(), key=lambda item: int(item[0][3:]))),
+                "avg_wait_ms": (self._wait_ms_total / self._batches) if self._batches else 0.0,
+                "max_wait_ms_observed": self._wait_ms_max,
+            }
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class EmbeddingDimensionMismatchError(Exception):
     def __init__(self, model_id: str, expected_dim: int, actual_dim: int):
         super().__init__(f"Model {model_id} produced dim={actual_dim}, expected={expected_dim}")
@@ -20,6 +23,10 @@ class EncoderService:
         vectors = self.model.encode(texts, normalize_embeddings=True)
         return [v.tolist() for v in vectors]
 
+    def encode_array(self, texts: list[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, normalize_embeddings=True)
+        return np.ascontiguousarray(vectors, dtype="<f4")
+
 
 class EncoderRegistry:
     def __init__(self, expected_dim: int):
@@ -32,8 +39,8 @@ class EncoderRegistry:
             self._encoders[model_id] = EncoderService(model_id)
         return self._encoders[model_id]
 
-    def validate_embedding_dim(self, model_id: str, vectors: list[list[float]]) -> int:
-        if not vectors:
+    def validate_embedding_dim(self, model_id: str, vectors: list[list[float]] | np.ndarray) -> int:
+        if len(vectors) == 0:
             return self._dimensions.get(model_id, self.expected_dim)
         actual_dim = len(vectors[0])
         if actual_dim != self.expected_dim:
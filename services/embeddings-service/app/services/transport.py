@@ -0,0 +1,24 @@
+"""Compact wire encodings for embedding vectors.
+
+``base64`` and ``binary`` both carry little-endian float32 values, row-major,
+so clients can decode them straight into a contiguous array.
+"""
+
+import base64
+
+import numpy as np
+
+FLOAT32_LE = np.dtype("<f4")
+BINARY_MEDIA_TYPE = "application/octet-stream"
+
+
+def to_float32_le(vectors: list[list[float]] | np.ndarray) -> np.ndarray:
+    return np.ascontiguousarray(vectors, dtype=FLOAT32_LE)
+
+
+def encode_base64_rows(matrix: np.ndarray) -> list[str]:
+    return [base64.b64encode(row.tobytes()).decode("ascii") for row in to_float32_le(matrix)]
+
+
+def encode_binary_frame(matrix: np.ndarray) -> bytes:
+    return to_float32_le(matrix).tobytes()
@@ -100,3 +100,77 @@ def test_healthz_returns_diagnostics(monkeypatch):
     assert payload["default_model_id"] == "bge-m3"
     assert payload["embedding_dim"] == 1024
     assert payload["loaded_models"] == ["bge-m3", "custom-x"]
+
+
+class FakeArrayEncoderService(FakeEncoderService):
+    def encode_array(self, texts):
+        import numpy as np
+
+        return np.asarray(self.encode(texts), dtype="<f4")
+
+
+def test_embeddings_endpoint_base64_encoding(monkeypatch):
+    import base64
+
+    import numpy as np
+    from app.api import routes
+
+    monkeypatch.setattr(
+        routes.registry,
+        "get_encoder",
+        lambda model_id: FakeArrayEncoderService(model_id=model_id, values=[0.5, -0.25]),
+    )
+    monkeypatch.setattr(routes.registry, "validate_embedding_dim", lambda model_id, vectors: len(vectors[0]))
+
+    client = TestClient(app)
+    response = client.post("/v1/embeddings", json={"input": ["a", "b"], "encoding_format": "base64"})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    decoded = np.frombuffer(base64.b64decode(data[1]["embedding"]), dtype="<f4")
+    assert decoded.tolist() == [0.5, -0.25]
+
+
+def test_embeddings_endpoint_binary_frame(monkeypatch):
+    import numpy as np
+    from app.api import routes
+
+    monkeypatch.setattr(
+        routes.registry,
+        "get_encoder",
+        lambda model_id: FakeArrayEncoderService(model_id=model_id, values=[0.5, -0.25]),
+    )
+    monkeypatch.setattr(routes.registry, "validate_embedding_dim", lambda model_id, vectors: len(vectors[0]))
+
+    client = TestClient(app)
+    response = client.post("/v1/embeddings", json={"input": ["a", "b", "c"], "encoding_format": "binary"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["x-embedding-count"] == "3"
+    assert response.headers["x-embedding-dim"] == "2"
+    matrix = np.frombuffer(response.content, dtype="<f4").reshape(3, 2)
+    assert matrix[2].tolist() == [0.5, -0.25]
+
+
+def test_embeddings_endpoint_rejects_unknown_encoding(monkeypatch):
+    client = TestClient(app)
+    response = client.post("/v1/embeddings", json={"input": ["a"], "encoding_format": "fp16"})
+    assert response.status_code == 422
+
+
+def test_healthz_reports_micro_batching_stats(monkeypatch):
+    from app.api import routes
+
+    monkeypatch.setattr(
+        routes.registry,
+        "get_encoder",
+        lambda model_id: FakeEncoderService(model_id=model_id, values=[0.1, 0.2]),
+    )
+    monkeypatch.setattr(routes.registry, "validate_embedding_dim", lambda model_id, vectors: len(vectors[0]))
+
+    client = TestClient(app)
+    assert client.post("/v1/embeddings", json={"model": "batched-model", "input": ["hello"]}).status_code == 200
+    batching = client.get("/v1/healthz").json()["batching"]
+
+    assert batching["enabled"] is True
+    assert batching["queue_depth"]["batched-model"] == 0
+    assert batching["batches"] >= 1
@@ -0,0 +1,75 @@
+import threading
+
+import pytest
+
+from app.services.batching import MicroBatcher
+
+
+class RecordingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+
+def _submit_concurrently(batcher, encoder, inputs):
+    results = [None] * len(inputs)
+    barrier = threading.Barrier(len(inputs))
+
+    def _worker(i, texts):
+        barrier.wait()
+        results[i] = batcher.submit(("m1", "encode"), encoder.encode, texts)
+
+    threads = [threading.Thread(target=_worker, args=(i, texts)) for i, texts in enumerate(inputs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results
+
+
+def test_concurrent_requests_are_coalesced_and_fanned_out():
+    batcher = MicroBatcher(max_batch_size=64, max_wait_ms=200)
+    encoder = RecordingEncoder()
+
+    results = _submit_concurrently(batcher, encoder, [["a"], ["bb", "ccc"], ["dddd"]])
+
+    assert results[0] == [[1.0]]
+    assert results[1] == [[2.0], [3.0]]
+    assert results[2] == [[4.0]]
+    assert len(encoder.calls) < 3
+    assert sorted(text for call in encoder.calls for text in call) == ["a", "bb", "ccc", "dddd"]
+    stats = batcher.stats()
+    assert stats["requests"] == 3
+    assert sum(stats["batch_size_histogram"].values()) == stats["batches"]
+
+
+def test_batch_respects_max_batch_size():
+    batcher = MicroBatcher(max_batch_size=2, max_wait_ms=100)
+    encoder = RecordingEncoder()
+
+    _submit_concurrently(batcher, encoder, [["a"], ["b"], ["c"]])
+
+    assert all(len(call) <= 2 for call in encoder.calls)
+    assert len(encoder.calls) >= 2
+
+
+def test_encoder_error_is_raised_for_every_request():
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=5)
+
+    def _boom(_texts):
+        raise RuntimeError("model failed")
+
+    with pytest.raises(RuntimeError, match="model failed"):
+        batcher.submit(("m1", "encode"), _boom, ["a"])
+
+
+def test_zero_wait_disables_coalescing():
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=0)
+    encoder = RecordingEncoder()
+
+    assert batcher.submit(("m1", "encode"), encoder.encode, ["xy"]) == [[2.0]]
+    assert batcher.stats()["enabled"] is False
+    assert batcher.stats()["batches"] == 0
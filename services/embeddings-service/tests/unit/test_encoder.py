@@ -51,3 +51,17 @@ def test_dimension_mismatch_raises():
         assert exc.actual_dim == 2
     else:
         raise AssertionError("Expected EmbeddingDimensionMismatchError")
+
+
+def test_encode_array_returns_contiguous_float32():
+    import numpy as np
+
+    class ArrayModel:
+        def encode(self, texts, normalize_embeddings=True):
+            return np.asarray([[1.0, 2.0] for _ in texts], dtype=np.float64)
+
+    svc = EncoderService("fake", model=ArrayModel())
+    matrix = svc.encode_array(["a", "b"])
+    assert matrix.dtype == np.dtype("<f4")
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert matrix.shape == (2, 2)
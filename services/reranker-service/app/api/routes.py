@@ -0,0 +1,54 @@
+import logging
+import time
+
+from fastapi import APIRouter, Request
+
+from app.core.config import settings
+from app.schemas.api import HealthResponse, RerankRequest, RerankResponse, RerankResult
+from app.services.batching import MicroBatcher
+from app.services.scorer import ScorerRegistry
+
+router = APIRouter()
+LOGGER = logging.getLogger(__name__)
+
+
+registry = ScorerRegistry(max_length=settings.RERANKER_MAX_LENGTH, batch_size=settings.RERANKER_BATCH_SIZE)
+batcher = MicroBatcher(
+    max_batch_size=settings.RERANKER_MICROBATCH_MAX_SIZE,
+    max_wait_ms=settings.RERANKER_MICROBATCH_MAX_WAIT_MS,
+)
+
+
+@router.get("/v1/health", response_model=HealthResponse)
+def health() -> HealthResponse:
+    return HealthResponse(version=settings.APP_VERSION)
+
+
+@router.get("/v1/healthz", response_model=HealthResponse)
+def healthz() -> HealthResponse:
+    return HealthResponse(
+        version=settings.APP_VERSION,
+        default_model_id=settings.RERANKER_DEFAULT_MODEL_ID,
+        loaded_models=registry.loaded_models(),
+        batching=batcher.stats(),
+    )
+
+
+@router.post("/v1/rerank", response_model=RerankResponse)
+def rerank(payload: RerankRequest, request: Request) -> RerankResponse:
+    start = time.perf_counter()
+    model_id = payload.model or settings.RERANKER_DEFAULT_MODEL_ID
+    scorer = registry.get_scorer(model_id)
+    pairs = [(payload.query, document) for document in payload.documents]
+    scores = batcher.submit(model_id, scorer.score, pairs)
+
+    LOGGER.info(
+        "rerank_scored",
+        extra={
+            "request_id": request.headers.get("x-request-id"),
+            "model_id": model_id,
+            "pair_count": len(pairs),
+            "duration_ms": int((time.perf_counter() - start) * 1000),
+        },
+    )
+    return RerankResponse(model=model_id, results=[RerankResult(index=i, score=float(s)) for i, s in enumerate(scores)])
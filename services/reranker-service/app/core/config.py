@@ -0,0 +1,53 @@
+import logging
+import os
+
+from pydantic import AliasChoices, Field, model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    APP_NAME: str = "reranker-service"
+    APP_VERSION: str = "1.0.0"
+    HOST: str = "0.0.0.0"
+    SERVICE_PORT: int = Field(
+        default=8300,
+        validation_alias=AliasChoices("SERVICE_PORT", "RERANKER_SERVICE_PORT", "PORT"),
+    )
+
+    RERANKER_DEFAULT_MODEL_ID: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    RERANKER_MAX_LENGTH: int = 512
+    RERANKER_BATCH_SIZE: int = 32
+    RERANKER_MICROBATCH_MAX_SIZE: int = 128
+    RERANKER_MICROBATCH_MAX_WAIT_MS: float = 5.0
+
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
+
+    @model_validator(mode="after")
+    def validate_numeric_ranges(self) -> "Settings":
+        if self.SERVICE_PORT < 1 or self.SERVICE_PORT > 65535:
+            raise ValueError("SERVICE_PORT must be between 1 and 65535")
+        if self.RERANKER_MAX_LENGTH < 1:
+            raise ValueError("RERANKER_MAX_LENGTH must be >= 1")
+        if self.RERANKER_BATCH_SIZE < 1:
+            raise ValueError("RERANKER_BATCH_SIZE must be >= 1")
+        if self.RERANKER_MICROBATCH_MAX_SIZE < 1:
+            raise ValueError("RERANKER_MICROBATCH_MAX_SIZE must be >= 1")
+        if self.RERANKER_MICROBATCH_MAX_WAIT_MS < 0:
+            raise ValueError("RERANKER_MICROBATCH_MAX_WAIT_MS must be >= 0")
+        return self
+
+    @model_validator(mode="after")
+    def validate_deprecated_aliases(self) -> "Settings":
+        logger = logging.getLogger(__name__)
+
+        if os.getenv("RERANKER_SERVICE_PORT"):
+            logger.warning("RERANKER_SERVICE_PORT is deprecated; use SERVICE_PORT")
+        if os.getenv("PORT"):
+            logger.warning("PORT is deprecated; use SERVICE_PORT")
+        if os.getenv("SERVICE_PORT") and os.getenv("RERANKER_SERVICE_PORT"):
+            if os.getenv("SERVICE_PORT") != os.getenv("RERANKER_SERVICE_PORT"):
+                raise ValueError("SERVICE_PORT and RERANKER_SERVICE_PORT are both set with different values")
+        return self
+
+
+settings = Settings()
@@ -0,0 +1,9 @@
+from fastapi import FastAPI
+
+from app.api.routes import router
+from app.core.config import settings
+from app.core.logging import configure_logging
+
+configure_logging()
+app = FastAPI(title="Reranker Service API", version=settings.APP_VERSION)
+app.include_router(router)
@@ -0,0 +1,31 @@
+from typing import Any
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class HealthResponse(BaseModel):
+    status: str = "ok"
+    service: str = "reranker-service"
+    version: str
+    default_model_id: str | None = None
+    loaded_models: list[str] = Field(default_factory=list)
+    batching: dict[str, Any] | None = None
+
+
+class RerankRequest(BaseModel):
+    model: str | None = None
+    query: str = Field(min_length=1)
+    documents: list[str] = Field(min_length=1, max_length=256)
+    tenant_id: UUID | None = None
+    correlation_id: UUID | None = None
+
+
+class RerankResult(BaseModel):
+    index: int
+    score: float
+
+
+class RerankResponse(BaseModel):
+    model: str
+    results: list[RerankResult]
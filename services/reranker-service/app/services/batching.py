@@ -0,0 +1,162 @@
+"""Request micro-batcher for reranker scoring.
+
+Deliberate fork of ``embeddings-service/app/services/batching.py``: each service image is built
+from its own directory only, so there is no shared package to import it from. The two differ
+only in naming (``items``/``score_fn`` vs ``texts``/``encode_fn``) and queue key type; mirror
+behavioural fixes in both.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+LOGGER = logging.getLogger(__name__)
+
+ScoreFn = Callable[[list[Any]], Any]
+
+
+@dataclass
+class _PendingRequest:
+    items: list[Any]
+    score_fn: ScoreFn
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class _BatchQueue:
+    def __init__(self) -> None:
+        self.pending: deque[_PendingRequest] = deque()
+        self.condition = threading.Condition()
+        self.worker: threading.Thread | None = None
+
+
+def _batch_size_bucket(size: int) -> str:
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return f"le_{bucket}"
+
+
+class MicroBatcher:
+    """Coalesces concurrent rerank requests for the same model into one scoring call.
+
+    Requests are queued per model id. A dispatcher thread per model collects requests until
+    ``max_batch_size`` (query, document) pairs are gathered or the oldest request has waited
+    ``max_wait_ms``, scores the concatenated pairs once and hands each caller its own slice
+    of the result. ``max_wait_ms <= 0`` disables coalescing.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = float(max_wait_ms)
+        self._queues: dict[str, _BatchQueue] = {}
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._histogram: dict[str, int] = {}
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_wait_ms > 0
+
+    def submit(self, key: str, score_fn: ScoreFn, items: list[Any]) -> Any:
+        if not self.enabled or len(items) >= self.max_batch_size:
+            return score_fn(items)
+        request = _PendingRequest(items=list(items), score_fn=score_fn)
+        queue = self._queue_for(key)
+        with queue.condition:
+            queue.pending.append(request)
+            queue.condition.notify()
+        return request.future.result()
+
+    def _queue_for(self, key: str) -> _BatchQueue:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is None:
+                queue = _BatchQueue()
+                self._queues[key] = queue
+            if queue.worker is None:
+                queue.worker = threading.Thread(target=self._run, args=(key, queue), name=f"rerank-batcher-{key}", daemon=True)
+                queue.worker.start()
+            return queue
+
+    def _collect(self, queue: _BatchQueue) -> list[_PendingRequest]:
+        with queue.condition:
+            while not queue.pending:
+                queue.condition.wait()
+            batch = [queue.pending.popleft()]
+            size = len(batch[0].items)
+            deadline = batch[0].enqueued_at + self.max_wait_ms / 1000.0
+            while size < self.max_batch_size:
+                if queue.pending:
+                    if size + len(queue.pending[0].items) > self.max_batch_size:
+                        break
+                    request = queue.pending.popleft()
+                    batch.append(request)
+                    size += len(request.items)
+                    continue
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                queue.condition.wait(timeout=remaining)
+            return batch
+
+    def _run(self, key: str, queue: _BatchQueue) -> None:
+        while True:
+            batch = self._collect(queue)
+            self._execute(key, queue, batch)
+
+    def _execute(self, key: str, queue: _BatchQueue, batch: list[_PendingRequest]) -> None:
+        started = time.perf_counter()
+        items = [item for request in batch for item in request.items]
+        try:
+            scores = batch[0].score_fn(items)
+        except Exception as exc:  # noqa: BLE001
+            for request in batch:
+                request.future.set_exception(exc)
+            return
+        offset = 0
+        for request in batch:
+            request.future.set_result(scores[offset : offset + len(request.items)])
+            offset += len(request.items)
+
+        wait_ms = (started - batch[0].enqueued_at) * 1000.0
+        with self._lock:
+            self._batches += 1
+            self._requests += len(batch)
+            bucket = _batch_size_bucket(len(items))
+            self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        LOGGER.info(
+            "rerank_batch_executed",
+            extra={
+                "model_id": key,
+                "batch_size": len(items),
+                "coalesced_requests": len(batch),
+                "queue_depth": len(queue.pending),
+                "wait_ms": round(wait_ms, 3),
+                "duration_ms": int((time.perf_counter() - started) * 1000),
+            },
+        )
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            queue_depth = {model_id: len(queue.pending) for model_id, queue in self._queues.items()}
+            return {
+                "enabled": self.enabled,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "batches": self._batches,
+                "requests": self._requests,
+                "queue_depth": queue_depth,
+                "batch_size_histogram": dict(sorted(self._histogram.items(), key=lambda item: int(item[0][3:]))),
+                "avg_wait_ms": (self._wait_ms_total / self._batches) if self._batches else 0.0,
+                "max_wait_ms_observed": self._wait_ms_max,
+            }
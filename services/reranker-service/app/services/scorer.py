@@ -0,0 +1,37 @@
+class CrossEncoderScorer:
+    """Scores (query, document) pairs with a cross-encoder in length-bucketed batches."""
+
+    def __init__(self, model_id: str, model=None, max_length: int | None = None, batch_size: int = 32):
+        self.model_id = model_id
+        self.batch_size = max(1, int(batch_size))
+        if model is not None:
+            self.model = model
+        else:
+            from sentence_transformers import CrossEncoder
+
+            self.model = CrossEncoder(model_id, max_length=max_length)
+
+    def score(self, pairs: list[tuple[str, str]]) -> list[float]:
+        order = sorted(range(len(pairs)), key=lambda i: len(pairs[i][1]))
+        scores = [0.0] * len(pairs)
+        for offset in range(0, len(order), self.batch_size):
+            batch = order[offset : offset + self.batch_size]
+            batch_scores = self.model.predict([[pairs[i][0], pairs[i][1]] for i in batch])
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+        return scores
+
+
+class ScorerRegistry:
+    def __init__(self, max_length: int | None = None, batch_size: int = 32):
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self._scorers: dict[str, CrossEncoderScorer] = {}
+
+    def get_scorer(self, model_id: str) -> CrossEncoderScorer:
+        if model_id not in self._scorers:
+            self._scorers[model_id] = CrossEncoderScorer(model_id, max_length=self.max_length, batch_size=self.batch_size)
+        return self._scorers[model_id]
+
+    def loaded_models(self) -> list[str]:
+        return sorted(self._scorers.keys())
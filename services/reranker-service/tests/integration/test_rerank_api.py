@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+class FakeScorer:
+    def score(self, pairs):
+        return [float(len(document)) for _query, document in pairs]
+
+
+def test_rerank_endpoint_positive(monkeypatch):
+    from app.api import routes
+
+    monkeypatch.setattr(routes.settings, "RERANKER_DEFAULT_MODEL_ID", "default-model")
+    monkeypatch.setattr(routes.registry, "get_scorer", lambda model_id: FakeScorer())
+
+    client = TestClient(app)
+    response = client.post("/v1/rerank", json={"query": "vacation", "documents": ["aaa", "b"]})
+
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["model"] == "default-model"
+    assert payload["results"] == [{"index": 0, "score": 3.0}, {"index": 1, "score": 1.0}]
+
+
+def test_rerank_endpoint_negative_validation():
+    client = TestClient(app)
+    response = client.post("/v1/rerank", json={"query": "q", "documents": []})
+    assert response.status_code == 422
+
+
+def test_healthz_reports_batching():
+    client = TestClient(app)
+    payload = client.get("/v1/healthz").json()
+    assert payload["service"] == "reranker-service"
+    assert "batch_size_histogram" in payload["batching"]
@@ -0,0 +1,40 @@
+import threading
+
+from app.services.batching import MicroBatcher
+
+
+def _score(pairs):
+    return [float(len(document)) for _query, document in pairs]
+
+
+def test_concurrent_rerank_requests_are_coalesced_and_fanned_out():
+    batcher = MicroBatcher(max_batch_size=64, max_wait_ms=200)
+    calls = []
+    inputs = [[("q", "a")], [("q", "bb"), ("q", "ccc")]]
+    results = [None] * len(inputs)
+    barrier = threading.Barrier(len(inputs))
+
+    def _recording_score(pairs):
+        calls.append(list(pairs))
+        return _score(pairs)
+
+    def _worker(i, pairs):
+        barrier.wait()
+        results[i] = batcher.submit("m1", _recording_score, pairs)
+
+    threads = [threading.Thread(target=_worker, args=(i, pairs)) for i, pairs in enumerate(inputs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert results == [[1.0], [2.0, 3.0]]
+    assert len(calls) <= 2
+    assert sorted(document for call in calls for _query, document in call) == ["a", "bb", "ccc"]
+    assert batcher.stats()["requests"] == 2
+
+
+def test_zero_wait_disables_coalescing():
+    batcher = MicroBatcher(max_batch_size=8, max_wait_ms=0)
+    assert batcher.submit("m1", _score, [("q", "xy")]) == [2.0]
+    assert batcher.stats()["enabled"] is False
@@ -0,0 +1,38 @@
+from app.services.scorer import CrossEncoderScorer, ScorerRegistry
+
+
+class RecordingCrossEncoder:
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, pairs):
+        self.batches.append([document for _query, document in pairs])
+        return [float(len(document)) for _query, document in pairs]
+
+
+def test_score_sorts_pairs_by_length_and_restores_order():
+    model = RecordingCrossEncoder()
+    scorer = CrossEncoderScorer("fake", model=model, batch_size=2)
+
+    scores = scorer.score([("q", "ccc"), ("q", "a"), ("q", "bb")])
+
+    assert model.batches == [["a", "bb"], ["ccc"]]
+    assert scores == [3.0, 1.0, 2.0]
+
+
+def test_registry_caches_scorer_per_model(monkeypatch):
+    created = []
+
+    def fake_init(self, model_id, model=None, max_length=None, batch_size=32):
+        self.model_id = model_id
+        created.append((model_id, max_length, batch_size))
+
+    monkeypatch.setattr(CrossEncoderScorer, "__init__", fake_init)
+    registry = ScorerRegistry(max_length=256, batch_size=8)
+
+    first = registry.get_scorer("m1")
+    assert registry.get_scorer("m1") is first
+    registry.get_scorer("m2")
+
+    assert created == [("m1", 256, 8), ("m2", 256, 8)]
+    assert registry.loaded_models() == ["m1", "m2"]
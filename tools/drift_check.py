@@ -17,6 +17,7 @@ _ALLOWED_ENV_EXTRAS = {
     "HOST",
     "MIN_LEXICAL_OVERLAP",
     "MIN_SENTENCE_SIMILARITY",
+    "ANTI_HALLUCINATION_ENCODER",
 }
 _ALLOWED_ENDPOINT_EXTRAS = {"/v1/healthz", "/health", "/ready", "/metrics"}
 
@@ -28,6 +29,53 @@ _ALLOWED_ENV_EXTRAS = _ALLOWED_ENV_EXTRAS | {
     "EMBEDDINGS_BATCH_SIZE",
     "EMBEDDINGS_DEFAULT_MODEL_ID",
     "EMBEDDINGS_RETRY_ATTEMPTS",
+    "EMBEDDINGS_ENCODING_FORMAT",
+    "HTTP_POOL_MAX_CONNECTIONS",
+    "HTTP_POOL_MAX_KEEPALIVE_CONNECTIONS",
+    "HTTP_POOL_KEEPALIVE_EXPIRY_SECONDS",
+    "HTTP_POOL_HTTP2_ENABLED",
+    "EMBEDDINGS_MICROBATCH_MAX_SIZE",
+    "EMBEDDINGS_MICROBATCH_MAX_WAIT_MS",
+    "QUERY_EMBEDDING_CACHE_ENABLED",
+    "QUERY_EMBEDDING_CACHE_MAX_ENTRIES",
+    "QUERY_EMBEDDING_CACHE_TTL_SECONDS",
+    "QUERY_RESPONSE_CACHE_ENABLED",
+    "QUERY_RESPONSE_CACHE_MAX_ENTRIES",
+    "QUERY_RESPONSE_CACHE_TTL_SECONDS",
+    "QUERY_SEMANTIC_CACHE_ENABLED",
+    "QUERY_SEMANTIC_CACHE_SIMILARITY_THRESHOLD",
+    "QUERY_SEMANTIC_CACHE_MAX_ENTRIES",
+    "QUERY_SEMANTIC_CACHE_TTL_SECONDS",
+    "QUERY_SEMANTIC_CACHE_MAX_TENANTS",
+    "AUDIT_ASYNC_WRITER_ENABLED",
+    "EMBEDDINGS_INDEX_CONCURRENCY",
+    "AUDIT_WRITER_MAX_BUFFER",
+    "AUDIT_WRITER_BATCH_SIZE",
+    "AUDIT_WRITER_FLUSH_INTERVAL_MS",
+    "AUDIT_WRITER_OVERFLOW_POLICY",
+    "AUDIT_WRITER_BLOCK_TIMEOUT_MS",
+    "CONNECTOR_FETCH_CONCURRENCY",
+    "CONNECTOR_FETCH_CONCURRENCY_OVERRIDES",
+    "CONNECTOR_FETCH_THROTTLE_RETRIES",
+    "CONNECTOR_CONVERSION_PROCESSES",
+    "CONNECTOR_SYNC_BATCH_ITEMS",
+    "CONNECTOR_SYNC_BATCH_MAX_BYTES",
+    "QUERY_EMBEDDING_CACHE_TENANT_ISOLATION",
+    "RETRIEVAL_HYDRATE_EMBEDDINGS",
+    "RERANKER_MAX_LENGTH",
+    "RERANKER_BATCH_SIZE",
+    "RERANKER_SCORE_CACHE_MAX_ENTRIES",
+    "RERANKER_SERVICE_URL",
+    "RERANKER_TIMEOUT_SECONDS",
+    "RERANKER_REMOTE_FALLBACK",
+    "RERANKER_REMOTE_COOLDOWN_SECONDS",
+    "QUERY_PARALLEL_LEXICAL_PREFETCH",
+    "QUERY_STAGE_EXECUTOR_WORKERS",
+    "VECTOR_DISTANCE_METRIC",
+    "VECTOR_HNSW_EF_SEARCH",
+    "VECTOR_IVFFLAT_PROBES",
+    "VECTOR_HNSW_ITERATIVE_SCAN",
+    "VECTOR_SEARCH_TENANT_OVERRIDES",
     "EMBEDDING_DIM",
     "HYBRID_SCORE_NORMALIZATION",
     "MAX_CONTEXT_TOKENS",